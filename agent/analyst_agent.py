@@ -20,7 +20,7 @@ class AnalystAgent(BaseAgent):
             # print(f"[DEBUG] 🧮 매크로 데이터: {macro_data}")
 
 
-            sector_data = self._query_tool("sector_tool", ticker = ticker, top_k=5, days_ago=14, days_lookback=14, score_threshold=0.4)
+            sector_data = self._query_tool("sector_tool", ticker = ticker, top_k=5, days_ago=14, score_threshold=0.4)
             # print(f"[DEBUG] 🏢 섹터 데이터: {sector_data}")
 
             # 3) 종목 리포트
@@ -1,15 +1,7 @@
 import abc
 from typing import Any, Dict, Optional
-from tools.price_tool import PriceTool
-from tools.financial_tool import FinancialTool
-from tools.macro_tool import MacroTool
-from tools.sector_tool import SectorTool
-from tools.stock_tool import StockTool
-from tools.pdf_tool import PDFTool
-from openai import OpenAI  # openai==1.52.2
-
-import mysql.connector
-from config.config_loader import load_config
+from tools.registry import ToolRegistry, get_registry
+from llm_manager import LLMManager
 
 
 
@@ -25,43 +17,16 @@ class BaseAgent(abc.ABC):
         self.config = config
         self.tools = self._register_tools()  # 자동 등록
 
-    def _register_tools(self) -> Dict[str, Any]:
+    def _register_tools(self) -> ToolRegistry:
         """
-        사용할 Tool을 자동 등록
+        프로세스 전역 Tool 레지스트리를 사용 (Tool은 첫 사용 시 생성되어 에이전트 간 공유)
         """
-        # 설정 파일 로드
-        config = load_config(config_path='./config/config.yaml')
-        
-        # 데이터베이스 및 API 정보 불러오기
-        mysql_config = config['mysql']
-        mongo_config = config['mongo']
-        upstage_config = config['upstage']
-
-        # MySQL 데이터베이스 연결 설정
-        self.db_client = mysql.connector.connect(
-            user=mysql_config['user'],
-            password=mysql_config['password'],
-            host=mysql_config['host'],
-            port=mysql_config['port'],
-            database=mysql_config['database']
-        )
-        
-        # URL 정보 추출
-        mysql_url = mysql_config['url']
-        mongo_url = mongo_config['url']
-        upstage_api_key = upstage_config['api_key']
-
-        # 툴 딕셔너리 생성
-        tools = {
-            "price_tool": PriceTool(),
-            "macro_tool": MacroTool(),
-            "financial_tool": FinancialTool(),
-            "stock_tool": StockTool(),
-            "sector_tool": SectorTool(),
-            "pdf_tool": PDFTool(),
-        }
-        
-        return tools
+        return get_registry()
+
+    @property
+    def db_client(self):
+        """에이전트 간 공유 MySQL 연결"""
+        return self.tools.get("db_client")
 
     def _query_tool(self, tool_name: str, **kwargs) -> Any:
         """등록된 툴을 호출"""
@@ -74,12 +39,7 @@ class BaseAgent(abc.ABC):
         """
         이미 완성된 프롬프트 문자열을 LLM에 전달하여 결과를 반환합니다.
         """
-        # 설정 파일에서 API 키 가져오기
-        config = load_config(config_path='./config/config.yaml')
-        api_key = config['upstage']['api_key']
-        
-        client = OpenAI(api_key=api_key, 
-                        base_url="https://api.upstage.ai/v1",)
+        client = LLMManager.initialize_openai_client()
         
         system_prompt = """
 
@@ -120,12 +80,7 @@ class BaseAgent(abc.ABC):
             """
             이미 완성된 프롬프트 문자열을 LLM에 전달하여 결과를 반환합니다.
             """
-            # 설정 파일에서 API 키 가져오기
-            config = load_config(config_path='./config/config.yaml')
-            api_key = config['upstage']['api_key']
-            
-            client = OpenAI(api_key=api_key, 
-                            base_url="https://api.upstage.ai/v1",)
+            client = LLMManager.initialize_openai_client()
             
             system_prompt = """너는 투자 보고서를 작성하는 금융 애널리스트입니다.
                                 항상 정확히 다음 마크다운 형식으로 보고서를 작성해야 합니다:
@@ -176,12 +131,7 @@ class BaseAgent(abc.ABC):
             return result.choices[0].message.content
     
     def _call_llm_structured(self, prompt: str, response_structure) -> str:
-                # 설정 파일에서 API 키 가져오기
-        config = load_config(config_path='./config/config.yaml')
-        api_key = config['upstage']['api_key']
-        
-        client = OpenAI(api_key=api_key, 
-                        base_url="https://api.upstage.ai/v1",)
+        client = LLMManager.initialize_openai_client()
         
         response = client.chat.completions.create(
             model='solar-pro', 
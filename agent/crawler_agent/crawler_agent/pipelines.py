@@ -4,18 +4,33 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 import os
+import sys
 import requests
 import mysql.connector
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 from itemadapter import ItemAdapter
 from crawler_agent.summary_gemma import summarization
 load_dotenv()
 
+## project root (for tools.sector_tool), the crawler runs from agent/crawler_agent.
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
 class ItemPipeline:
 
-    def __init__(self):
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            ingest_embeddings=crawler.settings.getbool("INGEST_EMBEDDINGS", True),
+            embedding_batch_size=crawler.settings.getint("EMBEDDING_BATCH_SIZE", 32),
+            cache_dir=crawler.settings.get("EMBEDDING_CACHE_DIR"),
+        )
+
+    def __init__(self, ingest_embeddings=True, embedding_batch_size=32, cache_dir=None):
         self.conn = mysql.connector.connect(
             host = os.getenv("SQL_HOST"),
             user = os.getenv("SQL_USER"),
@@ -25,6 +40,13 @@ class ItemPipeline:
         )
         self.cur = self.conn.cursor()
 
+        ## ids of inserted rows waiting for embedding (flushed in batches).
+        self.ingest_embeddings = ingest_embeddings
+        self.embedding_batch_size = embedding_batch_size
+        self.cache_dir = cache_dir or str(PROJECT_ROOT / "data" / "cache")
+        self.pending_ids = {"stock": [], "sector": []}
+        self.sector_tool = None
+
     def process_item(self, item, spider):
 
         ## case handling for stock, sector, and macro reports.
@@ -105,9 +127,41 @@ class ItemPipeline:
             self.conn.rollback()  # 오류 발생 시 롤백
             raise RuntimeError(f"Database insertion error: {e}")
 
+        ## embed summaries at ingestion time, batched across items.
+        if self.ingest_embeddings:
+            self.pending_ids[item_type].append(self.cur.lastrowid)
+            if len(self.pending_ids[item_type]) >= self.embedding_batch_size:
+                self.flush_embeddings(spider, item_type)
+
         return item
     
+    def flush_embeddings(self, spider, item_type):
+        """
+        버퍼에 쌓인 리포트를 한 번에 임베딩해 MongoDB/로컬 인덱스/임베딩 캐시에 반영
+        (sector: 섹터 리포트 문서 임베딩, stock: 종목 키워드/설명 질의 임베딩)
+        실패해도 크롤링은 계속하며, 남은 문서는 분석 파이프라인의 동기화에서 처리됩니다.
+        """
+        ids, self.pending_ids[item_type] = self.pending_ids[item_type], []
+        if not ids:
+            return
+        try:
+            if self.sector_tool is None:
+                from tools.sector_tool import SectorTool
+                self.sector_tool = SectorTool(cache_dir=self.cache_dir)
+            if item_type == "sector":
+                self.sector_tool.ingest_sector_reports(ids, batch_size=self.embedding_batch_size)
+            else:
+                self.sector_tool.ingest_stock_reports(ids)
+        except Exception as e:
+            spider.logger.warning(f"Embedding ingestion failed for {len(ids)} {item_type} reports: {e}")
+    
     def close_spider(self, spider):
+        ## Flush remaining embeddings
+        for item_type in self.pending_ids:
+            self.flush_embeddings(spider, item_type)
+        if self.sector_tool is not None:
+            self.sector_tool.close()
+
         ## Close cursor & connection to database 
         self.cur.close()
         self.conn.close()
\ No newline at end of file
@@ -100,4 +100,9 @@ SQL_HOST = os.getenv("SQL_HOST")
 SQL_USER = os.getenv("SQL_USER")
 SQL_PW = os.getenv("SQL_PW")
 SQL_DB = os.getenv("SQL_DB")
-SQL_CHARSET = os.getenv("SQL_CHARSET")
\ No newline at end of file
+SQL_CHARSET = os.getenv("SQL_CHARSET")
+
+# Embed sector/stock summaries at ingestion time (ItemPipeline)
+INGEST_EMBEDDINGS = True
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_CACHE_DIR = None  # defaults to <project root>/data/cache
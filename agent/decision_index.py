@@ -0,0 +1,433 @@
+# agent/decision_index.py
+import logging
+import os
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+logger = logging.getLogger('fund_manager_agent')
+
+DECISION_INDEX_DIM = 4096
+
+# 판단 수가 ANN_THRESHOLD 이상이면 flat 인덱스를 HNSW/IVF로 전환 (config: fund_manager.ann_index / ann_threshold)
+ANN_KINDS = ("hnsw", "ivf")
+ANN_THRESHOLD = 10000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+IVF_NPROBE = 16
+IVF_MIN_POINTS_PER_LIST = 39  # faiss k-means 권장 최소 학습 벡터 수 (리스트당)
+IVF_RETRAIN_GROWTH = 2        # 데이터 수에 맞는 nlist가 현재의 2배 이상이 되면 재학습
+
+# write-ahead log: 레코드 = (본문 길이, crc32) 헤더 + 본문(판단 id, report_id, 벡터; 벡터가 없으면 삭제)
+# 레코드가 SNAPSHOT_EVERY개 쌓이면 인덱스 전체를 임시 파일에 쓰고 rename한 뒤 로그를 비움
+SNAPSHOT_EVERY = 256
+_WAL_HEADER = struct.Struct("<II")
+_WAL_ID = struct.Struct("<qH")
+
+
+def normalize(vectors) -> np.ndarray:
+    """행 단위 L2 정규화 (내적 = 코사인 유사도)"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms)
+
+
+def combine_embeddings(vectors) -> np.ndarray:
+    """판단 하나의 여러 임베딩(요약, 응답)을 정규화 평균 벡터 하나로 결합"""
+    return normalize(normalize(vectors).mean(axis=0))[0]
+
+
+def ivf_nlist(n: int) -> int:
+    return max(1, min(int(4 * np.sqrt(n)), n // IVF_MIN_POINTS_PER_LIST))
+
+
+def build_decision_index(vectors: np.ndarray, kind: str = "flat", dim: Optional[int] = None):
+    """
+    정규화된 판단 벡터로 내적(코사인) FAISS 인덱스를 만들고 학습 (벡터는 추가하지 않음)
+
+    kind: "flat" / "hnsw" / "ivf"
+    판단 인덱스는 양자화하지 않습니다. 재정렬용 float32 원본을 같은 인덱스에 보관해야 해서
+    (IndexRefineFlat) 양자화 코드만큼 메모리가 오히려 늘어나기 때문입니다.
+    """
+    import faiss
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dim is None:
+        dim = vectors.shape[1] if vectors.ndim == 2 and len(vectors) else DECISION_INDEX_DIM
+    metric = faiss.METRIC_INNER_PRODUCT
+
+    if kind == "hnsw":
+        base = faiss.IndexHNSWFlat(dim, HNSW_M, metric)
+        base.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        base.hnsw.efSearch = HNSW_EF_SEARCH
+    elif kind == "ivf":
+        nlist = ivf_nlist(len(vectors))
+        base = faiss.IndexIVFFlat(faiss.IndexFlatIP(dim), dim, nlist, metric)
+        base.nprobe = min(IVF_NPROBE, nlist)
+    else:
+        base = faiss.IndexFlatIP(dim)
+
+    if not base.is_trained:
+        base.train(vectors)
+    return base
+
+
+class DecisionIndex:
+    """
+    판단 id(decisions.id)로 매핑된 코사인 유사도 FAISS 인덱스.
+
+    - 벡터는 정규화해 내적으로 검색하고 IndexIDMap2에 판단 id를 직접 저장하므로,
+      위치→id 매핑 파일 없이 삭제/교체해도 매핑이 깨지지 않습니다.
+    - 판단 수가 ann_threshold 이상이 되면 flat에서 HNSW/IVF로 자동 전환하고,
+      IVF는 데이터 수에 맞는 리스트 수가 현재의 IVF_RETRAIN_GROWTH배가 되면 다시 학습합니다.
+    - 추가/삭제는 (판단 id, report_id, 벡터) 레코드를 write-ahead log(<path>.wal)에 덧붙이고 fsync하며,
+      주기적으로 스냅샷(임시 파일 + os.replace)을 만든 뒤 로그를 비웁니다. 로드 시 스냅샷 이후 로그를 재생하고,
+      CRC가 맞지 않는 끝부분(쓰다 중단된 레코드)은 잘라냅니다.
+    - 쓰기는 <path>.lock의 flock으로 직렬화되며, 다른 프로세스(병렬 윈도우)가 쓴 로그/스냅샷은
+      쓰기·검색 전에 따라잡습니다.
+    """
+    def __init__(self, path: str, dim: int = DECISION_INDEX_DIM, ann_kind: str = "hnsw", ann_threshold: int = ANN_THRESHOLD,
+                 legacy_decision_ids: Optional[Sequence[int]] = None, snapshot_every: int = SNAPSHOT_EVERY):
+        """
+        Args:
+            path: 인덱스 스냅샷 파일 경로 (로그는 <path>.wal, 잠금은 <path>.lock)
+            ann_kind: 판단 수가 ann_threshold 이상일 때 사용할 인덱스 ("hnsw" / "ivf")
+            legacy_decision_ids: 기존 위치 기반 인덱스를 변환할 때 저장 순서대로의 판단 id
+            snapshot_every: 로그 레코드가 이 수만큼 쌓이면 스냅샷
+        """
+        if ann_kind not in ANN_KINDS:
+            raise ValueError(f"지원하지 않는 ANN 인덱스: {ann_kind}")
+        self.path = path
+        self.wal_path = path + ".wal"
+        self.lock_path = path + ".lock"
+        self.dim = dim
+        self.ann_kind = ann_kind
+        self.ann_threshold = ann_threshold
+        self.snapshot_every = snapshot_every
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.index = None
+        self._snapshot_sig = None
+        self._wal_offset = 0
+        self._wal_records = 0
+
+        with self._locked():
+            self._load(legacy_decision_ids)
+
+    # ----------- 잠금 / 로그 / 스냅샷 ----------- #
+
+    @contextmanager
+    def _locked(self):
+        """스레드 + 프로세스(flock) 배타 잠금"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _file_sig(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _load(self, legacy_decision_ids: Optional[Sequence[int]] = None):
+        """스냅샷 로드 후 로그 전체 재생 (잠금 안에서 호출)"""
+        import faiss
+
+        index = faiss.read_index(self.path) if os.path.exists(self.path) else None
+        self._snapshot_sig = self._file_sig()
+        self._wal_offset = 0
+        self._wal_records = 0
+        if index is None:
+            self.index = faiss.IndexIDMap2(build_decision_index(np.empty((0, self.dim), np.float32), dim=self.dim))
+        elif isinstance(index, faiss.IndexIDMap2):
+            self.index = index
+        else:
+            self._migrate_legacy(index, legacy_decision_ids or [])
+            self._snapshot()
+        self._replay()
+        if self._maybe_rebuild() or self._wal_records >= self.snapshot_every:
+            self._snapshot()
+
+    def _refresh(self):
+        """다른 프로세스가 스냅샷을 바꿨으면 다시 로드, 아니면 로그의 새 레코드만 재생 (잠금 안에서 호출)"""
+        if self._file_sig() != self._snapshot_sig:
+            self._load()
+            return
+        try:
+            wal_size = os.path.getsize(self.wal_path)
+        except FileNotFoundError:
+            wal_size = 0
+        if wal_size < self._wal_offset:
+            self._load()
+        elif wal_size > self._wal_offset:
+            self._replay()
+
+    def _replay(self):
+        """로그의 _wal_offset 이후 레코드를 인덱스에 적용하고, 손상된 끝부분은 잘라냄"""
+        if not os.path.exists(self.wal_path):
+            return
+        pending_ids, pending_vectors = [], []
+
+        def flush_adds():
+            if pending_ids:
+                self._apply_add(np.asarray(pending_ids, dtype=np.int64), np.stack(pending_vectors))
+                pending_ids.clear()
+                pending_vectors.clear()
+
+        with open(self.wal_path, "r+b") as f:
+            f.seek(self._wal_offset)
+            offset = self._wal_offset
+            while True:
+                header = f.read(_WAL_HEADER.size)
+                if len(header) < _WAL_HEADER.size:
+                    break
+                length, crc = _WAL_HEADER.unpack(header)
+                body = f.read(length)
+                if len(body) < length or zlib.crc32(body) != crc:
+                    break
+                decision_id, rid_length = _WAL_ID.unpack_from(body)
+                vector = np.frombuffer(body, dtype=np.float32, offset=_WAL_ID.size + rid_length)
+                if len(vector):
+                    pending_ids.append(decision_id)
+                    pending_vectors.append(vector)
+                else:
+                    flush_adds()
+                    self._apply_remove(np.asarray([decision_id], dtype=np.int64))
+                offset += _WAL_HEADER.size + length
+                self._wal_records += 1
+            flush_adds()
+
+            if offset < os.fstat(f.fileno()).st_size:
+                logger.warning("Truncating torn decision WAL tail at byte %d.", offset)
+                f.truncate(offset)
+                os.fsync(f.fileno())
+        self._wal_offset = offset
+
+    def _append(self, ids: np.ndarray, vectors: Optional[np.ndarray], report_ids: Optional[Sequence[str]]):
+        """레코드를 로그에 덧붙이고 fsync (vectors가 None이면 삭제 레코드)"""
+        records = []
+        for i, decision_id in enumerate(ids):
+            rid = (report_ids[i] if report_ids is not None else "").encode("utf-8")
+            vector = vectors[i].tobytes() if vectors is not None else b""
+            body = _WAL_ID.pack(int(decision_id), len(rid)) + rid + vector
+            records.append(_WAL_HEADER.pack(len(body), zlib.crc32(body)) + body)
+        data = b"".join(records)
+        with open(self.wal_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._wal_offset += len(data)
+        self._wal_records += len(records)
+
+    def _snapshot(self):
+        """인덱스를 임시 파일에 쓰고 원자적으로 교체한 뒤 로그를 비움 (잠금 안에서 호출)"""
+        import faiss
+
+        tmp_path = self.path + ".tmp"
+        faiss.write_index(self.index, tmp_path)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        # 스냅샷 교체 후 로그를 비우기 전에 중단되어도, 재생 시 같은 id는 교체되므로 결과가 같음
+        with open(self.wal_path, "wb") as f:
+            os.fsync(f.fileno())
+        self._snapshot_sig = self._file_sig()
+        self._wal_offset = 0
+        self._wal_records = 0
+
+    # ----------- 인덱스 내부 ----------- #
+
+    def _base(self):
+        import faiss
+        return faiss.downcast_index(self.index.index)
+
+    @property
+    def kind(self) -> str:
+        import faiss
+
+        base = self._base()
+        if isinstance(base, faiss.IndexRefineFlat):
+            # 이전 버전의 양자화 스냅샷 (로드 시 float32 인덱스로 다시 구성)
+            base = faiss.downcast_index(base.base_index)
+        if isinstance(base, faiss.IndexHNSW):
+            return "hnsw"
+        if isinstance(base, faiss.IndexIVF):
+            return "ivf"
+        return "flat"
+
+    def ids(self) -> np.ndarray:
+        import faiss
+        return faiss.vector_to_array(self.index.id_map)
+
+    def vectors(self) -> np.ndarray:
+        """저장된 (정규화) 벡터, ids()와 같은 순서"""
+        import faiss
+
+        if self.index.ntotal == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        base = self._base()
+        if isinstance(base, faiss.IndexIVF):
+            base.make_direct_map()
+        return base.reconstruct_n(0, self.index.ntotal)
+
+    def _migrate_legacy(self, legacy, decision_ids: Sequence[int]):
+        """위치 기반 L2 인덱스(report_ids.json 매핑)를 판단 id 매핑 인덱스로 변환"""
+        import faiss
+
+        vectors = legacy.reconstruct_n(0, legacy.ntotal) if legacy.ntotal else np.empty((0, self.dim), np.float32)
+        ids = list(decision_ids)
+        if ids and len(vectors) == 2 * len(ids):
+            # 판단 하나당 [요약, 응답] 두 벡터가 저장되어 있던 경우 정규화 평균으로 결합
+            vectors = normalize(vectors).reshape(len(ids), 2, -1).mean(axis=1)
+        elif len(vectors) != len(ids):
+            logger.warning("Legacy index has %d vectors for %d decisions; keeping the first %d.",
+                           len(vectors), len(ids), min(len(vectors), len(ids)))
+            n = min(len(vectors), len(ids))
+            vectors, ids = vectors[:n], ids[:n]
+
+        vectors = normalize(vectors) if len(vectors) else vectors
+        self.index = faiss.IndexIDMap2(build_decision_index(vectors, dim=self.dim))
+        if len(ids):
+            self.index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+        logger.info("Legacy decision index migrated to id-mapped cosine index (%d decisions).", len(ids))
+
+    def _maybe_rebuild(self) -> bool:
+        import faiss
+
+        n = self.index.ntotal
+        kind = self.kind
+        if isinstance(self._base(), faiss.IndexRefineFlat):
+            # 이전 버전의 양자화 스냅샷은 float32 원본(refine 인덱스)으로 다시 구성
+            self._rebuild(self.ann_kind if kind == "flat" and n >= self.ann_threshold else kind)
+        elif kind == "flat" and n >= self.ann_threshold:
+            self._rebuild(self.ann_kind)
+        elif kind == "ivf" and ivf_nlist(n) >= IVF_RETRAIN_GROWTH * faiss.extract_index_ivf(self._base()).nlist:
+            self._rebuild("ivf")
+        else:
+            return False
+        return True
+
+    def _rebuild(self, kind: Optional[str] = None, exclude: Optional[np.ndarray] = None):
+        import faiss
+
+        kind = kind or self.kind
+        ids, vectors = self.ids(), self.vectors()
+        if exclude is not None and len(exclude):
+            keep = ~np.isin(ids, exclude)
+            ids, vectors = ids[keep], vectors[keep]
+        index = faiss.IndexIDMap2(build_decision_index(vectors, kind, dim=self.dim))
+        if len(ids):
+            index.add_with_ids(np.ascontiguousarray(vectors), ids)
+        self.index = index
+        logger.info("Decision index rebuilt as %s (%d vectors).", kind, len(ids))
+
+    def _apply_add(self, ids: np.ndarray, vectors: np.ndarray) -> bool:
+        """메모리 인덱스에 추가 (이미 있는 id는 교체), 재구성했으면 True"""
+        existing = ids[np.isin(ids, self.ids())]
+        if len(existing):
+            self._apply_remove(existing)
+        self.index.add_with_ids(normalize(vectors), ids)
+        return self._maybe_rebuild()
+
+    def _apply_remove(self, ids: np.ndarray):
+        import faiss
+
+        if isinstance(self._base(), faiss.IndexFlat):
+            self.index.remove_ids(ids)
+        else:
+            # IndexIDMap2의 삭제는 순서를 유지하는 flat 인덱스에서만 안전 (HNSW/IVF/Refine은 제외하고 다시 구성)
+            self._rebuild(exclude=ids)
+
+    # ----------- 공개 API ----------- #
+
+    def add(self, ids: Sequence[int], vectors, report_ids: Optional[Sequence[str]] = None) -> None:
+        """
+        판단 벡터 추가 (이미 있는 id는 교체)
+        로그에 먼저 기록(fsync)한 뒤 메모리 인덱스에 반영하고, 전환/재학습했거나 로그가 쌓였으면 스냅샷합니다.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        vectors = normalize(vectors)
+        with self._locked():
+            self._refresh()
+            # 로그에 기록된 레코드는 열 때마다 재생되므로, 적용할 수 없는 벡터는 기록 전에 거부
+            self._validate(ids, vectors, report_ids)
+            self._append(ids, vectors, report_ids)
+            rebuilt = self._apply_add(ids, vectors)
+            if rebuilt or self._wal_records >= self.snapshot_every:
+                self._snapshot()
+
+    def _validate(self, ids: np.ndarray, vectors: np.ndarray, report_ids: Optional[Sequence[str]]) -> None:
+        if vectors.ndim != 2 or vectors.shape[1] != self.index.d:
+            raise ValueError(f"판단 벡터 차원 불일치: {vectors.shape}, 인덱스 차원 {self.index.d}")
+        if len(vectors) != len(ids):
+            raise ValueError(f"판단 id 수({len(ids)})와 벡터 수({len(vectors)})가 다릅니다")
+        if report_ids is not None and len(report_ids) != len(ids):
+            raise ValueError(f"판단 id 수({len(ids)})와 report_id 수({len(report_ids)})가 다릅니다")
+        if not np.isfinite(vectors).all():
+            raise ValueError("판단 벡터에 NaN/inf 값이 있습니다")
+
+    def remove(self, ids: Sequence[int]) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        with self._locked():
+            self._refresh()
+            self._append(ids, None, None)
+            self._apply_remove(ids)
+            if self._wal_records >= self.snapshot_every:
+                self._snapshot()
+
+    def rebuild(self, kind: Optional[str] = None):
+        """저장된 벡터로 인덱스를 새로 학습/구성하고 스냅샷"""
+        with self._locked():
+            self._refresh()
+            self._rebuild(kind)
+            self._snapshot()
+
+    def search(self, vector, top_k: int = 1) -> List[Tuple[int, float]]:
+        """코사인 유사도 상위 top_k (판단 id, 유사도)"""
+        with self._locked():
+            self._refresh()
+            if self.index.ntotal == 0:
+                return []
+            scores, ids = self.index.search(normalize(vector), min(top_k, self.index.ntotal))
+        return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i != -1]
+
+    def snapshot(self):
+        """로그를 스냅샷으로 합침"""
+        with self._locked():
+            self._refresh()
+            self._snapshot()
+
+    def __len__(self) -> int:
+        with self._locked():
+            self._refresh()
+            return self.index.ntotal
@@ -0,0 +1,213 @@
+# agent/decision_store.py
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 피드백 수익률 기간 (주). 가장 긴 기간이 지나야 피드백을 계산합니다.
+FEEDBACK_HORIZON_WEEKS = {"1w": 1, "1m": 4, "3m": 12, "6m": 24}
+FEEDBACK_DUE_DAYS = max(FEEDBACK_HORIZON_WEEKS.values()) * 7
+# 가격은 받았지만 기간이 채워지지 않은 판단의 재시도 횟수 (하루 한 번). 넘으면 포기 (거래정지/상장폐지 등)
+MAX_FEEDBACK_ATTEMPTS = 5
+# 가격 조회 자체가 실패한 경우(일시 장애)는 횟수에 넣지 않고 재시도 간격만 늘림 (1, 2, 4, ... 최대 7일)
+MAX_FEEDBACK_BACKOFF_DAYS = 7
+
+
+class DecisionStore:
+    """
+    펀드매니저 판단/피드백 SQLite 저장소.
+
+    - 프로세스당 하나의 WAL 모드 연결을 재사용하고, 스키마와 인덱스(report_id, ticker, date)는 생성 시 한 번만 만듭니다.
+    - 유사 사례 조회는 top-k 판단 id 전체를 한 번의 JOIN으로 가져옵니다.
+    - 판단은 저장과 같은 트랜잭션으로 피드백 대기열(pending_feedback)에 등록되고,
+      모든 기간이 지난 뒤 due_feedback()으로 꺼내 save_feedback()으로 완료합니다.
+      수익률 기간이 채워지지 않은 시도는 record_feedback_attempt()로 기록해 다음 날 다시 시도하고 MAX_FEEDBACK_ATTEMPTS번이면 포기하며
+      (포기한 판단은 abandoned_feedback()으로 조회), 가격 조회 실패는 record_feedback_error()로 횟수 없이 간격만 늘려 재시도합니다.
+    """
+    def __init__(self, db_path: str = "db/fund_manager.db"):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS decisions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            report_id TEXT,
+            ticker TEXT,
+            decision TEXT,
+            llm_response TEXT,
+            date TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_decisions_report_id ON decisions (report_id);
+        CREATE INDEX IF NOT EXISTS idx_decisions_ticker ON decisions (ticker);
+        CREATE INDEX IF NOT EXISTS idx_decisions_date ON decisions (date);
+        CREATE TABLE IF NOT EXISTS feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            report_id TEXT,
+            return_1w REAL,
+            return_1m REAL,
+            return_3m REAL,
+            return_6m REAL,
+            feedback_summary TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_feedback_report_id ON feedback (report_id);
+        CREATE TABLE IF NOT EXISTS pending_feedback (
+            decision_id INTEGER PRIMARY KEY,
+            report_id TEXT UNIQUE,
+            due_date TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_attempt TEXT,
+            errors INTEGER NOT NULL DEFAULT 0,
+            retry_after TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_pending_feedback_due_date ON pending_feedback (due_date);
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(pending_feedback)")}
+        if "attempts" not in columns:
+            self.conn.execute("ALTER TABLE pending_feedback ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("ALTER TABLE pending_feedback ADD COLUMN last_attempt TEXT")
+        if "errors" not in columns:
+            self.conn.execute("ALTER TABLE pending_feedback ADD COLUMN errors INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("ALTER TABLE pending_feedback ADD COLUMN retry_after TEXT")
+            self.conn.execute(
+                "UPDATE pending_feedback SET retry_after = date(last_attempt, '+1 day') WHERE last_attempt IS NOT NULL"
+            )
+        # 대기열 도입 전 피드백 없이 저장된 판단도 등록 (report_id당 하나)
+        self.conn.execute(f"""
+        INSERT OR IGNORE INTO pending_feedback (decision_id, report_id, due_date)
+        SELECT d.id, d.report_id, date(d.date, '+{FEEDBACK_DUE_DAYS} days')
+        FROM decisions d
+        WHERE NOT EXISTS (SELECT 1 FROM feedback f WHERE f.report_id = d.report_id)
+        ORDER BY d.id
+        """)
+        self.conn.commit()
+
+    def save_decision(self, report: dict) -> int:
+        """판단 저장 후 판단 id(decisions.id) 반환"""
+        return self.save_decisions([report])[0]
+
+    def save_decisions(self, reports: Sequence[dict]) -> List[int]:
+        """
+        여러 판단을 한 트랜잭션으로 저장하고 입력 순서대로 판단 id 반환
+        (같은 트랜잭션에서 피드백 대기열에 마지막 기간의 만기일로 등록)
+        """
+        ids = []
+        with self._lock:
+            for report in reports:
+                cur = self.conn.execute("""
+                INSERT INTO decisions (
+                    report_id, ticker, decision,  llm_response, date
+                ) VALUES (?, ?, ?, ?, ?)
+                """, (
+                    report["report_id"], report["ticker"], report["final_decision"],
+                    report["llm_response"], report["date"]
+                ))
+                ids.append(cur.lastrowid)
+                self.conn.execute(f"""
+                INSERT OR IGNORE INTO pending_feedback (decision_id, report_id, due_date)
+                VALUES (?, ?, date(?, '+{FEEDBACK_DUE_DAYS} days'))
+                """, (cur.lastrowid, report["report_id"], report["date"]))
+            self.conn.commit()
+        return ids
+
+    def save_feedback(self, report_id: str, returns: Dict[str, Optional[float]], feedback_summary: str):
+        """피드백 저장 (대기열에서도 제거)"""
+        with self._lock:
+            self.conn.execute("DELETE FROM pending_feedback WHERE report_id = ?", (report_id,))
+            self.conn.execute("""
+            INSERT INTO feedback (report_id, return_1w, return_1m, return_3m, return_6m ,feedback_summary)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                report_id, returns["1w"], returns["1m"], returns["3m"], returns["6m"], feedback_summary
+            ))
+            self.conn.commit()
+
+    def due_feedback(self, today: str, limit: Optional[int] = None) -> List[Tuple[str, str, str, str]]:
+        """
+        만기일이 today 이전인 대기 판단의 (report_id, ticker, llm_response, date)를 만기일 순으로 반환
+        (재시도 시각이 아직 오지 않았거나 재시도 횟수를 넘긴 판단은 제외)
+        """
+        with self._lock:
+            return self.conn.execute("""
+            SELECT d.report_id, d.ticker, d.llm_response, d.date
+            FROM pending_feedback p
+            JOIN decisions d ON d.id = p.decision_id
+            WHERE p.due_date <= ? AND p.attempts < ? AND (p.retry_after IS NULL OR p.retry_after <= ?)
+            ORDER BY p.due_date
+            LIMIT ?
+            """, (today, MAX_FEEDBACK_ATTEMPTS, today, -1 if limit is None else limit)).fetchall()
+
+    def record_feedback_attempt(self, report_id: str, today: str) -> bool:
+        """
+        가격은 받았지만 수익률 기간이 채워지지 않은 시도 기록 (다음 날 재시도)
+        이번 시도로 재시도 횟수를 다 써서 포기하게 되면 True
+        """
+        with self._lock:
+            self.conn.execute("""
+            UPDATE pending_feedback
+            SET attempts = attempts + 1, errors = 0, last_attempt = ?, retry_after = date(?, '+1 day')
+            WHERE report_id = ?
+            """, (today, today, report_id))
+            self.conn.commit()
+            row = self.conn.execute(
+                "SELECT attempts FROM pending_feedback WHERE report_id = ?", (report_id,)
+            ).fetchone()
+        return row is not None and row[0] >= MAX_FEEDBACK_ATTEMPTS
+
+    def record_feedback_error(self, report_id: str, today: str):
+        """가격 조회 실패 기록 (재시도 횟수에 넣지 않고 재시도 간격만 지수적으로 늘림)"""
+        with self._lock:
+            self.conn.execute(f"""
+            UPDATE pending_feedback
+            SET errors = errors + 1, last_attempt = ?,
+                retry_after = date(?, '+' || min(1 << errors, {MAX_FEEDBACK_BACKOFF_DAYS}) || ' days')
+            WHERE report_id = ?
+            """, (today, today, report_id))
+            self.conn.commit()
+
+    def abandoned_feedback(self) -> List[Tuple[str, str, str]]:
+        """재시도 횟수를 넘겨 포기한 판단의 (report_id, ticker, date)"""
+        with self._lock:
+            return self.conn.execute("""
+            SELECT d.report_id, d.ticker, d.date
+            FROM pending_feedback p
+            JOIN decisions d ON d.id = p.decision_id
+            WHERE p.attempts >= ?
+            ORDER BY p.due_date
+            """, (MAX_FEEDBACK_ATTEMPTS,)).fetchall()
+
+    def pending_feedback_count(self) -> int:
+        """아직 재시도할 대기 판단 수 (포기한 판단 제외)"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM pending_feedback WHERE attempts < ?", (MAX_FEEDBACK_ATTEMPTS,)
+            ).fetchone()[0]
+
+    def decision_ids(self) -> List[int]:
+        """저장 순서대로의 판단 id"""
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT id FROM decisions ORDER BY id")]
+
+    def get_cases(self, decision_ids: Sequence[int]) -> List[Tuple[int, str, str, str]]:
+        """
+        피드백이 있는 판단의 (판단 id, ticker, llm_response, feedback_summary)를 decision_ids 순서로 반환
+        (report_id당 피드백이 여러 개면 먼저 저장된 것)
+        """
+        if not decision_ids:
+            return []
+        placeholders = ",".join("?" * len(decision_ids))
+        with self._lock:
+            rows = self.conn.execute(f"""
+            SELECT d.id, d.ticker, d.llm_response, f.feedback_summary
+            FROM decisions d
+            JOIN feedback f ON f.report_id = d.report_id
+            WHERE d.id IN ({placeholders})
+            ORDER BY f.id
+            """, list(decision_ids)).fetchall()
+        cases = {}
+        for row in rows:
+            cases.setdefault(row[0], row)
+        return [cases[i] for i in decision_ids if i in cases]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -61,21 +61,15 @@
 #         #최종 
 #         print(f"#### 📝 FundManagerAgent 결과 : {decisions}")
 #         return decisions
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from .base_agent import BaseAgent
-from datetime import datetime
-from pandas_datareader import data as pdr
-import yfinance as yf
 from datetime import datetime, timedelta, date
-import sqlite3
-import json
 import os
-import faiss
 import logging
 import numpy as np
-from langchain_upstage import UpstageEmbeddings # pip install -qU langchain-core langchain-upstage
-from langchain.prompts import PromptTemplate
-from config.config_loader import load_config
+from config.config_loader import get_config
+from agent.decision_index import ANN_THRESHOLD, DecisionIndex, combine_embeddings
+from agent.decision_store import FEEDBACK_HORIZON_WEEKS, MAX_FEEDBACK_ATTEMPTS, DecisionStore
 
 
 # ------------------------ Logging --------------------------
@@ -88,9 +82,8 @@ logger.addHandler(stream_handler)
 
 
 # ------------------------ Templates ------------------------
-fund_manager_template = PromptTemplate(
-    input_variables=["report_summary", "macro_data", "similar_cases"],
-    template="""
+# str.format으로 채우는 프롬프트 템플릿 (import 시 langchain 로딩을 피하기 위해 문자열로 유지)
+fund_manager_template = """
 당신은 금융 시장의 데이터를 바탕으로 **투자 판단을 내리는 펀드매니저 역할**을 맡았습니다.  
 아래에 세 가지 정보가 주어집니다:
 
@@ -210,11 +203,8 @@ fund_manager_template = PromptTemplate(
     - 이 종목은 현재 시점에서 포트폴리오에 ‘편입하는 것에 찬성’합니다.  
     - 이 종목은 현재 시점에서 포트폴리오에 ‘편입하는 것에 반대’합니다.
 """
-            )
 
-fund_feedback_template = PromptTemplate(
-    input_variables=["llm_decision", "return_1w", "return_1m", "return_3m", "return_6m"],
-    template=""" 
+fund_feedback_template = """ 
 당신은 LLM 기반 펀드매니저의 판단을 평가하고, 향후 의사결정에 도움이 될 수 있는 학습 피드백을 생성하는 에이전트입니다.
 
 [펀드매니저 판단 리포트]
@@ -244,11 +234,8 @@ fund_feedback_template = PromptTemplate(
 4. 한줄 총평
 - 예: "중립적인 근거에 비해 수익률이 좋았으며, 리스크 요소 반영이 우수했다."
 """
-)
 
-query_rewrite_prompt = PromptTemplate(
-    input_variables=["opinion"],
-    template="""
+query_rewrite_prompt = """
 당신은 LLM 기반 펀드매니저 시스템의 검색 에이전트입니다.
 
 아래는 애널리스트 에이전트의 리포트 판단 요약과, 크리틱 에이전트의 피드백입니다. 
@@ -267,34 +254,69 @@ query_rewrite_prompt = PromptTemplate(
 [출력 예시]
 "미국 고용지표 개선과 금리 동결 가능성을 근거로 기술주 상승을 예상하며, 성장 섹터 중심의 매수 의견을 제시함. 다만 인플레이션 재확산 리스크를 보완 필요."
     """
-)
 
 
 # ------------------------ Embedding & Index ------------------------
-config = load_config(config_path='./config/config.yaml')
-api_key = config['upstage']['api_key']
-embeddings = UpstageEmbeddings(
-    api_key=api_key,
-    model="embedding-query"
-)
+# 임베딩 클라이언트, FAISS 인덱스, 판단 DB 연결은 import 시점이 아닌 첫 사용 시점에 로드
+FAISS_INDEX_PATH = "db/vector_index.faiss"
+LEGACY_REPORT_IDS_PATH = "db/report_ids.json"  # 위치 기반 매핑 (id 매핑 인덱스로 변환 후 삭제)
+DECISION_DB_PATH = "db/fund_manager.db"
 
+_embeddings = None
+_decision_index = None
+_decision_store = None
+
+
+def get_embeddings():
+    """UpstageEmbeddings 클라이언트 (지연 생성)"""
+    global _embeddings
+    if _embeddings is None:
+        from langchain_upstage import UpstageEmbeddings # pip install -qU langchain-core langchain-upstage
+
+        config = get_config()
+        _embeddings = UpstageEmbeddings(
+            api_key=config['upstage']['api_key'],
+            model="embedding-query"
+        )
+    return _embeddings
+
+
+def get_decision_store() -> DecisionStore:
+    """판단/피드백 DB (프로세스당 하나의 연결을 재사용)"""
+    global _decision_store
+    if _decision_store is None:
+        if not os.path.exists("db"):
+            os.makedirs("db")
+        _decision_store = DecisionStore(DECISION_DB_PATH)
+    return _decision_store
 
-# FAISS 인덱스 로드 또는 초기화
-if not os.path.exists("db"):
-    os.makedirs("db")
-FAISS_INDEX_PATH = "db/vector_index.faiss"
-REPORT_IDS_PATH = "db/report_ids.json"
-if os.path.exists(FAISS_INDEX_PATH):
-    index = faiss.read_index(FAISS_INDEX_PATH)
-else:
-    index = faiss.IndexFlatL2(4096)
 
-# report_ids 로드
-if os.path.exists(REPORT_IDS_PATH):
-    with open(REPORT_IDS_PATH, "r") as f:
-        report_ids = json.load(f)
-else:
-    report_ids = []
+def _legacy_decision_ids():
+    """기존 위치 기반 인덱스의 벡터 순서 = decisions 저장 순서"""
+    return get_decision_store().decision_ids()
+
+
+def get_decision_index() -> DecisionIndex:
+    """
+    판단 id 매핑 코사인 인덱스 지연 로드
+    (config: fund_manager.ann_index / ann_threshold)
+    """
+    global _decision_index
+    if _decision_index is None:
+        if not os.path.exists("db"):
+            os.makedirs("db")
+        fund_config = get_config().get('fund_manager') or {}
+        if fund_config.get('index_quantization'):
+            logger.warning("fund_manager.index_quantization is no longer supported; using a float32 decision index.")
+        _decision_index = DecisionIndex(
+            FAISS_INDEX_PATH,
+            ann_kind=fund_config.get('ann_index', "hnsw"),
+            ann_threshold=fund_config.get('ann_threshold', ANN_THRESHOLD),
+            legacy_decision_ids=_legacy_decision_ids()
+        )
+        if os.path.exists(LEGACY_REPORT_IDS_PATH):
+            os.remove(LEGACY_REPORT_IDS_PATH)
+    return _decision_index
 
 
 def embed_text(text, type: str = "query"):
@@ -302,6 +324,7 @@ def embed_text(text, type: str = "query"):
     docs임베딩은 docs라고 명시, text가 리스트로 구분되어서 들어와야함
     """
     logger.debug("Embedding text of type '%s'", type)
+    embeddings = get_embeddings()
     if type == "docs":
         embedding = embeddings.embed_documents(text)
     else:
@@ -310,70 +333,60 @@ def embed_text(text, type: str = "query"):
 
 
 # ------------------------ DB + Feedback ------------------------
-def save_decision(report: dict, embedding: np.ndarray):
-    conn = sqlite3.connect('db/fund_manager.db')
-    cur = conn.cursor()
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS decisions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        report_id TEXT,
-        ticker TEXT,
-        decision TEXT,
-        llm_response TEXT,
-        date TEXT
-    )""")
-
-    cur.execute("""
-    INSERT INTO decisions (
-        report_id, ticker, decision,  llm_response, date
-    ) VALUES (?, ?, ?, ?, ?)
-    """, (
-        report["report_id"], report["ticker"], report["final_decision"],
-        report["llm_response"], report["date"]
-    ))
-
-    conn.commit()
-    conn.close()
-
-    # FAISS index 업데이트: docs일 경우 임베딩이 2차원인 것 처리
-    report_ids.append(report["report_id"])
-    if isinstance(embedding, list):
-        embedding = np.array(embedding, dtype="float32")
-    if embedding.ndim == 1:
-        embedding = embedding.reshape(1, -1) 
-    index.add(embedding)
-
-    faiss.write_index(index, FAISS_INDEX_PATH)
-    with open(REPORT_IDS_PATH, "w") as f:
-        json.dump(report_ids, f)
-    logger.info("Decision saved and index updated.")
-
-
-def get_return(ticker: str, start_date: str, period: int):
-    logger.debug("Getting return for %s from %s + %d weeks", ticker, start_date, period)
-    end_date = (datetime.strptime(start_date, '%Y-%m-%d') + timedelta(weeks=period)).date()
+def save_decisions(reports: List[dict], embedding_inputs: List[List[str]]) -> List[int]:
+    """
+    윈도우의 판단들을 한 번에 저장
+    - docs 임베딩(요약, 응답)은 전체 판단을 한 번의 요청으로 만들고, 판단별 정규화 평균 벡터 하나로 결합
+    - DB는 한 트랜잭션, FAISS 인덱스는 한 번의 add(로그 기록/fsync 한 번)로 반영
+    """
+    if not reports:
+        return []
+    texts = [text for texts in embedding_inputs for text in texts]
+    embeddings = embed_text(texts, type="docs")
+    vectors, offset = [], 0
+    for texts in embedding_inputs:
+        vectors.append(combine_embeddings(embeddings[offset:offset + len(texts)]))
+        offset += len(texts)
+
+    decision_ids = get_decision_store().save_decisions(reports)
+    get_decision_index().add(decision_ids, np.stack(vectors), report_ids=[r["report_id"] for r in reports])
+    logger.info("%d decisions saved and index updated.", len(decision_ids))
+    return decision_ids
+
+
+def get_returns(ticker: str, start_date: str, periods: Dict[str, int]) -> Dict[str, Optional[float]]:
+    """기간별(주) 수익률. 가격은 가장 긴 기간까지 한 번만 내려받고, 아직 지나지 않은 기간은 None"""
+    import yfinance as yf
+
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end_dates = {key: (start + timedelta(weeks=weeks)).date() for key, weeks in periods.items()}
+    logger.debug("Getting returns for %s from %s to %s", ticker, start_date, max(end_dates.values()))
     ks_ticker = f"{ticker}.KS"
-    df = yf.download(ks_ticker, start=start_date, end=end_date, progress=False)
+    df = yf.download(ks_ticker, start=start_date, end=max(end_dates.values()), progress=False)
     if df.empty:
-        return None
-    
-    last_date_in_df = df.index[-1].date() + timedelta(days=2)
-    if last_date_in_df < end_date:
-        return None
-    
+        # yfinance는 조회 실패를 예외 없이 빈 DataFrame으로 돌려주므로 "아직 기간 미도래"와 구분
+        raise RuntimeError(f"No price data downloaded for {ks_ticker}")
+    returns = {key: None for key in periods}
+
     close_prices = df.loc[:, ('Close', ks_ticker)]
-    start_price, end_price = close_prices.iloc[0], close_prices.iloc[-1]
-    return round(((end_price - start_price) / start_price) * 100, 2)
+    for key, end_date in end_dates.items():
+        prices = close_prices[close_prices.index.date < end_date]
+        if prices.empty or prices.index[-1].date() + timedelta(days=2) < end_date:
+            continue
+        start_price, end_price = prices.iloc[0], prices.iloc[-1]
+        returns[key] = round(((end_price - start_price) / start_price) * 100, 2)
+    return returns
 
 
-def calculate_and_store_feedback(report_id, ticker, llm_response, decision_date, llm_callback):
-    returns = {
-        "1w": get_return(ticker, decision_date, 1),
-        "1m": get_return(ticker, decision_date, 4),
-        "3m": get_return(ticker, decision_date, 12),
-        "6m": get_return(ticker, decision_date, 24)
-    }
+def calculate_and_store_feedback(report_id, ticker, llm_response, decision_date, llm_callback) -> bool:
+    """
+    기간별 수익률로 피드백을 만들어 저장 (모든 기간의 수익률이 있을 때만 LLM 호출)
+    저장했으면 True, 아직 수익률이 없으면 False (대기열에 남아 다음 실행에 재시도)
+    """
+    returns = get_returns(ticker, decision_date, FEEDBACK_HORIZON_WEEKS)
+    if not all(returns[k] is not None for k in FEEDBACK_HORIZON_WEEKS):
+        logger.info("Returns not available yet for report_id=%s: %s", report_id, returns)
+        return False
  
     prompt = fund_feedback_template.format(
         llm_decision=llm_response,
@@ -385,64 +398,54 @@ def calculate_and_store_feedback(report_id, ticker, llm_response, decision_date,
     print(f"피드백 프롬프트: {prompt}")
 
     feedback_summary = llm_callback(prompt)
-
-    conn = sqlite3.connect("db/fund_manager.db")
-    cur = conn.cursor()
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS feedback (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        report_id TEXT,
-        return_1w REAL,
-        return_1m REAL,
-        return_3m REAL,
-        return_6m REAL,
-        feedback_summary TEXT
-    )""")
-    
-    if all(returns[k] is not None for k in ["1w", "1m", "3m", "6m"]):
-        cur.execute("""
-        INSERT INTO feedback (report_id, return_1w, return_1m, return_3m, return_6m ,feedback_summary)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            report_id, returns["1w"], returns["1m"], returns["3m"], returns["6m"],feedback_summary
-        ))
-
-    conn.commit()
-    conn.close()
+    get_decision_store().save_feedback(report_id, returns, feedback_summary)
     logger.info("Feedback stored for report_id=%s", report_id)
+    return True
+
+
+def process_due_feedback(llm_callback, today: Optional[str] = None, limit: Optional[int] = None) -> int:
+    """
+    피드백 대기열에서 모든 기간이 지난 판단의 피드백을 계산/저장 (주기 작업)
+    판단 경로에서는 대기열 등록만 하므로, 가격 조회와 피드백 LLM 호출은 여기서만 일어납니다.
+    수익률 기간이 채워지지 않은 경우만 재시도 횟수에 넣고, 가격 조회 실패(일시 장애)는 간격을 늘려 재시도합니다.
+    """
+    today = today or date.today().isoformat()
+    store = get_decision_store()
+    stored = 0
+    for report_id, ticker, llm_response, decision_date in store.due_feedback(today, limit):
+        try:
+            if calculate_and_store_feedback(report_id, ticker, llm_response, decision_date, llm_callback):
+                stored += 1
+                continue
+        except Exception as e:
+            logger.warning("Feedback failed for report_id=%s, backing off: %s", report_id, e)
+            store.record_feedback_error(report_id, today)
+            continue
+        # 같은 날 다시 내려받지 않고, 기간이 계속 채워지지 않으면 포기
+        if store.record_feedback_attempt(report_id, today):
+            logger.warning("Giving up feedback for report_id=%s (%s, %s) after %d attempts.",
+                           report_id, ticker, decision_date, MAX_FEEDBACK_ATTEMPTS)
+    logger.info("Processed due feedback: stored=%d, pending=%d, abandoned=%d",
+                stored, store.pending_feedback_count(), len(store.abandoned_feedback()))
+    return stored
 
 
 def search_similar_cases(query_text: str, ticker: str, top_k: int = 1):
-    if len(report_ids) < 5:
+    index = get_decision_index()
+    if len(index) < 5:
         logger.warning("Insufficient report data for similarity search.")
         return "데이터 부족"
     
     query_vec = np.array(embed_text(query_text)).astype("float32")
-    D, I = index.search(np.array([query_vec]), top_k)
+    hits = index.search(query_vec, top_k)
 
+    # top-k 판단과 피드백을 한 번의 JOIN으로 조회 (피드백이 있는 사례만, 유사도 순)
     similar = []
-    conn = sqlite3.connect("db/fund_manager.db")
-    cur = conn.cursor()
-
-    for idx in I[0]:
-        if idx >= len(report_ids):
-            continue
-        rid = report_ids[idx]
-        cur.execute("SELECT ticker, llm_response FROM decisions WHERE report_id = ?", (rid,))
-        row = cur.fetchone()
-        cur.execute("SELECT feedback_summary FROM feedback WHERE report_id = ?", (rid,))
-        perf = cur.fetchone()
-        if row and perf:
-            ticker = row[0]
-            llm_response = row[1]
-            feedback = perf
-
-            similar.append(
-                f"[{ticker}]의 이전 사례: {llm_response}...\n→ 실제 결과: {feedback}\n"
-            )
+    for _, ticker, llm_response, feedback in get_decision_store().get_cases([decision_id for decision_id, _ in hits]):
+        similar.append(
+            f"[{ticker}]의 이전 사례: {llm_response}...\n→ 실제 결과: {feedback}\n"
+        )
 
-    conn.close()
     logger.info("Found %d similar cases.", len(similar))
     return "\n".join(similar)
 
@@ -458,6 +461,8 @@ class FundManagerAgent(BaseAgent):
 
     def run(self, critic_report: Dict[str, Any], start_date, end_date) -> Dict[str, Any]:
         decisions = {}
+        # 윈도우의 판단은 모아서 임베딩/저장을 한 번에 처리
+        reports, embedding_inputs = [], []
         for ticker, data in critic_report.items():
             logger.info(f"최종 평가 시작: 종목코드 {ticker}")
             opinion = data
@@ -480,8 +485,6 @@ class FundManagerAgent(BaseAgent):
 
             report_id = f"{ticker}_{end_date}"
             final_decision = "찬성" in fund_manager_response
-            embedding_input = [report_summary, fund_manager_response]
-            embedding = embed_text(embedding_input, type="docs")
             report_data = {
                 "report_id": report_id,
                 "date": end_date,
@@ -489,12 +492,18 @@ class FundManagerAgent(BaseAgent):
                 "final_decision": final_decision,
                 "llm_response": fund_manager_response
             }
-            save_decision(report_data, embedding)
-            calculate_and_store_feedback(report_id, ticker, fund_manager_response, end_date, self._call_llm)
+            reports.append(report_data)
+            embedding_inputs.append([report_summary, fund_manager_response])
             decisions[ticker] = {"final_decision": final_decision, "reason": fund_manager_response}
             logger.info(f"[RESULT] 최종 결정: {'편입' if final_decision else '미편입'}")
+
+        # 피드백은 대기열에 등록만 하고 process_due_feedback()에서 만기 후 계산
+        save_decisions(reports, embedding_inputs)
         return decisions
 
+    def process_due_feedback(self, today: Optional[str] = None, limit: Optional[int] = None) -> int:
+        return process_due_feedback(self._call_llm, today=today, limit=limit)
+
 
 # if __name__ == "__main__":
 #     agent = FundManagerAgent(name='FM', model_name="", config={})
@@ -10,6 +10,7 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 from langraph_pipeline import run
+from tools.registry import get_registry
 
 load_dotenv()
 
@@ -22,6 +23,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+def close_tools():
+    # 공유 Tool(MongoDB/MySQL 연결, 임베딩 캐시) 정리
+    get_registry().close()
+
 @app.post("/run-report/")
 def run_report(
     start_date: str = Form(...),
@@ -0,0 +1,90 @@
+"""
+임베딩 양자화 벤치마크: float32 원본 vs fp16/int8(+float32 재정렬).
+
+- 섹터 인덱스: tools.sector_index의 quantize/quantized_scores로 1차 후보를 고르고 float32 원본으로 재정렬
+  (판단 인덱스는 재정렬용 원본을 메모리에 함께 두어야 해서 양자화하지 않습니다)
+
+실행: python -m benchmarks.bench_quantization --docs 20000 --dim 1024 --queries 100 --k 5
+(네트워크 없이 군집 구조를 가진 합성 임베딩을 사용합니다.)
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tools.sector_index import _normalize, quantize, quantized_scores
+
+
+def make_embeddings(n_docs: int, n_queries: int, dim: int, n_clusters: int = 50, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, size=n_docs)
+    docs = _normalize(centers[labels] + 0.8 * rng.normal(size=(n_docs, dim)).astype(np.float32))
+    query_labels = rng.integers(0, n_clusters, size=n_queries)
+    queries = _normalize(centers[query_labels] + 0.8 * rng.normal(size=(n_queries, dim)).astype(np.float32))
+    return docs, queries
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """(문서 수, 질의 수) 점수 행렬에서 질의별 상위 k 행 번호 (질의, k)"""
+    top = np.argpartition(-scores, k, axis=0)[:k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=0), axis=0)
+    return np.take_along_axis(top, order, axis=0).T
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def timed(fn, repeat: int):
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def bench_sector(docs: np.ndarray, queries: np.ndarray, k: int, rerank_factor: int, repeat: int):
+    truth = top_k(docs @ queries.T, k)
+    print(f"[섹터 인덱스] 문서 {len(docs)}개 × {docs.shape[1]}차원, 질의 {len(queries)}개, k={k}")
+    print(f"  {'방식':<22}{'recall@k':>10}{'메모리(MB)':>12}{'지연(ms/질의)':>16}")
+
+    for mode in (None, "fp16", "int8"):
+        codes, scales = quantize(docs, mode)
+        memory = codes.nbytes + (scales.nbytes if scales is not None else 0)
+
+        def search_coarse():
+            return top_k(quantized_scores(codes, scales, queries), k)
+
+        def search_rerank():
+            candidates = top_k(quantized_scores(codes, scales, queries), k * rerank_factor)
+            # float32 원본(SectorIndex에서는 SQLite)으로 후보만 다시 계산
+            exact = np.einsum("qcd,qd->qc", docs[candidates], queries)
+            order = np.argsort(-exact, axis=1)[:, :k]
+            return np.take_along_axis(candidates, order, axis=1)
+
+        name = mode or "float32"
+        found, latency = timed(search_coarse, repeat)
+        print(f"  {name:<22}{recall_at_k(found, truth):>10.3f}{memory / 2**20:>12.1f}{latency / len(queries) * 1000:>16.3f}")
+        if mode is not None:
+            found, latency = timed(search_rerank, repeat)
+            label = f"{name} + 재정렬(x{rerank_factor})"
+            print(f"  {label:<22}{recall_at_k(found, truth):>10.3f}{memory / 2**20:>12.1f}{latency / len(queries) * 1000:>16.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    docs, queries = make_embeddings(args.docs, args.queries, args.dim)
+    bench_sector(docs, queries, args.k, args.rerank_factor, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
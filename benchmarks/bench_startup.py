@@ -0,0 +1,70 @@
+"""
+백엔드 콜드 스타트 벤치마크.
+
+`python -X importtime`으로 모듈을 새 프로세스에서 import 하여 전체 소요 시간과
+누적 import 시간이 큰 모듈을 출력합니다.
+
+실행: python -m benchmarks.bench_startup --module backend.main --top 20
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str):
+    """'import time: self [us] | cumulative | imported package' 형식의 줄을 파싱"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, data = line.split(":", 1)
+            self_us, cumulative_us, name = data.split("|", 2)
+            rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(module: str):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    return proc, wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    proc, wall = measure(args.module)
+    rows = parse_importtime(proc.stderr)
+
+    print(f"import {args.module}: 프로세스 전체 {wall * 1000:.1f} ms")
+    if proc.returncode != 0:
+        error = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        print("[경고] import 실패:\n" + "\n".join(error[-5:]))
+
+    if rows:
+        # 최상위 모듈(들여쓰기 없는 이름)의 누적 시간 합 = import 전체 시간
+        top_level = [r for r in rows if not r[0].startswith("  ")]
+        total_us = sum(r[2] for r in top_level)
+        print(f"import 누적 시간: {total_us / 1000:.1f} ms ({len(rows)}개 모듈)\n")
+        print(f"{'cumulative(ms)':>14} {'self(ms)':>9}  module")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+            print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
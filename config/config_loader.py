@@ -1,9 +1,135 @@
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
 import yaml
 
-def load_config(config_path: str = "config.yaml") -> dict:
+CONFIG_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CONFIG_DIR.parent
+DEFAULT_CONFIG_PATH = CONFIG_DIR / "config.yaml"
+
+# 설정 파일 경로를 바꿀 때 사용하는 환경 변수
+CONFIG_PATH_ENV = "CLICKERS_CONFIG"
+# 개별 값 덮어쓰기: CLICKERS__MYSQL__URL=... -> config['mysql']['url']
+OVERRIDE_PREFIX = "CLICKERS__"
+
+
+def resolve_config_path(config_path: Optional[str] = None) -> Path:
     """
-    config.yaml 파일을 불러와서 Python 딕셔너리로 반환합니다.
+    설정 파일 경로를 작업 디렉토리와 무관하게 결정합니다.
+    우선순위: 인자 > 환경 변수(CLICKERS_CONFIG) > config/config.yaml
+    상대 경로는 프로젝트 루트, 없으면 config 디렉토리 기준으로 해석합니다.
+    """
+    path = config_path or os.environ.get(CONFIG_PATH_ENV)
+    if not path:
+        return DEFAULT_CONFIG_PATH
+
+    path = Path(path)
+    if path.is_absolute():
+        return path
+    for base in (PROJECT_ROOT, CONFIG_DIR):
+        candidate = (base / path).resolve()
+        if candidate.exists():
+            return candidate
+    return (PROJECT_ROOT / path).resolve()
+
+
+def _env_overrides() -> Tuple[Tuple[Tuple[str, ...], str], ...]:
+    overrides = []
+    for key, value in os.environ.items():
+        if key.startswith(OVERRIDE_PREFIX) and len(key) > len(OVERRIDE_PREFIX):
+            parts = tuple(p.lower() for p in key[len(OVERRIDE_PREFIX):].split("__"))
+            overrides.append((parts, value))
+    return tuple(sorted(overrides))
+
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def _cast_override(name: str, raw: str, current):
+    """
+    덮어쓰기 값을 설정 파일의 기존 값 타입(bool/int/float)으로만 변환합니다.
+    기존 값이 없거나 다른 타입이면 문자열 그대로 둡니다 (예: "0123"은 숫자로 바꾸지 않음).
     """
-    with open(config_path, "r", encoding="utf-8") as file:
-        config = yaml.safe_load(file)
+    if isinstance(current, bool):
+        value = raw.strip().lower()
+        if value in _TRUE_VALUES:
+            return True
+        if value in _FALSE_VALUES:
+            return False
+        raise ValueError(f"{name}: 불리언 값이 필요합니다 ({raw!r})")
+    try:
+        if isinstance(current, int):
+            return int(raw)
+        if isinstance(current, float):
+            return float(raw)
+    except ValueError:
+        raise ValueError(f"{name}: {type(current).__name__} 값이 필요합니다 ({raw!r})") from None
+    return raw
+
+
+def _apply_overrides(config: dict, overrides) -> dict:
+    for parts, raw in overrides:
+        node = config
+        for part in parts[:-1]:
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+        name = OVERRIDE_PREFIX + "__".join(p.upper() for p in parts)
+        node[parts[-1]] = _cast_override(name, raw, node.get(parts[-1]))
     return config
+
+
+class ConfigService:
+    """
+    설정 파일을 한 번만 파싱해 메모리에 보관하고, 파일 mtime(또는 환경 변수 덮어쓰기)이 바뀔 때만 다시 읽습니다.
+    반환된 dict는 프로세스 전체가 공유하므로 수정하지 마세요.
+    """
+    def __init__(self, config_path: Optional[str] = None):
+        self.path = resolve_config_path(config_path)
+        self._config: Optional[dict] = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def get(self) -> dict:
+        signature = (self.path.stat().st_mtime_ns, _env_overrides())
+        if self._config is not None and signature == self._signature:
+            return self._config
+
+        with self._lock:
+            if self._config is None or signature != self._signature:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    config = yaml.safe_load(file) or {}
+                self._config = _apply_overrides(config, signature[1])
+                self._signature = signature
+        return self._config
+
+
+_services: Dict[Path, ConfigService] = {}
+_services_lock = threading.Lock()
+
+
+def get_config_service(config_path: Optional[str] = None) -> ConfigService:
+    path = resolve_config_path(config_path)
+    service = _services.get(path)
+    if service is None:
+        with _services_lock:
+            service = _services.setdefault(path, ConfigService(str(path)))
+    return service
+
+
+def get_config(config_path: Optional[str] = None) -> dict:
+    """
+    공유 설정 dict를 반환합니다 (파일이 바뀌었을 때만 다시 파싱).
+    """
+    return get_config_service(config_path).get()
+
+
+def load_config(config_path: Optional[str] = None) -> dict:
+    """
+    config.yaml 파일을 불러와서 Python 딕셔너리로 반환합니다.
+    (기존 호출 호환용 - get_config와 같은 캐시를 사용)
+    """
+    return get_config(config_path)
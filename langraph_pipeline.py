@@ -1,34 +1,36 @@
 import os
 import json
 import datetime
-import pandas as pd
+import functools
 from typing import Dict, Optional
-import operator
 
-# LangGraph 관련 모듈
-from langgraph.graph import END, StateGraph
-from langgraph.checkpoint.memory import MemorySaver
-
-# 에이전트 및 도구 임포트
-from agent.analyst_agent import AnalystAgent
-from agent.critic_agent import CriticAgent
-from agent.fundmanager_agent import FundManagerAgent
-from tools.pdf_tool import PDFTool
+# 도구 레지스트리 (Tool은 첫 사용 시 생성)
+from tools.registry import get_registry
 from typing import TypedDict
-from langchain_core.documents import Document
-from config.config_loader import load_config
-import mysql.connector
-
-# 에이전트 인스턴스 생성
-analyst_agent = AnalystAgent(name="AnalystAgent", model_name="solar-pro", config={})
-critic_agent = CriticAgent(name="CriticAgent", model_name="solar-pro", config={})
-fund_manager_agent = FundManagerAgent(name="FundManagerAgent", model_name="solar-pro", config={})
-pdf_tool = PDFTool()
+
+tool_registry = get_registry()
 html_list = []
 
 
+# 에이전트 인스턴스는 import 시점이 아닌 첫 사용 시점에 생성
+@functools.lru_cache(maxsize=None)
+def get_analyst_agent():
+    from agent.analyst_agent import AnalystAgent
+    return AnalystAgent(name="AnalystAgent", model_name="solar-pro", config={})
+
+@functools.lru_cache(maxsize=None)
+def get_critic_agent():
+    from agent.critic_agent import CriticAgent
+    return CriticAgent(name="CriticAgent", model_name="solar-pro", config={})
+
+@functools.lru_cache(maxsize=None)
+def get_fund_manager_agent():
+    from agent.fundmanager_agent import FundManagerAgent
+    return FundManagerAgent(name="FundManagerAgent", model_name="solar-pro", config={})
+
+
 def get_ticker(start_date, end_date) -> list:
-    db_client = analyst_agent.db_client
+    db_client = tool_registry["db_client"]
     cursor = db_client.cursor(dictionary=True)
     query = """
         SELECT DISTINCT ticker, stock_name
@@ -79,7 +81,7 @@ def check_logic(state: GraphState) -> str:
 
 # AnalystAgent 실행 노드
 def analyst_agent_func(state: GraphState) -> GraphState:
-    report = analyst_agent.run(
+    report = get_analyst_agent().run(
         ticker_list=[state["ticker"]],
         risk_preference=state["risk_preference"],
         lookback=state["lookback"],
@@ -93,7 +95,7 @@ def analyst_agent_func(state: GraphState) -> GraphState:
 
 # CriticAgent 실행 노드
 def critic_agent_func(state: GraphState) -> GraphState:
-    critic_report = critic_agent.run(analyst_report=state["context"])
+    critic_report = get_critic_agent().run(analyst_report=state["context"])
     revise = critic_report.get('revise', False)
     if revise:
         state["feedback"] = critic_report.get('critic', "피드백 필요")
@@ -104,7 +106,32 @@ def critic_agent_func(state: GraphState) -> GraphState:
     print(f"[INFO] Critic report for {state['ticker']}: {critic_report}")
     return state
 
+def prefetch(ticker_list, start_date_str):
+    """윈도우 전체 종목의 가격/재무제표/섹터 리포트 검색을 도구별로 한 번에 미리 계산"""
+    prefetches = [
+        ("price_tool", lambda tool: tool.prefetch(ticker_list, date=start_date_str)),
+        ("financial_tool", lambda tool: tool.prefetch(ticker_list)),
+        # 섹터 리포트 검색도 전체 종목을 한 번에 (AnalystAgent와 같은 인자)
+        ("sector_tool", lambda tool: tool.prefetch(ticker_list, top_k=5, days_ago=14, score_threshold=0.4)),
+    ]
+    for name, run_prefetch in prefetches:
+        try:
+            run_prefetch(tool_registry[name])
+        except Exception as e:
+            print(f"[WARN] {name} prefetch failed, falling back to per-ticker fetch: {e}")
+
+def process_due_feedback():
+    """피드백 대기열에서 만기가 지난 판단의 성과 피드백 계산 (실패해도 파이프라인은 계속)"""
+    try:
+        stored = get_fund_manager_agent().process_due_feedback()
+        print(f"[INFO] Due feedback processed: stored={stored}")
+    except Exception as e:
+        print(f"[WARN] Due feedback processing failed: {e}")
+
 def run(start_date, end_date, investment_tendency):
+    import pandas as pd
+    from langgraph.graph import END, StateGraph
+
     # 워크플로우 구성: analyst와 critic 노드만 포함하는 피드백 루프
     workflow = StateGraph(GraphState)
     workflow.add_node('analyst', analyst_agent_func)
@@ -139,6 +166,19 @@ def run(start_date, end_date, investment_tendency):
     os.makedirs(parent_dir, exist_ok=True)
     print(f"[INFO] Created parent directory: {parent_dir}")
 
+    # 섹터 리포트 MySQL → MongoDB 증분 동기화 및 종목 프로필 갱신 (실행당 한 번, 조회 경로에서는 동기화하지 않음)
+    try:
+        sector_tool = tool_registry["sector_tool"]
+        inserted, embedded = sector_tool.sync_sector_reports()
+        print(f"[INFO] Sector report sync: inserted={inserted}, embedded={embedded}")
+        # 새 종목 리포트가 들어온 종목의 프로필(요약/질의 임베딩) 캐시 무효화
+        sector_tool.sync_ticker_profiles()
+    except Exception as e:
+        print(f"[WARN] Sector report sync failed: {e}")
+
+    # 만기가 지난 과거 판단의 성과 피드백 계산 (판단 경로에서는 대기열 등록만 함)
+    process_due_feedback()
+
     # ===== 슬라이딩 윈도우 루프 시작 =====
     current_date = loop_start_date
     while current_date <= loop_end_date:
@@ -161,7 +201,13 @@ def run(start_date, end_date, investment_tendency):
         # 해당 기간의 티커 목록 조회
         tickers_data = get_ticker(start_date=start_date_str, end_date=end_date_str)
         ticker_list = sorted(pd.DataFrame(tickers_data)['ticker'].tolist()) if tickers_data else []
-        
+
+        # 윈도우 전체 종목의 가격 지표를 한 번에 계산 (AnalystAgent는 date=start_date로 조회)
+        # 재무제표는 다중 회사 조회로 캐시를 미리 채움
+        # 미리 계산에 실패하면 경고만 남기고, 에이전트가 종목별로 조회하도록 둠
+        if ticker_list:
+            prefetch(ticker_list, start_date_str)
+
         # 각 티커별 최종 Critic 보고서를 저장할 딕셔너리
         final_reports: Dict[str, dict] = {}
 
@@ -185,8 +231,10 @@ def run(start_date, end_date, investment_tendency):
             break
         
         # 슬라이딩 윈도우별 FundManagerAgent 실행
-        fund_manager_result = fund_manager_agent.run(final_reports, start_date_str, end_date_str)  
+        fund_manager_result = get_fund_manager_agent().run(final_reports, start_date_str, end_date_str)  
         print(f"[INFO] FundManagerAgent 최종 결과 for window {start_date_str} to {end_date_str}: {fund_manager_result}")
+        # 백테스트에서는 이번 윈도우 판단도 이미 만기가 지났을 수 있으므로 다음 윈도우의 유사 사례 검색 전에 처리
+        process_due_feedback()
         # 각 티커별 Critic 보고서를 PDF로 생성
         
         for ticker, report_data in final_reports.items():
@@ -194,7 +242,7 @@ def run(start_date, end_date, investment_tendency):
             ticker_pdf_filename = os.path.join(stock_dir, f"{ticker}_critic_report.html")
             html_list.append(ticker_pdf_filename)
             critic_content = analyst_report.get("analysis", "최종 보고서")
-            pdf_result = pdf_tool.run(
+            pdf_result = tool_registry["pdf_tool"].run(
                 report_data=critic_content,
                 filename=ticker_pdf_filename,
             )
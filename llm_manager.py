@@ -1,6 +1,5 @@
 
-from openai import OpenAI  # openai==1.52.2
-from config.config_loader import load_config  # 설정 파일 로드 함수
+from config.config_loader import get_config  # 설정 서비스 (한 번만 파싱)
 
 
 class LLMManager:
@@ -20,7 +19,9 @@ class LLMManager:
         OpenAI Client 초기화
         """
         if cls.openai_client is None:
-            config = load_config(config_path='./config/config.yaml')
+            from openai import OpenAI  # openai==1.52.2
+
+            config = get_config()
             api_key = config['upstage']['api_key']
             cls.openai_client = OpenAI(
                 api_key=api_key,
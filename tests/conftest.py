@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 import 경로에 추가 (tools/, agent/ 등은 패키지 설치 없이 사용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
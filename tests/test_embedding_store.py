@@ -0,0 +1,49 @@
+import numpy as np
+
+from tools.embedding_store import EmbeddingStore
+
+DIM = 8
+
+
+def _vector(i: int) -> np.ndarray:
+    return np.full(DIM, i, dtype=np.float32)
+
+
+def test_two_instances_do_not_share_rows(tmp_path):
+    # 두 인스턴스 모두 빈 캐시를 연 뒤에 쓰기 (열 때 읽은 _next_row만 믿으면 같은 행을 할당)
+    first = EmbeddingStore(str(tmp_path), "model", DIM)
+    second = EmbeddingStore(str(tmp_path), "model", DIM)
+
+    first.put_many((f"a{i}", _vector(i)) for i in range(3))
+    second.put_many((f"b{i}", _vector(100 + i)) for i in range(3))
+
+    rows = [row for _, row in first.conn.execute("SELECT key, row FROM entries")]
+    assert len(rows) == 6
+    assert len(set(rows)) == 6
+
+    for store in (first, second):
+        for i in range(3):
+            np.testing.assert_array_equal(store.get(f"a{i}"), _vector(i))
+            np.testing.assert_array_equal(store.get(f"b{i}"), _vector(100 + i))
+
+    first.close()
+    second.close()
+
+
+def test_reads_rows_after_other_instance_grows_matrix(tmp_path):
+    first = EmbeddingStore(str(tmp_path), "model", DIM)
+    second = EmbeddingStore(str(tmp_path), "model", DIM)
+
+    first.put("a", _vector(1))
+    # 다른 인스턴스가 행렬 파일을 현재 용량 너머로 확장
+    count = first._capacity + 10
+    second.put_many((f"b{i}", _vector(i)) for i in range(count))
+
+    np.testing.assert_array_equal(first.get(f"b{count - 1}"), _vector(count - 1))
+    first.put("c", _vector(2))
+    np.testing.assert_array_equal(second.get("c"), _vector(2))
+    np.testing.assert_array_equal(second.get("a"), _vector(1))
+    assert len(first) == count + 2
+
+    first.close()
+    second.close()
@@ -0,0 +1,159 @@
+# tools/async_mongo.py
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import AsyncMongoClient
+from pymongo.errors import PyMongoError
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.server_api import ServerApi
+
+
+class _PoolListener(ConnectionPoolListener):
+    """커넥션 풀 이벤트로 열린/사용 중 커넥션 수를 집계"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.check_out_failures = 0
+
+    def _add(self, name: str, delta: int):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+    def connection_created(self, event):
+        self._add("open_connections", 1)
+
+    def connection_closed(self, event):
+        self._add("open_connections", -1)
+
+    def connection_check_out_failed(self, event):
+        self._add("check_out_failures", 1)
+
+    def connection_checked_out(self, event):
+        self._add("checked_out", 1)
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+
+class AsyncMongoPool:
+    """
+    비동기 MongoDB 클라이언트 (같은 URL은 하나의 클라이언트/커넥션 풀을 공유) + 메트릭
+
+    - 클라이언트는 첫 사용 시 생성합니다. AsyncMongoClient는 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만듭니다.
+    - 비동기 진입점은 lease()로 감싸 사용하며, 마지막 lease가 끝나면 클라이언트를 닫습니다.
+      (asyncio.run마다 이전 루프의 커넥션 풀이 닫히지 않고 남지 않도록. 오래 실행되는 서비스는
+       시작 시 lease를 잡아 두면 풀을 계속 재사용합니다)
+    - track()으로 감싼 질의의 진행 중 개수, 타임아웃/오류 횟수와 풀의 커넥션 수를 metrics()로 제공합니다.
+    """
+    def __init__(self, url: str, max_pool_size: int = 50, min_pool_size: int = 0,
+                 server_selection_timeout_ms: int = 5000, socket_timeout_ms: int = 20000,
+                 wait_queue_timeout_ms: int = 5000):
+        self.url = url
+        self.options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms,
+            "socketTimeoutMS": socket_timeout_ms,
+            "waitQueueTimeoutMS": wait_queue_timeout_ms,
+        }
+        self._client: Optional[AsyncMongoClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener = _PoolListener()
+        self._leases = 0
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.queries = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    @property
+    def client(self) -> AsyncMongoClient:
+        """현재 이벤트 루프용 클라이언트 (실행 중인 루프 안에서만 호출)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                # lease 없이 쓰인 이전 루프의 클라이언트는 이 루프에서 닫을 수 없음
+                print("[WARN] 이전 이벤트 루프의 MongoDB 클라이언트가 닫히지 않았습니다 (lease()로 감싸 사용하세요)")
+            # 풀 집계도 새로 시작
+            self._listener = _PoolListener()
+            self._client = AsyncMongoClient(
+                self.url, server_api=ServerApi('1'), event_listeners=[self._listener], **self.options
+            )
+            self._loop = loop
+        return self._client
+
+    @asynccontextmanager
+    async def lease(self):
+        """현재 루프에서 클라이언트를 사용하는 구간 (중첩 가능, 마지막 lease가 끝나면 클라이언트를 닫음)"""
+        self._leases += 1
+        try:
+            yield self
+        finally:
+            self._leases -= 1
+            if self._leases == 0:
+                await self.close()
+
+    @asynccontextmanager
+    async def track(self):
+        """질의 하나를 감싸 진행 중 개수와 타임아웃/오류를 집계"""
+        self.queries += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        except PyMongoError as e:
+            if e.timeout:
+                self.timeouts += 1
+            else:
+                self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "max_pool_size": self.options["maxPoolSize"],
+            "min_pool_size": self.options["minPoolSize"],
+            "server_selection_timeout_ms": self.options["serverSelectionTimeoutMS"],
+            "socket_timeout_ms": self.options["socketTimeoutMS"],
+            "wait_queue_timeout_ms": self.options["waitQueueTimeoutMS"],
+            "open_connections": self._listener.open_connections,
+            "checked_out_connections": self._listener.checked_out,
+            "check_out_failures": self._listener.check_out_failures,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "queries": self.queries,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+    async def close(self):
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.close()
+        self._client = None
+        self._loop = None
+
+
+_pools: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], AsyncMongoPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_async_pool(url: str, **options) -> AsyncMongoPool:
+    """URL/옵션별로 하나의 AsyncMongoPool을 공유"""
+    key = (url, tuple(sorted(options.items())))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, AsyncMongoPool(url, **options))
+    return pool
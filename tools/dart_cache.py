@@ -0,0 +1,114 @@
+# tools/dart_cache.py
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from config.config_loader import PROJECT_ROOT
+
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "cache" / "dart_finstate.db"
+FINSTATE_COLUMNS = ['계정명', '개별/연결', '금액']
+
+
+class FinstateCache:
+    """
+    DART 재무제표(finstate) 영구 캐시.
+
+    공시된 분기 재무제표는 바뀌지 않으므로 (corp, year, reprt_code) 단위로 SQLite에 저장합니다.
+    아직 공시되지 않은 보고서는 '미공시'로 음성 캐싱하고, expires_at(예상 공시일)이 지나면 다시 조회합니다.
+    """
+    def __init__(self, db_path: str = str(DEFAULT_DB_PATH)):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS finstate_rows (
+            corp TEXT,
+            year INTEGER,
+            reprt_code TEXT,
+            account_nm TEXT,
+            fs_div TEXT,
+            amount REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_finstate_rows_key
+            ON finstate_rows (corp, year, reprt_code);
+        CREATE TABLE IF NOT EXISTS finstate_status (
+            corp TEXT,
+            year INTEGER,
+            reprt_code TEXT,
+            filed INTEGER,
+            fetched_at TEXT,
+            expires_at TEXT,
+            PRIMARY KEY (corp, year, reprt_code)
+        );
+        """)
+        self.conn.commit()
+
+    def get(self, corp: str, year: int, reprt_code: str, now: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+        """
+        캐시 조회.
+
+        Returns:
+            None: 캐시 미스 (DART 조회 필요)
+            빈 DataFrame: 미공시 음성 캐시 적중
+            DataFrame: 공시된 재무제표
+        """
+        now = now or datetime.now()
+        with self._lock:
+            status = self.conn.execute(
+                "SELECT filed, expires_at FROM finstate_status WHERE corp = ? AND year = ? AND reprt_code = ?",
+                (corp, year, reprt_code)
+            ).fetchone()
+            if status is None:
+                return None
+
+            filed, expires_at = status
+            if not filed:
+                if expires_at and datetime.fromisoformat(expires_at) <= now:
+                    return None
+                return pd.DataFrame(columns=FINSTATE_COLUMNS)
+
+            rows = self.conn.execute(
+                "SELECT account_nm, fs_div, amount FROM finstate_rows WHERE corp = ? AND year = ? AND reprt_code = ?",
+                (corp, year, reprt_code)
+            ).fetchall()
+        return pd.DataFrame(rows, columns=FINSTATE_COLUMNS)
+
+    def put(self, corp: str, year: int, reprt_code: str, df: pd.DataFrame):
+        """공시된 재무제표 저장 (기존 행은 교체)"""
+        rows = [
+            (corp, year, reprt_code, account, fs_div, float(amount))
+            for account, fs_div, amount in df[FINSTATE_COLUMNS].itertuples(index=False)
+        ]
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM finstate_rows WHERE corp = ? AND year = ? AND reprt_code = ?",
+                (corp, year, reprt_code)
+            )
+            self.conn.executemany("""
+            INSERT INTO finstate_rows (corp, year, reprt_code, account_nm, fs_div, amount)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.conn.execute("""
+            INSERT OR REPLACE INTO finstate_status (corp, year, reprt_code, filed, fetched_at, expires_at)
+            VALUES (?, ?, ?, 1, ?, NULL)
+            """, (corp, year, reprt_code, datetime.now().isoformat()))
+            self.conn.commit()
+
+    def put_missing(self, corp: str, year: int, reprt_code: str, expires_at: datetime):
+        """미공시 음성 캐시 저장. expires_at 이후에는 캐시 미스로 취급"""
+        with self._lock:
+            self.conn.execute("""
+            INSERT OR REPLACE INTO finstate_status (corp, year, reprt_code, filed, fetched_at, expires_at)
+            VALUES (?, ?, ?, 0, ?, ?)
+            """, (corp, year, reprt_code, datetime.now().isoformat(), expires_at.isoformat()))
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
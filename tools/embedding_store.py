@@ -0,0 +1,237 @@
+# tools/embedding_store.py
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+
+class EmbeddingStore:
+    """
+    모델별 임베딩 캐시 저장소.
+
+    - 벡터: float32 행렬 파일을 memory-map으로 열어 행 단위로 읽고/씁니다 (전체 로드 없음).
+    - 인덱스: key -> row 매핑을 SQLite에 저장해 열기 비용이 저장된 항목 수와 무관합니다.
+    - 쓰기는 새 행만 기록하는 증분 방식이며, max_rows를 지정하면 가장 오래 사용하지 않은 행을 재사용(LRU)합니다.
+    - 여러 프로세스가 같은 캐시를 열 수 있도록 행 할당/파일 확장은 잠금 파일(flock) 안에서 디스크 상태를 다시 읽어 수행합니다.
+    """
+    GROWTH_ROWS = 1024
+
+    def __init__(self, cache_dir: str, model: str, dim: int, max_rows: Optional[int] = None):
+        self.model = model
+        self.dim = dim
+        self.max_rows = max_rows
+        self.row_bytes = dim * np.dtype(np.float32).itemsize
+
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        safe_model = re.sub(r"[^0-9A-Za-z_.-]", "_", model)
+        base = cache_dir / f"embeddings_{safe_model}_{dim}"
+        self.matrix_path = base.with_suffix(".f32")
+        self.index_path = base.with_suffix(".sqlite")
+        self.lock_path = base.with_suffix(".lock")
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            row INTEGER NOT NULL,
+            last_used INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_entries_row ON entries (row);
+        CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used);
+        """)
+        self.conn.commit()
+
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        self._next_row = 0
+        with self._locked():
+            self._refresh()
+        # 읽기 시 갱신할 LRU 시각 (쓰기 시점에 한꺼번에 반영)
+        self._touched: Dict[str, int] = {}
+
+    # ----------- 내부 메서드 ----------- #
+
+    @contextmanager
+    def _locked(self):
+        """스레드 + 프로세스(flock) 배타 잠금"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh_capacity(self):
+        """다른 프로세스가 늘린 행렬 파일 크기 반영 (크기가 바뀌면 memmap을 다시 엶)"""
+        capacity = self.matrix_path.stat().st_size // self.row_bytes if self.matrix_path.exists() else 0
+        if capacity != self._capacity:
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            self._capacity = capacity
+
+    def _refresh(self):
+        """디스크 기준으로 다음 행 번호와 행렬 크기를 다시 읽음 (잠금 안에서 호출)"""
+        self._refresh_capacity()
+        next_row = self.conn.execute("SELECT MAX(row) FROM entries").fetchone()[0]
+        self._next_row = 0 if next_row is None else next_row + 1
+
+    def _open_matrix(self, min_rows: int = 0) -> np.memmap:
+        if min_rows > self._capacity:
+            new_capacity = max(min_rows, self._capacity * 2, self._capacity + self.GROWTH_ROWS)
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            with open(self.matrix_path, "ab") as f:
+                f.truncate(new_capacity * self.row_bytes)
+            self._capacity = new_capacity
+        if self._matrix is None and self._capacity > 0:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dim))
+        return self._matrix
+
+    def _flush_touched(self):
+        if self._touched:
+            self.conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(ts, key) for key, ts in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _allocate_rows(self, count: int, keep: Iterable[str] = ()) -> List[int]:
+        """새 행 번호 할당. max_rows를 넘으면 LRU 항목(keep 제외)의 행을 회수"""
+        rows = []
+        if self.max_rows is not None:
+            available = max(self.max_rows - self._next_row, 0)
+        else:
+            available = count
+        fresh = min(count, available)
+        rows.extend(range(self._next_row, self._next_row + fresh))
+        self._next_row += fresh
+
+        evict = count - fresh
+        if evict > 0:
+            self._flush_touched()
+            keep = set(keep)
+            victims = self.conn.execute(
+                "SELECT key, row FROM entries ORDER BY last_used ASC LIMIT ?", (evict + len(keep),)
+            ).fetchall()
+            victims = [(k, row) for k, row in victims if k not in keep][:evict]
+            self.conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+            rows.extend(row for _, row in victims)
+        return rows
+
+    # ----------- 조회/저장 ----------- #
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        if not keys:
+            return []
+        with self._lock:
+            found = {}
+            unique = list(dict.fromkeys(keys))
+            # SQLite 변수 개수 제한을 고려해 나눠서 조회
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self.conn.execute(
+                    f"SELECT key, row FROM entries WHERE key IN ({placeholders})", chunk
+                ).fetchall())
+
+            if found and max(found.values()) >= self._capacity:
+                self._refresh_capacity()
+            matrix = self._open_matrix()
+            now = time.time_ns()
+            results = []
+            for key in keys:
+                row = found.get(key)
+                if row is None or matrix is None:
+                    results.append(None)
+                    continue
+                self._touched[key] = now
+                results.append(np.array(matrix[row]))
+            return results
+
+    def put(self, key: str, vector: Sequence[float]):
+        self.put_many([(key, vector)])
+
+    def put_many(self, items: Iterable[Tuple[str, Sequence[float]]]):
+        items = list(dict(items).items())
+        if not items:
+            return
+        with self._locked():
+            # 다른 프로세스가 그 사이 추가한 행/확장한 파일 반영 후 할당
+            self._refresh()
+            keys = [k for k, _ in items]
+            existing = {}
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                existing.update(self.conn.execute(
+                    f"SELECT key, row FROM entries WHERE key IN ({placeholders})", chunk
+                ).fetchall())
+
+            new_keys = [k for k in keys if k not in existing]
+            if self.max_rows is not None:
+                # 한 번에 max_rows보다 많이 들어오면 뒤쪽(최신) 항목만 보관
+                new_keys = new_keys[max(len(new_keys) - self.max_rows, 0):]
+            allocated = self._allocate_rows(len(new_keys), keep=existing)
+            new_keys = new_keys[len(new_keys) - len(allocated):]
+            rows = {**existing, **dict(zip(new_keys, allocated))}
+            if not rows:
+                return
+            keys = [k for k in keys if k in rows]
+
+            matrix = self._open_matrix(min_rows=max(rows.values()) + 1)
+            for key, vector in items:
+                if key in rows:
+                    matrix[rows[key]] = np.asarray(vector, dtype=np.float32)
+
+            now = time.time_ns()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+                [(key, rows[key], now) for key in keys]
+            )
+            for key in keys:
+                self._touched.pop(key, None)
+            self.conn.commit()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def flush(self):
+        """memmap과 LRU 정보를 디스크에 반영"""
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+            self._flush_touched()
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._matrix = None
+            self.conn.close()
@@ -1,13 +1,16 @@
 # tools/financial_tool.py
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import pymysql
-import OpenDartReader
 import logging
-from pykrx import stock
+import threading
 from llm_manager import LLMManager  # 공유 LLM 매니저 임포트
+from tools.dart_cache import FinstateCache
+from tools.reference_data import DartService, TickerNameService
 
 
 logger = logging.getLogger('financial_tool')
@@ -23,7 +26,34 @@ if api_key is None:
     logger.error("Dart API 키가 필요합니다.")
     raise ValueError("Dart API 키가 필요합니다.")
 
-dart = OpenDartReader(api_key)
+# OpenDartReader는 첫 조회 시점에 생성 (import 시 네트워크 비용 없음)
+dart = DartService(api_key)
+# 종목 코드 -> 종목명 (디스크 캐시 + 메모리 딕셔너리)
+ticker_names = TickerNameService()
+
+# 재무제표 영구 캐시 (공시된 보고서는 다시 조회하지 않음, 첫 사용 시 생성)
+_finstate_cache: Optional[FinstateCache] = None
+_finstate_cache_lock = threading.Lock()
+
+
+def get_finstate_cache() -> FinstateCache:
+    """재무제표 캐시 (import 시 디렉토리/SQLite를 만들지 않도록 첫 호출 시 생성)"""
+    global _finstate_cache
+    if _finstate_cache is None:
+        with _finstate_cache_lock:
+            if _finstate_cache is None:
+                _finstate_cache = FinstateCache()
+    return _finstate_cache
+
+# 예상 공시일이 지났는데도 미공시인 보고서의 재조회 간격
+MISSING_RETRY_INTERVAL = timedelta(days=1)
+# 요약 대상 계정 (누적 -> 분기 변환이 필요한 손익 계정 포함)
+FLOW_ACCOUNTS = ["당기순이익", "영업이익", "매출액"]
+SUMMARY_ACCOUNTS = ["당기순이익", "영업이익", "매출액", "부채총계", "비유동부채", "유동부채", "자산총계", "자본총계"]
+FS_DIVS = ["CFS", "OFS"]
+# 다중 회사 조회 1회당 종목 수 및 동시 요청 수
+DART_MULTI_BATCH_SIZE = 50
+DART_MAX_WORKERS = 4
 
 # 분기별 보고서 정보: (분기, 보고서 코드, 발표월, 발표일)
 REPORT_INFO = [
@@ -102,14 +132,26 @@ def get_recent_three_reports(base_date: datetime):
     
     return results
 
-def fetch_dart_finstate(company: str, year: int, report_code: str) -> pd.DataFrame:
+def get_quarter_by_code(report_code: str) -> str:
+    """보고서 코드 -> 분기 ("4Q", "3Q", ...)"""
+    for (q, code, _, _) in REPORT_INFO:
+        if code == report_code:
+            return q
+    raise ValueError(f"알 수 없는 보고서 코드입니다: {report_code}")
+
+def get_missing_expiry(year: int, report_code: str, now: Optional[datetime] = None) -> datetime:
     """
-    OpenDartReader finstate로 재무제표 조회
+    미공시 음성 캐시의 만료 시점.
+    예상 공시일 전이면 공시일까지, 이미 지났으면(지연 공시) MISSING_RETRY_INTERVAL 후 재조회
     """
-    df = dart.finstate(company, year, reprt_code=report_code)
-    if df is None or df.empty:
-        return pd.DataFrame()
-    
+    now = now or datetime.now()
+    publish_date = get_publish_date(year, get_quarter_by_code(report_code))
+    if publish_date > now:
+        return publish_date
+    return now + MISSING_RETRY_INTERVAL
+
+def normalize_finstate(df: pd.DataFrame) -> pd.DataFrame:
+    """OpenDartReader finstate 결과를 (계정명, 개별/연결, 금액[억 원]) 형태로 변환"""
     df = df.rename(
         columns={
             'account_nm': '계정명',
@@ -126,91 +168,161 @@ def fetch_dart_finstate(company: str, year: int, report_code: str) -> pd.DataFra
     df['금액'] = df['금액'].apply(to_float)
     return df[['계정명', '개별/연결', '금액']]
 
-def calculate_qoq_change(prev, curr):
+def fetch_dart_finstate(company: str, year: int, report_code: str) -> pd.DataFrame:
+    """
+    OpenDartReader finstate로 재무제표 조회 (영구 캐시 우선)
+    """
+    cached = get_finstate_cache().get(company, year, report_code)
+    if cached is not None:
+        return cached
+
+    df = dart.finstate(company, year, reprt_code=report_code)
+    if df is None or df.empty:
+        get_finstate_cache().put_missing(company, year, report_code, get_missing_expiry(year, report_code))
+        return pd.DataFrame()
+    
+    df = normalize_finstate(df)
+    get_finstate_cache().put(company, year, report_code, df)
+    return df
+
+def fetch_dart_finstate_many(companies: List[str], year: int, report_code: str) -> Dict[str, pd.DataFrame]:
     """
-    QoQ 변동률 계산
+    여러 종목의 재무제표를 한 번의 DART 요청(쉼표로 구분한 다중 회사 조회)으로 가져와 캐시에 채운다.
+    응답에 없는 종목은 미공시로 음성 캐싱한다.
     """
-    if prev == 0 or prev is None:
+    results = {}
+    try:
+        df = dart.finstate(",".join(companies), year, reprt_code=report_code)
+    except Exception as e:
+        logger.warning(f"다중 회사 재무제표 조회 실패({year}, {report_code}), 개별 조회로 전환: {e}")
+        for company in companies:
+            try:
+                results[company] = fetch_dart_finstate(company, year, report_code)
+            except Exception as e2:
+                logger.warning(f"{company} 재무제표 조회 실패: {e2}")
+        return results
+
+    groups = {}
+    if df is not None and not df.empty and 'stock_code' in df.columns:
+        groups = {str(code): group for code, group in df.groupby('stock_code')}
+
+    expires_at = get_missing_expiry(year, report_code)
+    for company in companies:
+        group = groups.get(company)
+        if group is None or group.empty:
+            get_finstate_cache().put_missing(company, year, report_code, expires_at)
+            results[company] = pd.DataFrame()
+            continue
+        normalized = normalize_finstate(group)
+        get_finstate_cache().put(company, year, report_code, normalized)
+        results[company] = normalized
+    return results
+
+def calculate_qoq_changes(prev: np.ndarray, curr: np.ndarray) -> np.ndarray:
+    """
+    QoQ 변동률(%) 벡터 계산. 이전 값이 0이면 NaN
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = np.round(((curr - prev) / prev) * 100, 1)
+    return np.where(prev == 0, np.nan, change)
+
+def format_qoq_change(change: float) -> Optional[str]:
+    """QoQ 변동률 표기 ("+12.3%"), 계산 불가면 None"""
+    if np.isnan(change):
         return None
-    change = round(((curr - prev) / prev) * 100, 1)
     sign = "+" if change > 0 else ""
-    return f"{sign}{change}%"
+    return f"{sign}{float(change)}%"
 
-class FinancialTool:
+def load_statement_frames(tickers: List[str], reports: List[dict]) -> Dict[str, Dict[str, pd.DataFrame]]:
     """
-    재무제표 조회(DB4)
+    종목별 · 보고서별 재무제표를 (캐시 우선으로) 읽어 {종목: {보고서 라벨: DataFrame}} 형태로 반환
     """
-    def __init__(self):
-        """
-        인스턴스 생성 시 아무 인자도 받지 않음
-        """
-        self.chat_model = LLMManager.get_text_llm(model_name="solar-pro")   
-
-    def generate_summary(self):
-        logger.info(f"[기준일: {self.base_date.strftime('%Y-%m-%d')}] {self.company_name}({self.ticker})의 최근 3개 보고서를 확인합니다.")
-        for report in self.reports:
-            logger.info(f" {report['label']}: {report['year']}년 {report['quarter']} "
-                        f"(공시={report['publish_date'].strftime('%Y-%m-%d')}, code={report['report_code']})")
-        
-        dfs = {}
-        for report in self.reports:
-            df = fetch_dart_finstate(self.ticker, report['year'], report['report_code'])
+    frames = {}
+    for ticker in tickers:
+        for report in reports:
+            df = fetch_dart_finstate(ticker, report['year'], report['report_code'])
             if not df.empty:
-                dfs[report['label']] = df
+                frames.setdefault(ticker, {})[report['label']] = df
             else:
-                print(f"{report['year']}년도 {report['quarter']}분기의 재무제표 데이터가 없습니다.")
-        
-        target_cols = ['당기순이익', '영업이익', '매출액']
-        for i in range(1, len(self.reports)):
-            curr_label, prev_label = self.reports[i-1]['label'], self.reports[i]['label']
-            prev_df, curr_df = dfs[prev_label], dfs[curr_label]
-            if '1' in self.reports[i-1]['quarter']:
-                continue
-            for col in target_cols:
-                prev_val = prev_df.loc[prev_df['계정명'] == col, '금액'].values[0] if col in prev_df['계정명'].values else 0
-                curr_val = curr_df.loc[curr_df['계정명'] == col, '금액'].values[0] if col in curr_df['계정명'].values else 0
-                dfs[curr_label].loc[dfs[curr_label]['계정명'] == col, '금액'] = curr_val - prev_val
-        
-        all_cols = ["당기순이익", "영업이익", "매출액", "부채총계", "비유동부채", "유동부채", "자산총계", "자본총계"]
-        financial_data = {}
-        
-        prev_label, curr_label = self.reports[1]['label'], self.reports[0]['label']
-        prev_df, curr_df = dfs[prev_label], dfs[curr_label]
-        
-        for col in all_cols:
-            prev_val = prev_df.loc[
-                (prev_df['계정명'] == col) & (prev_df['개별/연결'] == 'CFS'), '금액'
-            ].values[0] if not prev_df.loc[
-                (prev_df['계정명'] == col) & (prev_df['개별/연결'] == 'CFS'), '금액'
-            ].empty else prev_df.loc[
-                (prev_df['계정명'] == col) & (prev_df['개별/연결'] == 'OFS'), '금액'
-            ].values[0] if not prev_df.loc[
-                (prev_df['계정명'] == col) & (prev_df['개별/연결'] == 'OFS'), '금액'
-            ].empty else 0
-
-            curr_val = curr_df.loc[
-                (curr_df['계정명'] == col) & (curr_df['개별/연결'] == 'CFS'), '금액'
-            ].values[0] if not curr_df.loc[
-                (curr_df['계정명'] == col) & (curr_df['개별/연결'] == 'CFS'), '금액'
-            ].empty else curr_df.loc[
-                (curr_df['계정명'] == col) & (curr_df['개별/연결'] == 'OFS'), '금액'
-            ].values[0] if not curr_df.loc[
-                (curr_df['계정명'] == col) & (curr_df['개별/연결'] == 'OFS'), '금액'
-            ].empty else 0
-
-            qoq_change = calculate_qoq_change(prev_val, curr_val)
-
-            if col not in financial_data:
-                financial_data[col] = {}
-            save_name_prev = f"{self.reports[1]['year']}년 {self.reports[1]['quarter']} "
-            save_name_curr = f"{self.reports[0]['year']}년 {self.reports[0]['quarter']} "
-            financial_data[col][save_name_prev] = f"{round(prev_val, 2)}억 원"
-            financial_data[col][save_name_curr] = f"{round(curr_val, 2)}억 원"
-            financial_data[col]["QoQ Change"] = qoq_change
-
-        title = f"{self.company_name}의 {save_name_curr} 재무제표 분석"
-        output_json = {
-            "제목": title,
+                print(f"{ticker} {report['year']}년도 {report['quarter']}분기의 재무제표 데이터가 없습니다.")
+    return frames
+
+def pivot_statements(frames: Dict[str, Dict[str, pd.DataFrame]], tickers: List[str], labels: List[str],
+                     accounts: List[str] = SUMMARY_ACCOUNTS) -> np.ndarray:
+    """
+    재무제표 DataFrame들을 한 번에 피벗하여 (종목 × 계정 × 기간 × CFS/OFS) 배열로 만든다.
+    같은 키가 여러 행이면 첫 행을 사용하고, 없는 값은 NaN
+    """
+    shape = (len(tickers), len(accounts), len(labels), len(FS_DIVS))
+    parts = [
+        df.assign(종목=ticker, 기간=label)
+        for ticker, by_label in frames.items()
+        for label, df in by_label.items()
+    ]
+    if not parts:
+        return np.full(shape, np.nan)
+
+    keys = ['종목', '계정명', '기간', '개별/연결']
+    long = pd.concat(parts, ignore_index=True)
+    long = long[long['계정명'].isin(accounts) & long['개별/연결'].isin(FS_DIVS)]
+    long = long.drop_duplicates(keys)
+    index = pd.MultiIndex.from_product([tickers, accounts, labels, FS_DIVS], names=keys)
+    values = long.set_index(keys)['금액'].reindex(index)
+    return values.to_numpy(dtype=float).reshape(shape)
+
+def to_quarterly(panel: np.ndarray, quarters: List[str], accounts: List[str] = SUMMARY_ACCOUNTS,
+                 flow_accounts: List[str] = FLOW_ACCOUNTS) -> np.ndarray:
+    """
+    누적 손익 계정을 분기 값으로 변환 (기간 축은 최신순).
+    1Q와 가장 오래된 기간은 그대로 두고, 직전 기간 값이 없으면 0으로 본다.
+    """
+    result = panel.copy()
+    flow_idx = [accounts.index(a) for a in flow_accounts if a in accounts]
+    periods = [p for p in range(len(quarters) - 1) if '1' not in quarters[p]]
+    if not flow_idx or not periods:
+        return result
+
+    prev_periods = [p + 1 for p in periods]
+    all_tickers = np.arange(panel.shape[0])
+    all_divs = np.arange(panel.shape[3])
+    curr = panel[np.ix_(all_tickers, flow_idx, periods, all_divs)]
+    prev = np.nan_to_num(panel[np.ix_(all_tickers, flow_idx, prev_periods, all_divs)])
+    result[np.ix_(all_tickers, flow_idx, periods, all_divs)] = curr - prev
+    return result
+
+def select_consolidated(panel: np.ndarray) -> np.ndarray:
+    """
+    연결(CFS) 값을 우선 사용하고 없으면 개별(OFS), 둘 다 없으면 0 -> (종목 × 계정 × 기간)
+    """
+    cfs, ofs = panel[..., FS_DIVS.index('CFS')], panel[..., FS_DIVS.index('OFS')]
+    return np.nan_to_num(np.where(np.isnan(cfs), ofs, cfs))
+
+def build_financial_reports(tickers: List[str], company_names: Dict[str, str], reports: List[dict],
+                            frames: Dict[str, Dict[str, pd.DataFrame]]) -> Dict[str, dict]:
+    """
+    여러 종목의 최근 두 분기 재무 요약(JSON 구조)을 한 번의 벡터 연산으로 생성
+    """
+    labels = [r['label'] for r in reports]
+    quarters = [r['quarter'] for r in reports]
+    values = select_consolidated(to_quarterly(pivot_statements(frames, tickers, labels), quarters))
+    curr, prev = values[:, :, 0], values[:, :, 1]
+    qoq = calculate_qoq_changes(prev, curr)
+
+    save_name_prev = f"{reports[1]['year']}년 {reports[1]['quarter']} "
+    save_name_curr = f"{reports[0]['year']}년 {reports[0]['quarter']} "
+
+    results = {}
+    for ti, ticker in enumerate(tickers):
+        financial_data = {
+            col: {
+                save_name_prev: f"{round(float(prev[ti, ai]), 2)}억 원",
+                save_name_curr: f"{round(float(curr[ti, ai]), 2)}억 원",
+                "QoQ Change": format_qoq_change(qoq[ti, ai])
+            }
+            for ai, col in enumerate(SUMMARY_ACCOUNTS)
+        }
+        results[ticker] = {
+            "제목": f"{company_names.get(ticker, ticker)}의 {save_name_curr} 재무제표 분석",
             "profitability": {
                 "당기순이익": financial_data["당기순이익"],
                 "영업이익": financial_data["영업이익"]
@@ -228,6 +340,81 @@ class FinancialTool:
                 "자본총계": financial_data["자본총계"]
             }
         }
+    return results
+
+class FinancialTool:
+    """
+    재무제표 조회(DB4)
+    """
+    def __init__(self):
+        """
+        인스턴스 생성 시 아무 인자도 받지 않음
+        """
+        self.chat_model = LLMManager.get_text_llm(model_name="solar-pro")   
+
+    def prefetch(self, tickers: List[str], time: Optional[str] = None,
+                 batch_size: int = DART_MULTI_BATCH_SIZE, max_workers: int = DART_MAX_WORKERS) -> int:
+        """
+        윈도우 종목들의 최근 3개 보고서를 다중 회사 조회로 미리 받아 재무제표 캐시를 채운다.
+
+        Args:
+            tickers: 윈도우의 종목 코드 목록
+            time: 기준일 ("YYYY-MM-DD", None이면 오늘) - run과 동일
+            batch_size: DART 요청 1회당 종목 수
+            max_workers: 동시 요청 수 상한
+
+        Returns:
+            DART에 실제로 요청한 (종목, 보고서) 수
+        """
+        base_date = datetime.today() if time is None else datetime.strptime(time, "%Y-%m-%d")
+        reports = get_recent_three_reports(base_date)
+
+        jobs = []
+        for report in reports:
+            missing = [
+                t for t in dict.fromkeys(tickers)
+                if get_finstate_cache().get(t, report['year'], report['report_code']) is None
+            ]
+            for i in range(0, len(missing), batch_size):
+                jobs.append((missing[i:i + batch_size], report['year'], report['report_code']))
+
+        if not jobs:
+            return 0
+
+        requested = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch_dart_finstate_many, *job): job for job in jobs}
+            for future in as_completed(futures):
+                companies, year, report_code = futures[future]
+                try:
+                    future.result()
+                    requested += len(companies)
+                except Exception as e:
+                    logger.warning(f"재무제표 선조회 실패({year}, {report_code}): {e}")
+        logger.info(f"재무제표 선조회 완료: {len(jobs)}회 요청, {requested}건 캐시 갱신")
+        return requested
+
+    def summarize_many(self, tickers: List[str], time: Optional[str] = None) -> Dict[str, dict]:
+        """
+        여러 종목의 재무 요약(JSON 구조)을 한 번에 계산 (LLM 호출 없음, 배치 실행용)
+        """
+        base_date = datetime.today() if time is None else datetime.strptime(time, "%Y-%m-%d")
+        reports = get_recent_three_reports(base_date)
+        self.prefetch(tickers, time)
+        frames = load_statement_frames(tickers, reports)
+        company_names = {t: ticker_names.get(t) for t in tickers}
+        return build_financial_reports(list(tickers), company_names, reports, frames)
+
+    def generate_summary(self):
+        logger.info(f"[기준일: {self.base_date.strftime('%Y-%m-%d')}] {self.company_name}({self.ticker})의 최근 3개 보고서를 확인합니다.")
+        for report in self.reports:
+            logger.info(f" {report['label']}: {report['year']}년 {report['quarter']} "
+                        f"(공시={report['publish_date'].strftime('%Y-%m-%d')}, code={report['report_code']})")
+        
+        frames = load_statement_frames([self.ticker], self.reports)
+        output_json = build_financial_reports(
+            [self.ticker], {self.ticker: self.company_name}, self.reports, frames
+        )[self.ticker]
 
         processed_data = json.dumps(output_json, indent=4, ensure_ascii=False)
         print(processed_data)
@@ -260,7 +447,7 @@ class FinancialTool:
         time: 조회할 시간 ("YYYY-MM-DD" 형식으로 입력, None이면 현재 시간 기준)
         """
         self.ticker = ticker
-        self.company_name = stock.get_market_ticker_name(ticker)
+        self.company_name = ticker_names.get(ticker)
         
         if time is None:
             self.base_date = datetime.today()
@@ -0,0 +1,116 @@
+# tools/indicator_engine.py
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence
+
+# 가격/거래량 이동평균 윈도우 (5, 20, 60, 120일)
+MA_WINDOWS = (5, 20, 60, 120)
+# 롤링 변동성 윈도우 및 연율화 계수
+VOLATILITY_WINDOW = 20
+TRADING_DAYS = 252
+
+
+def _last_rolling_mean(panel: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    (날짜 × 종목) 배열에서 각 윈도우의 마지막 시점 이동평균을 한 번의 누적합으로 계산.
+    pandas rolling(window=w).mean().iloc[-1]과 동일하게, 윈도우 안에 결측이 있으면 NaN.
+
+    Returns:
+        (윈도우 수 × 종목 수) 배열
+    """
+    n_rows, n_cols = panel.shape
+    valid = ~np.isnan(panel)
+    zero_row = np.zeros((1, n_cols))
+    csum = np.vstack([zero_row, np.cumsum(np.where(valid, panel, 0.0), axis=0)])
+    ccount = np.vstack([zero_row, np.cumsum(valid, axis=0)])
+
+    out = np.full((len(windows), n_cols), np.nan)
+    for i, w in enumerate(windows):
+        if w > n_rows:
+            continue
+        total = csum[-1] - csum[-1 - w]
+        count = ccount[-1] - ccount[-1 - w]
+        out[i] = np.where(count == w, total / w, np.nan)
+    return out
+
+
+def compute_indicators(close: pd.DataFrame,
+                       volume: pd.DataFrame,
+                       benchmark: Optional[pd.Series] = None,
+                       windows: Sequence[int] = MA_WINDOWS,
+                       volatility_window: int = VOLATILITY_WINDOW) -> pd.DataFrame:
+    """
+    날짜 × 종목 가격/거래량 패널로부터 전 종목의 기술적 지표를 한 번에 계산합니다.
+
+    Args:
+        close: 종가 패널 (index=날짜, columns=종목)
+        volume: 거래량 패널 (close와 같은 모양)
+        benchmark: 벤치마크(KOSPI) 종가 시리즈. None이면 KOSPI 관련 지표는 NaN
+        windows: 이동평균 윈도우 목록
+        volatility_window: 롤링 변동성 계산 윈도우
+
+    Returns:
+        index=종목, columns=지표명인 DataFrame
+    """
+    volume = volume.reindex(index=close.index, columns=close.columns)
+    prices = close.to_numpy(dtype=float)
+    volumes = volume.to_numpy(dtype=float)
+    n_cols = prices.shape[1]
+    result = {}
+
+    # 가격/거래량 이동평균 및 디스패리티
+    last_close = close.ffill().iloc[-1].to_numpy(dtype=float) if len(close) else np.full(n_cols, np.nan)
+    price_ma = _last_rolling_mean(prices, windows)
+    volume_ma = _last_rolling_mean(volumes, windows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        disparity = (last_close - price_ma) / price_ma
+    for i, w in enumerate(windows):
+        result[f"이동평균({w}일)"] = price_ma[i]
+        result[f"거래량 이동평균({w}일)"] = volume_ma[i]
+        result[f"디스패리티({w}일)"] = disparity[i]
+
+    # 일간 수익률 통계
+    returns = close.pct_change(fill_method=None)
+    result["종가 평균"] = returns.mean().to_numpy()
+    result["종가 표준편차"] = returns.std().to_numpy()
+    result["평균 거래량"] = volume.mean().to_numpy()
+    result["거래량 표준편차"] = volume.std().to_numpy()
+
+    # 롤링 변동성 (최근 volatility_window일 수익률 표준편차, 연율화)
+    recent = returns.iloc[-volatility_window:]
+    rolling_vol = recent.std().to_numpy() * np.sqrt(TRADING_DAYS)
+    rolling_vol[recent.count().to_numpy() < volatility_window] = np.nan
+    result[f"변동성({volatility_window}일)"] = rolling_vol
+
+    # KOSPI 대비 통계 (베타, 상관계수)
+    if benchmark is not None and not benchmark.empty:
+        bench_returns = benchmark.pct_change(fill_method=None)
+        result["KOSPI 평균"] = np.full(n_cols, bench_returns.mean())
+        result["KOSPI 표준편차"] = np.full(n_cols, bench_returns.std())
+
+        r = returns.to_numpy(dtype=float)
+        b = bench_returns.reindex(close.index).to_numpy(dtype=float)[:, None]
+        mask = ~np.isnan(r) & ~np.isnan(b)
+        n = mask.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_mean = np.where(mask, r, 0.0).sum(axis=0) / n
+            b_mean = np.where(mask, b, 0.0).sum(axis=0) / n
+            r_dev = np.where(mask, r - r_mean, 0.0)
+            b_dev = np.where(mask, b - b_mean, 0.0)
+            cov = (r_dev * b_dev).sum(axis=0) / (n - 1)
+            r_var = (r_dev ** 2).sum(axis=0) / (n - 1)
+            b_var = (b_dev ** 2).sum(axis=0) / (n - 1)
+            beta = cov / b_var
+            corr = cov / np.sqrt(r_var * b_var)
+        beta[n < 2] = np.nan
+        corr[n < 2] = np.nan
+        result["KOSPI 베타"] = beta
+        result["KOSPI 상관계수"] = corr
+    else:
+        for key in ("KOSPI 평균", "KOSPI 표준편차", "KOSPI 베타", "KOSPI 상관계수"):
+            result[key] = np.full(n_cols, np.nan)
+
+    # 데이터가 전혀 없는 종목 표시
+    result["데이터 수"] = close.count().to_numpy()
+
+    return pd.DataFrame(result, index=close.columns)
@@ -0,0 +1,202 @@
+# tools/lexical_index.py
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+TEXT_FIELDS = ["keyword", "title", "summary"]
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    BM25용 토큰화.
+
+    영문/숫자는 단어 단위, 한글은 조사·복합어에 덜 민감하도록 음절 bigram으로 나눕니다.
+    (예: "삼성전자의" -> 삼성, 성전, 전자, 자의)
+    """
+    tokens = []
+    for word in _TOKEN_PATTERN.findall((text or "").lower()):
+        if "가" <= word[0] <= "힣" and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[List[Dict[str, Any]]], top_k: int,
+                           k: int = 60) -> List[Dict[str, Any]]:
+    """
+    여러 검색 결과 목록을 순위 역수 합(RRF)으로 병합 (문서는 "id"로 식별)
+
+    반환 문서의 score는 RRF 점수이며, 원래 점수는 source_scores에 보관합니다.
+    """
+    fused: Dict[Any, Dict[str, Any]] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            entry = fused.get(doc["id"])
+            if entry is None:
+                entry = fused[doc["id"]] = {**doc, "score": 0.0, "source_scores": []}
+            entry["score"] += 1.0 / (k + rank)
+            entry["source_scores"].append(doc.get("score"))
+    return sorted(fused.values(), key=lambda d: d["score"], reverse=True)[:top_k]
+
+
+class LexicalIndex:
+    """
+    섹터 리포트 BM25 역색인.
+
+    - 문서 메타데이터와 (term, doc_id, tf) posting을 SQLite에 저장하며, 동기화 시 새 문서만 추가합니다.
+    - 질의 시에는 질의 term의 posting만 읽어 BM25 점수를 계산하므로 임베딩 API 호출이 필요 없습니다.
+    """
+    def __init__(self, cache_dir: str, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "sector_lexical.sqlite"
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS lexical_docs (
+            doc_id INTEGER PRIMARY KEY,
+            date TEXT,
+            title TEXT,
+            summary TEXT,
+            source TEXT,
+            keyword TEXT,
+            length INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_lexical_docs_date ON lexical_docs (date);
+        CREATE TABLE IF NOT EXISTS postings (
+            term TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (term, doc_id)
+        ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+        self._stats = None
+
+    def _corpus_stats(self):
+        """(문서 수, 평균 문서 길이)"""
+        if self._stats is None:
+            count, avg_length = self.conn.execute("SELECT COUNT(*), AVG(length) FROM lexical_docs").fetchone()
+            self._stats = (count, avg_length or 0.0)
+        return self._stats
+
+    def add(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        문서 추가 (mysql_id 기준, 이미 있으면 교체)
+
+        Args:
+            documents: mysql_id, date, keyword/title/summary/source 필드를 가진 dict
+        """
+        doc_rows = []
+        posting_rows = []
+        for doc in documents:
+            doc_id = doc.get("mysql_id")
+            if doc_id is None:
+                continue
+            terms = Counter(tokenize(" ".join(doc.get(field) or "" for field in TEXT_FIELDS)))
+            if not terms:
+                continue
+            date = doc.get("date")
+            doc_rows.append((
+                int(doc_id), date.isoformat() if isinstance(date, datetime) else date,
+                doc.get("title"), doc.get("summary"), doc.get("source"), doc.get("keyword"),
+                sum(terms.values())
+            ))
+            posting_rows.extend((term, int(doc_id), tf) for term, tf in terms.items())
+
+        if not doc_rows:
+            return 0
+        with self._lock:
+            self.conn.executemany("DELETE FROM postings WHERE doc_id = ?", [(row[0],) for row in doc_rows])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO lexical_docs (doc_id, date, title, summary, source, keyword, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", doc_rows
+            )
+            self.conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)", posting_rows)
+            self.conn.commit()
+            self._stats = None
+        return len(doc_rows)
+
+    def search(self, query: str, top_k: int = 5, from_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        BM25 상위 top_k 문서
+
+        Returns:
+            id, title, summary, date, source, keyword, score(BM25) 를 가진 dict 목록 (점수 내림차순)
+        """
+        terms = list(Counter(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            n_docs, avg_length = self._corpus_stats()
+            if n_docs == 0:
+                return []
+
+            placeholders = ",".join("?" * len(terms))
+            doc_freq = dict(self.conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ).fetchall())
+
+            date_condition, params = "", list(terms)
+            if from_date is not None:
+                date_condition = "AND d.date >= ?"
+                params.append(from_date.isoformat() if isinstance(from_date, datetime) else from_date)
+            rows = self.conn.execute(
+                f"SELECT p.doc_id, p.term, p.tf, d.length FROM postings p "
+                f"JOIN lexical_docs d ON d.doc_id = p.doc_id "
+                f"WHERE p.term IN ({placeholders}) {date_condition}",
+                params
+            ).fetchall()
+
+            scores = defaultdict(float)
+            for doc_id, term, tf, length in rows:
+                df = doc_freq.get(term, 0)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+
+            top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            if not top:
+                return []
+            ids = [doc_id for doc_id, _ in top]
+            placeholders = ",".join("?" * len(ids))
+            docs = {
+                r[0]: r for r in self.conn.execute(
+                    f"SELECT doc_id, date, title, summary, source, keyword FROM lexical_docs WHERE doc_id IN ({placeholders})",
+                    ids
+                ).fetchall()
+            }
+
+        results = []
+        for doc_id, score in top:
+            _, date, title, summary, source, keyword = docs[doc_id]
+            results.append({
+                "id": doc_id,
+                "title": title or "",
+                "summary": summary or "",
+                "date": datetime.fromisoformat(date) if date else "",
+                "source": source or "",
+                "keyword": keyword or "",
+                "score": float(score)
+            })
+        return results
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._corpus_stats()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -1,32 +1,38 @@
 import mysql.connector
 from typing import Any, Optional
-from config.config_loader import load_config
+from config.config_loader import get_config
 
 class MacroTool:
     """
     매크로 DB에서 지정된 날짜 범위 내의 최신 매크로 리포트를 가져온다.
     """
     def __init__(self):
-        self.config = load_config(config_path='./config/config.yaml')
+        self.db_client = None
+
+    def _get_connection(self):
+        """MySQL 연결을 재사용 (끊어졌으면 다시 연결)"""
+        if self.db_client is None or not self.db_client.is_connected():
+            mysql_config = get_config()['mysql']
+            self.db_client = mysql.connector.connect(
+                user=mysql_config['user'],
+                password=mysql_config['password'],
+                host=mysql_config['host'],
+                port=mysql_config['port'],
+                database=mysql_config['database'],
+                autocommit=True
+            )
+        return self.db_client
+
+    def close(self):
+        if self.db_client is not None:
+            self.db_client.close()
+            self.db_client = None
         
     def run(self, start_date: str, end_date: str) -> Optional[dict]:
         """
         start_date와 end_date 기준으로 매크로 리포트를 조회합니다.
         가장 최신의 리포트를 반환합니다.
         """        
-        # 데이터베이스 및 API 정보 불러오기
-        mysql_config = self.config['mysql']
-        mongo_config = self.config['mongo']
-        upstage_config = self.config['upstage']
-
-        # MySQL 데이터베이스 연결 설정
-        self.db_client = mysql.connector.connect(
-            user=mysql_config['user'],
-            password=mysql_config['password'],
-            host=mysql_config['host'],
-            port=mysql_config['port'],
-            database=mysql_config['database']
-        )
         query = """
             SELECT source, date, summary FROM macro_reports 
             WHERE date <= %s
@@ -34,14 +40,14 @@ class MacroTool:
             ORDER BY date DESC 
             LIMIT 10;
         """
-        cursor = self.db_client.cursor(dictionary=True)
+        cursor = self._get_connection().cursor(dictionary=True)
         cursor.execute(query, (end_date, start_date))
         result = cursor.fetchall()
         cursor.close()
         return result
 
 if __name__ == "__main__":
-    config = load_config(config_path='./config/config.yaml')
+    config = get_config()
         
     # 데이터베이스 및 API 정보 불러오기
     mysql_config = config['mysql']
@@ -1,107 +1,166 @@
 import os
+from collections import OrderedDict
+
 import pandas as pd
 import yfinance as yf
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from llm_manager import LLMManager  # 공유 LLM 매니저 임포트
+from tools.indicator_engine import compute_indicators
+
+BENCHMARK_TICKER = "^KS11"
+
+
+def _to_yf_ticker(ticker: str) -> str:
+    return ticker if "." in ticker else f"{ticker}.KS"
+
+
+def _format_value(value, digits: int = 4) -> str:
+    """NaN/None은 '데이터 없음'으로 표시"""
+    if value is None or pd.isna(value):
+        return "데이터 없음"
+    return f"{value:.{digits}f}"
+
+
+def load_price_panel(tickers: List[str], start_date, end_date) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series]:
+    """
+    여러 종목과 KOSPI의 일봉을 한 번의 yfinance 요청으로 받아 날짜 × 종목 패널로 반환합니다.
+
+    Returns:
+        (종가 패널, 거래량 패널, KOSPI 종가 시리즈). 패널의 컬럼은 6자리 종목 코드
+    """
+    yf_tickers = {_to_yf_ticker(t): t for t in tickers}
+    df = yf.download(
+        list(yf_tickers) + [BENCHMARK_TICKER],
+        start=start_date,
+        end=end_date,
+        interval='1d',
+        auto_adjust=True,
+        group_by='column',
+        progress=False,
+    )
+    if df.empty:
+        empty = pd.DataFrame(columns=list(tickers), dtype=float)
+        return empty, empty.copy(), pd.Series(dtype=float)
+
+    close = df['Close'].ffill()
+    volume = df['Volume']
+    benchmark = close[BENCHMARK_TICKER] if BENCHMARK_TICKER in close else pd.Series(dtype=float)
+
+    columns = [c for c in yf_tickers if c in close.columns]
+    close = close[columns].rename(columns=yf_tickers)
+    volume = volume[columns].rename(columns=yf_tickers)
+    return close, volume, benchmark
+
 
 class PriceTool:
     """
     가격 정보 조회 및 통계 계산 Tool
     """
+    LOOKBACK_DAYS = 200
+    # 지표 테이블을 보관할 기준일 수 (슬라이딩 윈도우 실행에서 지난 윈도우의 패널이 쌓이지 않도록 LRU로 제거)
+    MAX_CACHED_DATES = 2
+
     def __init__(self, name: str = "PriceTool", risk_free: str = "저는 공격적인 투자를 선호합니다"):
         self.name = name
         self.risk_free = risk_free
         self.device = 'cpu'
         self.chat_model = LLMManager.get_text_llm(model_name="solar-pro")
+        # 기준일별 지표 테이블 캐시 (LRU): {date: DataFrame(index=종목)}
+        self._indicator_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+    def _window(self, date: str):
+        end_date = pd.to_datetime(date)
+        start_date = end_date - pd.DateOffset(days=self.LOOKBACK_DAYS)
+        return start_date, end_date
+
+    def prefetch(self, tickers: List[str], date: str) -> pd.DataFrame:
+        """
+        윈도우의 전체 종목 가격을 한 번에 받아 지표를 벡터 연산으로 미리 계산합니다.
+        이후 같은 기준일의 run 호출은 결과 테이블에서 해당 종목 행만 읽습니다.
+        """
+        start_date, end_date = self._window(date)
+        close, volume, benchmark = load_price_panel(list(tickers), start_date, end_date)
+        indicators = compute_indicators(close, volume, benchmark)
+
+        cached = self._indicator_cache.get(date)
+        if cached is not None:
+            indicators = pd.concat([cached.drop(indicators.index, errors='ignore'), indicators])
+        self._indicator_cache[date] = indicators
+        self._indicator_cache.move_to_end(date)
+        while len(self._indicator_cache) > self.MAX_CACHED_DATES:
+            self._indicator_cache.popitem(last=False)
+        return indicators
+
+    def get_indicators(self, ticker: str, date: str) -> Optional[pd.Series]:
+        """기준일 지표 테이블에서 종목 행을 반환 (없으면 해당 종목만 조회)"""
+        cached = self._indicator_cache.get(date)
+        if cached is not None:
+            self._indicator_cache.move_to_end(date)
+        if cached is None or ticker not in cached.index:
+            cached = self.prefetch([ticker], date)
+        if ticker not in cached.index:
+            return None
+        return cached.loc[ticker]
 
     def run(self, ticker: str, date: str, lookback: int = 200) -> Dict[str, Any]:
         """
         종목의 가격 데이터, 통계, 및 분석 결과를 텍스트로 반환합니다.
         """
-        end_date = pd.to_datetime(date)
-        lookback = 200
-        start_date = end_date - pd.DateOffset(days=lookback)
-        ticker = f"{ticker}.KS"
-
-        yf_ticker = yf.Ticker(ticker)
-        df = yf_ticker.history(interval='1d', start=start_date, end=end_date).ffill()
-
-        kospi_ticker = yf.Ticker('^KS11')
-        df_kospi = kospi_ticker.history(interval='1d', start=start_date, end=end_date).ffill()
-
-        if df.empty:
-            return {"message": f"{start_date.date()} ~ {end_date.date()} 기간 동안 {ticker}의 가격 데이터를 찾을 수 없습니다."}
-
-        # 종가 및 거래량 데이터
-
-
-        close_prices = df["Close"]
-        volume = df["Volume"]
-        pct_change = close_prices.pct_change()
-        close_prices_mean = pct_change.mean()
-        close_prices_std = pct_change.std()
-
-        kospi_close_prices = df_kospi['Close']
-        kospi_stat = kospi_close_prices.pct_change()
-        kospi_mean = kospi_stat.mean()
-        kospi_std = kospi_stat.std()
-
-        # 가격 이동평균선 (5, 20, 60, 120일)
-        ma_5 = close_prices.rolling(window=5).mean().iloc[-1]
-        ma_20 = close_prices.rolling(window=20).mean().iloc[-1]
-        ma_60 = close_prices.rolling(window=60).mean().iloc[-1]
-        ma_120 = close_prices.rolling(window=120).mean().iloc[-1]
+        lookback = self.LOOKBACK_DAYS
+        start_date, end_date = self._window(date)
 
-        # 가격 이동평균선 대비 현재가의 차이(디스패리티)
-        disparity_ma5 = (close_prices.iloc[-1] - ma_5) / ma_5
-        disparity_ma20 = (close_prices.iloc[-1] - ma_20) / ma_20
-        disparity_ma60 = (close_prices.iloc[-1] - ma_60) / ma_60 if ma_60 else None
-        disparity_ma120 = (close_prices.iloc[-1] - ma_120) / ma_120 if ma_120 else None
+        row = self.get_indicators(ticker, date)
+        if row is None or not row["데이터 수"]:
+            return {"message": f"{start_date.date()} ~ {end_date.date()} 기간 동안 {_to_yf_ticker(ticker)}의 가격 데이터를 찾을 수 없습니다."}
 
-        # 거래량 이동평균선 (5, 20, 60, 120일)
-        vol_ma_5 = volume.rolling(window=5).mean().iloc[-1]
-        vol_ma_20 = volume.rolling(window=20).mean().iloc[-1]
-        vol_ma_60 = volume.rolling(window=60).mean().iloc[-1]
-        vol_ma_120 = volume.rolling(window=120).mean().iloc[-1]
+        def value(key):
+            v = row[key]
+            return None if pd.isna(v) else float(v)
 
         additional_info = {
             '사용자 위험 성향': self.risk_free,
-            '디스패리티(5일)': disparity_ma5,
-            '디스패리티(20일)': disparity_ma20,
-            '디스패리티(60일)': disparity_ma60,
-            '디스패리티(120일)': disparity_ma120,
-            '종가 평균': close_prices_mean,
-            '종가 표준편차': close_prices_std,
-            'KOSPI 평균': kospi_mean,
-            'KOSPI 표준편차': kospi_std,
-            '평균 거래량': volume.mean(),
-            '거래량 표준편차': volume.std()
+            '디스패리티(5일)': value('디스패리티(5일)'),
+            '디스패리티(20일)': value('디스패리티(20일)'),
+            '디스패리티(60일)': value('디스패리티(60일)'),
+            '디스패리티(120일)': value('디스패리티(120일)'),
+            '종가 평균': value('종가 평균'),
+            '종가 표준편차': value('종가 표준편차'),
+            'KOSPI 평균': value('KOSPI 평균'),
+            'KOSPI 표준편차': value('KOSPI 표준편차'),
+            'KOSPI 베타': value('KOSPI 베타'),
+            'KOSPI 상관계수': value('KOSPI 상관계수'),
+            '변동성(20일)': value('변동성(20일)'),
+            '평균 거래량': value('평균 거래량'),
+            '거래량 표준편차': value('거래량 표준편차')
         }
 
         # 텍스트로 LLM에 전달
         prompt = f"""
         당신은 월스트리트의 전문 트레이더입니다. 현재 주식의 성과를 분석하고 있습니다. 
-        종목 코드: {ticker} ({lookback}일 동안의 데이터, 종료일: {date})
+        종목 코드: {_to_yf_ticker(ticker)} ({lookback}일 동안의 데이터, 종료일: {date})
         사용자의 위험 성향은 다음과 같습니다: {self.risk_free}
         
         다음은 주식의 통계 정보입니다:
 
         📊 가격 분석 정보:
-        - 디스패리티 (5일): {disparity_ma5:.4f}
-        - 디스패리티 (20일): {disparity_ma20:.4f}
-        - 디스패리티 (60일): {disparity_ma60 if disparity_ma60 else '데이터 없음'}
-        - 디스패리티 (120일): {disparity_ma120 if disparity_ma120 else '데이터 없음'}
-        - 종가 평균: {close_prices_mean:.4f}
-        - 종가 표준편차: {close_prices_std:.4f}
+        - 디스패리티 (5일): {_format_value(additional_info['디스패리티(5일)'])}
+        - 디스패리티 (20일): {_format_value(additional_info['디스패리티(20일)'])}
+        - 디스패리티 (60일): {_format_value(additional_info['디스패리티(60일)'])}
+        - 디스패리티 (120일): {_format_value(additional_info['디스패리티(120일)'])}
+        - 종가 평균: {_format_value(additional_info['종가 평균'])}
+        - 종가 표준편차: {_format_value(additional_info['종가 표준편차'])}
+        - 변동성 (20일, 연율화): {_format_value(additional_info['변동성(20일)'])}
 
         📊 KOSPI 비교 정보:
-        - KOSPI 평균: {kospi_mean:.4f}
-        - KOSPI 표준편차: {kospi_std:.4f}
+        - KOSPI 평균: {_format_value(additional_info['KOSPI 평균'])}
+        - KOSPI 표준편차: {_format_value(additional_info['KOSPI 표준편차'])}
+        - KOSPI 대비 베타: {_format_value(additional_info['KOSPI 베타'])}
+        - KOSPI 상관계수: {_format_value(additional_info['KOSPI 상관계수'])}
 
         📊 거래량 정보:
-        - 평균 거래량: {volume.mean():.2f}
-        - 거래량 표준편차: {volume.std():.2f}
+        - 평균 거래량: {_format_value(additional_info['평균 거래량'], 2)}
+        - 거래량 표준편차: {_format_value(additional_info['거래량 표준편차'], 2)}
 
         위의 정보를 바탕으로 이 주식의 성과를 분석하고, 투자 기회를 평가해주세요. 
         또한, 사용자의 위험 성향을 고려하여 매수 또는 매도의 권장 사항을 제시해주세요.
@@ -0,0 +1,158 @@
+# tools/reference_data.py
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config.config_loader import PROJECT_ROOT
+
+logger = logging.getLogger('reference_data')
+
+# 기본 캐시 위치 (작업 디렉토리와 무관하게 프로젝트 루트 기준)
+CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+
+
+def _is_fresh(path: Path, refresh_interval: timedelta) -> bool:
+    if not path.exists():
+        return False
+    modified = datetime.fromtimestamp(path.stat().st_mtime)
+    return datetime.now() - modified < refresh_interval
+
+
+class DartService:
+    """
+    OpenDartReader 지연 초기화 래퍼.
+
+    OpenDartReader는 생성 시 전체 corp code 목록을 네트워크로 내려받으므로,
+    첫 사용 시점까지 생성을 미루고 목록은 디스크 캐시에 저장해 refresh_interval 동안 재사용합니다.
+    """
+    def __init__(self, api_key: str, cache_path: str = str(CACHE_DIR / "dart_corp_codes.pkl"),
+                 refresh_interval: timedelta = timedelta(days=7)):
+        self.api_key = api_key
+        self.cache_path = Path(cache_path)
+        self.refresh_interval = refresh_interval
+        self._reader = None
+        self._lock = threading.Lock()
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            with self._lock:
+                if self._reader is None:
+                    self._reader = self._load_reader()
+        return self._reader
+
+    def _load_reader(self):
+        import pandas as pd
+        import OpenDartReader
+
+        if _is_fresh(self.cache_path, self.refresh_interval):
+            try:
+                # 캐시된 corp code 목록으로 생성 (다운로드 생략)
+                reader = OpenDartReader.__new__(OpenDartReader)
+                reader.api_key = self.api_key
+                reader.corp_codes = pd.read_pickle(self.cache_path)
+                logger.info(f"DART corp code 캐시 사용: {self.cache_path}")
+                return reader
+            except Exception as e:
+                logger.warning(f"DART corp code 캐시 로드 실패, 새로 내려받습니다: {e}")
+
+        reader = OpenDartReader(self.api_key)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        reader.corp_codes.to_pickle(self.cache_path)
+        return reader
+
+    def finstate(self, corp: str, bsns_year: int, reprt_code: str = '11011'):
+        return self.reader.finstate(corp, bsns_year, reprt_code=reprt_code)
+
+
+class TickerNameService:
+    """
+    종목 코드 -> 종목명 조회.
+
+    전체 상장 종목 목록을 한 번 받아 디스크(JSON)에 캐시하고, 이후 조회는 메모리 딕셔너리에서 처리합니다.
+    캐시에 없는 종목만 pykrx로 개별 조회합니다.
+    캐시 신선도는 파일 mtime이 아닌 마지막 전체 갱신 시각(refreshed_at)으로 판단하므로,
+    개별 조회 결과를 캐시에 덧붙여도 전체 갱신 주기가 밀리지 않습니다.
+    """
+    MARKETS = ("KOSPI", "KOSDAQ", "KONEX")
+
+    def __init__(self, cache_path: str = str(CACHE_DIR / "ticker_names.json"),
+                 refresh_interval: timedelta = timedelta(days=1)):
+        self.cache_path = Path(cache_path)
+        self.refresh_interval = refresh_interval
+        self._names: Optional[Dict[str, str]] = None
+        self._refreshed_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> Dict[str, str]:
+        if self._names is None:
+            with self._lock:
+                if self._names is None:
+                    self._names = self._load_names()
+        return self._names
+
+    def _read_cache(self) -> Tuple[Dict[str, str], Optional[datetime]]:
+        """(종목명, 마지막 전체 갱신 시각). 갱신 시각이 없는 이전 형식은 None"""
+        with open(self.cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "refreshed_at" not in data:
+            return data, None
+        return data["names"], datetime.fromisoformat(data["refreshed_at"])
+
+    def _write_cache(self, names: Dict[str, str], refreshed_at: Optional[datetime]):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        data = {
+            "refreshed_at": (refreshed_at or datetime.min).isoformat(),
+            "names": names
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(self.cache_path)
+
+    def _load_names(self) -> Dict[str, str]:
+        cached = None
+        if self.cache_path.exists():
+            try:
+                cached = self._read_cache()
+            except Exception as e:
+                logger.warning(f"종목명 캐시 로드 실패: {e}")
+        if cached is not None and cached[1] is not None and datetime.now() - cached[1] < self.refresh_interval:
+            self._refreshed_at = cached[1]
+            return cached[0]
+
+        try:
+            from pykrx import stock
+            names = {}
+            for market in self.MARKETS:
+                for ticker in stock.get_market_ticker_list(market=market):
+                    names[ticker] = stock.get_market_ticker_name(ticker)
+            self._refreshed_at = datetime.now()
+            self._write_cache(names, self._refreshed_at)
+            logger.info(f"종목명 목록 갱신: {len(names)}개")
+            return names
+        except Exception as e:
+            logger.warning(f"종목명 목록 갱신 실패: {e}")
+            # 오래된 캐시라도 있으면 사용 (갱신 시각은 그대로 두어 다음 실행에 다시 갱신)
+            if cached is not None:
+                self._refreshed_at = cached[1]
+                return cached[0]
+            return {}
+
+    def get(self, ticker: str) -> str:
+        name = self.names.get(ticker)
+        if name is not None:
+            return name
+
+        from pykrx import stock
+        name = stock.get_market_ticker_name(ticker)
+        if isinstance(name, str):
+            with self._lock:
+                self.names[ticker] = name
+                # 전체 갱신 시각은 유지 (개별 조회가 갱신 주기를 늦추지 않도록)
+                self._write_cache(self.names, self._refreshed_at)
+        return name
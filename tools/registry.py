@@ -0,0 +1,110 @@
+# tools/registry.py
+import importlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from config.config_loader import get_config
+
+logger = logging.getLogger('tool_registry')
+
+
+class ToolRegistry:
+    """
+    프로세스 전역 Tool 레지스트리.
+
+    각 Tool(및 공유 리소스)은 처음 사용될 때 한 번만 생성되고 모든 에이전트가 같은 인스턴스를 공유합니다.
+    생성 함수는 "모듈:속성" 문자열로도 등록할 수 있으며, 이 경우 모듈 import도 첫 사용 시점까지 미뤄집니다.
+    warmup()으로 미리 생성하고, close()로 생성된 인스턴스를 역순으로 정리합니다.
+    """
+    def __init__(self):
+        self._factories: Dict[str, Union[str, Callable[[], Any]]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._order: List[str] = []
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Union[str, Callable[[], Any]]):
+        """이름과 생성 함수(또는 "모듈:속성" 경로)를 등록 (생성은 첫 get 시점)"""
+        with self._lock:
+            self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if name not in self._factories:
+                raise ValueError(f"Tool '{name}' is not registered.")
+            logger.info(f"Tool 생성: {name}")
+            instance = _resolve(self._factories[name])()
+            self._instances[name] = instance
+            self._order.append(name)
+            return instance
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def keys(self) -> List[str]:
+        return list(self._factories)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def warmup(self, names: Optional[Iterable[str]] = None):
+        """지정한(없으면 전체) Tool을 미리 생성"""
+        for name in (names if names is not None else self.keys()):
+            self.get(name)
+
+    def close(self):
+        """생성된 인스턴스를 생성 역순으로 close() 호출 후 해제"""
+        with self._lock:
+            for name in reversed(self._order):
+                instance = self._instances.pop(name)
+                close = getattr(instance, "close", None)
+                if callable(close):
+                    try:
+                        close()
+                    except Exception as e:
+                        logger.warning(f"Tool 종료 중 오류 ({name}): {e}")
+            self._order.clear()
+
+
+def _resolve(factory: Union[str, Callable[[], Any]]) -> Callable[[], Any]:
+    if isinstance(factory, str):
+        module_name, attr = factory.split(":")
+        return getattr(importlib.import_module(module_name), attr)
+    return factory
+
+
+def _create_db_client():
+    """에이전트가 공유하는 MySQL 연결"""
+    import mysql.connector
+
+    mysql_config = get_config()['mysql']
+    return mysql.connector.connect(
+        user=mysql_config['user'],
+        password=mysql_config['password'],
+        host=mysql_config['host'],
+        port=mysql_config['port'],
+        database=mysql_config['database']
+    )
+
+
+registry = ToolRegistry()
+registry.register("price_tool", "tools.price_tool:PriceTool")
+registry.register("macro_tool", "tools.macro_tool:MacroTool")
+registry.register("financial_tool", "tools.financial_tool:FinancialTool")
+registry.register("stock_tool", "tools.stock_tool:StockTool")
+registry.register("sector_tool", "tools.sector_tool:SectorTool")
+registry.register("pdf_tool", "tools.pdf_tool:PDFTool")
+registry.register("db_client", _create_db_client)
+
+
+def get_registry() -> ToolRegistry:
+    return registry
@@ -0,0 +1,435 @@
+# tools/sector_index.py
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+METADATA_FIELDS = ["title", "summary", "source", "keyword"]
+# 날짜가 없는 문서가 들어가는 샤드 (기간 필터가 없을 때만 검색)
+UNDATED_SHARD = ""
+# 메모리 샤드 양자화 방식 (None: float32 원본)
+QUANTIZATION_MODES = (None, "fp16", "int8")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _to_datetime64(value) -> np.datetime64:
+    if value is None or value == "":
+        return np.datetime64("NaT", "s")
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return np.datetime64(value, "s")
+
+
+def quantize(vectors: np.ndarray, mode: Optional[str]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    벡터 양자화 (codes, 행별 scale)
+
+    - fp16: float16으로 변환 (메모리 1/2)
+    - int8: 행별 최대 절댓값 기준 대칭 스칼라 양자화 (메모리 1/4)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if mode is None:
+        return vectors, None
+    if mode == "fp16":
+        return vectors.astype(np.float16), None
+    if mode == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.round(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    raise ValueError(f"지원하지 않는 양자화 방식: {mode}")
+
+
+def quantized_scores(codes: np.ndarray, scales: Optional[np.ndarray], queries: np.ndarray,
+                     block_size: int = 4096) -> np.ndarray:
+    """양자화된 행렬과 질의 행렬의 내적 (블록 단위로 float32 변환해 임시 메모리를 제한)"""
+    if codes.dtype == np.float32:
+        return codes @ queries.T
+    scores = np.empty((len(codes), len(queries)), dtype=np.float32)
+    for i in range(0, len(codes), block_size):
+        scores[i:i + block_size] = codes[i:i + block_size].astype(np.float32) @ queries.T
+    if scales is not None:
+        scores *= scales[:, None]
+    return scores
+
+
+def _month_key(value) -> str:
+    """날짜 -> 'YYYY-MM' 샤드 키"""
+    if value is None or value == "":
+        return UNDATED_SHARD
+    if isinstance(value, str):
+        return value[:7]
+    return value.strftime("%Y-%m")
+
+
+def _next_month(key: str) -> str:
+    year, month = int(key[:4]), int(key[5:7])
+    return f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+
+
+class _Shard:
+    """
+    한 달치 문서의 id/날짜/정규화 벡터 (필요할 때만 FAISS 인덱스 생성)
+    양자화를 사용하면 vectors에는 codes(fp16/int8)가, scales에는 행별 scale이 저장됩니다.
+    """
+    def __init__(self, ids: np.ndarray, dates: np.ndarray, vectors: np.ndarray, quantization: Optional[str] = None):
+        self.ids = ids
+        self.dates = dates
+        self.quantization = quantization
+        self.vectors, self.scales = quantize(vectors, quantization)
+        self.faiss_index = None
+
+    def append(self, ids: np.ndarray, dates: np.ndarray, vectors: np.ndarray):
+        self.ids = np.concatenate([self.ids, ids])
+        self.dates = np.concatenate([self.dates, dates])
+        codes, scales = quantize(vectors, self.quantization)
+        self.vectors = np.vstack([self.vectors, codes])
+        if scales is not None:
+            self.scales = np.concatenate([self.scales, scales])
+        if self.faiss_index is not None:
+            self.faiss_index.add(vectors)
+
+    def scores(self, rows: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        scales = self.scales[rows] if self.scales is not None else None
+        return quantized_scores(self.vectors[rows], scales, queries)
+
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+
+class SectorIndex:
+    """
+    섹터 리포트 로컬 벡터 인덱스.
+
+    - 문서(mysql_id, 날짜, 제목/요약 등)와 정규화된 float32 임베딩을 SQLite에 저장하고,
+      검색 시에는 내적(=코사인 유사도)으로 순위를 매깁니다 (FAISS가 있으면 IndexFlatIP 사용).
+    - 메모리 인덱스는 월 단위 샤드로 나뉘며, 검색 기간에 걸치는 샤드만 로드/검색하므로
+      질의 비용은 전체 이력이 아닌 최근 기간의 문서 수에 비례합니다.
+    - add()는 새 문서만 추가하는 증분 방식입니다 (동기화 시 호출).
+      다른 프로세스(크롤러 등)가 쓴 문서는 검색 전 PRAGMA data_version 변화로 감지해 샤드를 다시 로드합니다.
+    - quantization("fp16"/"int8")을 지정하면 메모리 샤드를 양자화된 값으로 보관해 1차 후보를 고르고,
+      상위 top_k * rerank_factor 후보만 SQLite의 float32 원본으로 다시 계산해 최종 top_k를 정합니다.
+    """
+    def __init__(self, cache_dir: str, dim: int, use_faiss: Optional[bool] = None,
+                 quantization: Optional[str] = None, rerank_factor: int = 4):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"지원하지 않는 양자화 방식: {quantization}")
+        self.dim = dim
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / f"sector_index_{dim}.sqlite"
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS sector_docs (
+            mysql_id INTEGER PRIMARY KEY,
+            date TEXT,
+            title TEXT,
+            summary TEXT,
+            source TEXT,
+            keyword TEXT,
+            embedding BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sector_docs_date ON sector_docs (date);
+        """)
+        self.conn.commit()
+
+        if use_faiss is None:
+            try:
+                import faiss  # noqa: F401
+                use_faiss = True
+            except ImportError:
+                use_faiss = False
+        # 양자화 샤드는 numpy 경로로 검색 (FAISS IndexFlatIP는 float32 원본이 필요)
+        self.use_faiss = use_faiss and quantization is None
+
+        # 월별 메모리 샤드 (검색 기간에 포함될 때 로드)
+        self._shards: Dict[str, _Shard] = {}
+        self._months: Optional[Set[str]] = None
+        self._data_version = self._read_data_version()
+
+    # ----------- 내부 메서드 ----------- #
+
+    def _read_data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _invalidate_if_changed(self):
+        """
+        다른 연결이 커밋했으면 메모리 샤드/월 목록을 비움 (다음 검색 시 다시 로드)
+        data_version은 이 연결 자신의 커밋에는 바뀌지 않으므로 add()의 증분 반영은 그대로 유지됩니다.
+        """
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._shards.clear()
+            self._months = None
+            self._data_version = version
+
+    def _all_months(self) -> Set[str]:
+        if self._months is None:
+            self._months = {
+                row[0] or UNDATED_SHARD
+                for row in self.conn.execute("SELECT DISTINCT substr(date, 1, 7) FROM sector_docs")
+            }
+        return self._months
+
+    def _shard_keys(self, from_date, to_date) -> List[str]:
+        """검색 기간에 걸치는 샤드 키 목록"""
+        low = _month_key(from_date) if from_date is not None else None
+        high = _month_key(to_date) if to_date is not None else None
+        keys = []
+        for key in self._all_months():
+            if key == UNDATED_SHARD:
+                if low is None and high is None:
+                    keys.append(key)
+                continue
+            if (low is None or key >= low) and (high is None or key <= high):
+                keys.append(key)
+        return sorted(keys)
+
+    def _load_shard(self, key: str) -> _Shard:
+        shard = self._shards.get(key)
+        if shard is not None:
+            return shard
+
+        if key == UNDATED_SHARD:
+            rows = self.conn.execute(
+                "SELECT mysql_id, date, embedding FROM sector_docs WHERE date IS NULL OR date = '' ORDER BY mysql_id"
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT mysql_id, date, embedding FROM sector_docs WHERE date >= ? AND date < ? ORDER BY mysql_id",
+                (key, _next_month(key))
+            ).fetchall()
+
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        dates = np.array([_to_datetime64(r[1]) for r in rows], dtype="datetime64[s]")
+        if rows:
+            vectors = np.frombuffer(b"".join(r[2] for r in rows), dtype=np.float32).reshape(len(rows), self.dim).copy()
+        else:
+            vectors = np.empty((0, self.dim), dtype=np.float32)
+        shard = _Shard(ids, dates, vectors, self.quantization)
+        self._shards[key] = shard
+        return shard
+
+    def _rank_shard(self, shard: _Shard, queries: np.ndarray, mask: Optional[np.ndarray],
+                    top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        샤드 안에서 질의별 내적 상위 top_k (mysql_id 배열, 점수 배열)
+
+        mask가 None이면 샤드 전체가 검색 기간에 포함된 경우입니다.
+        """
+        if mask is None and self.use_faiss:
+            if shard.faiss_index is None:
+                import faiss
+                shard.faiss_index = faiss.IndexFlatIP(self.dim)
+                shard.faiss_index.add(shard.vectors)
+            scores, rows = shard.faiss_index.search(queries, min(top_k, len(shard.ids)))
+            return [(shard.ids[r[r >= 0]], s[r >= 0]) for r, s in zip(rows, scores)]
+
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(shard.ids))
+        if len(candidates) == 0:
+            empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+            return [empty for _ in range(len(queries))]
+
+        # (후보 수, 질의 수) 점수 행렬을 한 번의 행렬 곱으로 계산
+        scores = shard.scores(candidates, queries)
+        if len(candidates) > top_k:
+            top = np.argpartition(-scores, top_k, axis=0)[:top_k]
+        else:
+            top = np.tile(np.arange(len(candidates))[:, None], (1, len(queries)))
+        return [(shard.ids[candidates[top[:, j]]], scores[top[:, j], j]) for j in range(len(queries))]
+
+    def _rerank(self, queries: np.ndarray, candidates: List[Tuple[np.ndarray, np.ndarray]],
+                top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """양자화 점수로 고른 후보를 SQLite의 float32 원본 벡터로 다시 계산"""
+        ids = sorted({int(i) for row_ids, _ in candidates for i in row_ids})
+        if not ids:
+            return candidates
+        vectors = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            vectors.update(
+                (r[0], np.frombuffer(r[1], dtype=np.float32)) for r in self.conn.execute(
+                    f"SELECT mysql_id, embedding FROM sector_docs WHERE mysql_id IN ({placeholders})", chunk
+                )
+            )
+
+        results = []
+        for query, (row_ids, _) in zip(queries, candidates):
+            if len(row_ids) == 0:
+                results.append((row_ids, np.empty(0, dtype=np.float32)))
+                continue
+            scores = np.stack([vectors[int(i)] for i in row_ids]) @ query
+            order = np.argsort(-scores)[:top_k]
+            results.append((row_ids[order], scores[order]))
+        return results
+
+    def _rank(self, queries: np.ndarray, from_date, to_date, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """기간에 걸치는 샤드별 top_k를 모아 질의별 전체 top_k로 병합 (양자화 시 원본으로 재정렬)"""
+        final_k = top_k
+        if self.quantization is not None:
+            top_k = top_k * self.rerank_factor
+        low = _to_datetime64(from_date) if from_date is not None else None
+        high = _to_datetime64(to_date) if to_date is not None else None
+
+        partial = [[] for _ in range(len(queries))]
+        for key in self._shard_keys(from_date, to_date):
+            shard = self._load_shard(key)
+            if len(shard.ids) == 0:
+                continue
+            mask = np.ones(len(shard.ids), dtype=bool)
+            if low is not None:
+                mask &= shard.dates >= low
+            if high is not None:
+                mask &= shard.dates <= high
+            for j, hit in enumerate(self._rank_shard(shard, queries, None if mask.all() else mask, top_k)):
+                partial[j].append(hit)
+
+        results = []
+        for hits in partial:
+            if not hits:
+                results.append((np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)))
+                continue
+            ids = np.concatenate([h[0] for h in hits])
+            scores = np.concatenate([h[1] for h in hits])
+            order = np.argsort(-scores)[:top_k]
+            results.append((ids[order], scores[order]))
+
+        if self.quantization is not None:
+            results = self._rerank(queries, results, final_k)
+        return results
+
+    @property
+    def memory_bytes(self) -> int:
+        """로드된 메모리 샤드의 벡터 크기 (bytes)"""
+        return sum(shard.nbytes for shard in self._shards.values())
+
+    # ----------- 추가/검색 ----------- #
+
+    def add(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        임베딩이 있는 문서 추가 (mysql_id 기준, 이미 있으면 교체)
+
+        Args:
+            documents: mysql_id, date, summary_embedding 및 메타데이터 필드를 가진 dict
+        """
+        documents = [d for d in documents if d.get("mysql_id") is not None and d.get("summary_embedding")]
+        if not documents:
+            return 0
+
+        vectors = _normalize([d["summary_embedding"] for d in documents])
+        ids = np.array([d["mysql_id"] for d in documents], dtype=np.int64)
+        dates = [d.get("date") for d in documents]
+        with self._lock:
+            existing = set()
+            id_list = [int(i) for i in ids]
+            for i in range(0, len(id_list), 500):
+                chunk = id_list[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                existing.update(r[0] for r in self.conn.execute(
+                    f"SELECT mysql_id FROM sector_docs WHERE mysql_id IN ({placeholders})", chunk
+                ))
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO sector_docs (mysql_id, date, title, summary, source, keyword, embedding) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (mysql_id, date.isoformat() if isinstance(date, datetime) else date,
+                     *(d.get(field) for field in METADATA_FIELDS), vector.tobytes())
+                    for mysql_id, date, d, vector in zip(id_list, dates, documents, vectors)
+                ]
+            )
+            self.conn.commit()
+
+            if existing:
+                # 교체된 문서가 있으면 메모리 샤드를 모두 비우고 다음 검색 시 다시 로드
+                self._shards.clear()
+                self._months = None
+                return len(documents)
+
+            keys = [_month_key(d) for d in dates]
+            if self._months is not None:
+                self._months.update(keys)
+            for key in set(keys):
+                shard = self._shards.get(key)
+                if shard is None:
+                    continue
+                rows = [i for i, k in enumerate(keys) if k == key]
+                shard.append(
+                    ids[rows],
+                    np.array([_to_datetime64(dates[i]) for i in rows], dtype="datetime64[s]"),
+                    vectors[rows]
+                )
+        return len(documents)
+
+    def search(self, query_embedding, top_k: int = 5, from_date: Optional[datetime] = None,
+               to_date: Optional[datetime] = None, score_threshold: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        코사인 유사도 상위 top_k 문서 검색 (기간 필터 및 임계값 적용)
+
+        Returns:
+            id, title, summary, date, source, keyword, score 를 가진 dict 목록 (점수 내림차순)
+        """
+        return self.search_many([query_embedding], top_k, from_date, to_date, score_threshold)[0]
+
+    def search_many(self, query_embeddings, top_k: int = 5, from_date: Optional[datetime] = None,
+                    to_date: Optional[datetime] = None, score_threshold: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """여러 질의 벡터를 한 번에 검색 (질의 순서대로 결과 목록 반환)"""
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.dim))
+        with self._lock:
+            self._invalidate_if_changed()
+            ranked = []
+            for ids, scores in self._rank(queries, from_date, to_date, top_k):
+                keep = scores >= score_threshold
+                ranked.append(([int(i) for i in ids[keep]], scores[keep]))
+
+            ids = sorted({i for row_ids, _ in ranked for i in row_ids})
+            docs = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                docs.update((r[0], r) for r in self.conn.execute(
+                    f"SELECT mysql_id, date, title, summary, source, keyword FROM sector_docs WHERE mysql_id IN ({placeholders})",
+                    chunk
+                ).fetchall())
+
+        results = []
+        for row_ids, scores in ranked:
+            hits = []
+            for mysql_id, score in zip(row_ids, scores):
+                _, date, title, summary, source, keyword = docs[mysql_id]
+                hits.append({
+                    "id": mysql_id,
+                    "title": title or "",
+                    "summary": summary or "",
+                    "date": datetime.fromisoformat(date) if date else "",
+                    "source": source or "",
+                    "keyword": keyword or "",
+                    "score": float(score)
+                })
+            results.append(hits)
+        return results
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sector_docs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._shards.clear()
+            self.conn.close()
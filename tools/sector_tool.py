@@ -1,23 +1,33 @@
 import os
 import re
+import asyncio
 import json
 import pickle
 import hashlib
 from pathlib import Path
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple, Optional, Union
 from dotenv import load_dotenv
 import mysql.connector
 
 
 from openai import OpenAI
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from sqlalchemy.orm import sessionmaker
+from bson.binary import Binary, BinaryVectorDtype
+from pymongo import UpdateOne
+from pymongo.operations import SearchIndexModel
+from pymongo.errors import BulkWriteError
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from config.config_loader import load_config
+from config.config_loader import PROJECT_ROOT, get_config
+from tools.async_mongo import get_async_pool
+from tools.embedding_store import EmbeddingStore
+from tools.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from tools.sector_index import SectorIndex
+from tools.ticker_profile import TickerProfileStore
 
 
 class SectorTool:
@@ -30,8 +40,46 @@ class SectorTool:
     3. 벡터 검색을 통한 관련 섹터 리포트 조회
     4. 유사도 임계값 기반 필터링
     """
+    # 동기화 high-water mark 문서 ID (메타데이터 컬렉션)
+    SYNC_STATE_ID = "sector_reports"
+    RETRIEVAL_MODES = ("hybrid", "vector", "lexical")
+    # Atlas Vector Search 인덱스 (date를 filter 필드로 등록해 기간 필터를 검색 전에 적용)
+    VECTOR_INDEX_NAME = "sec-index"
+    # 검색 결과로 받는 필드 (임베딩은 전송하지 않음)
+    RESULT_PROJECTION = {
+        "_id": 0, "mysql_id": 1, "title": 1, "summary": 1, "date": 1, "source": 1, "keyword": 1
+    }
+    # 임베딩이 없는 (키워드가 있는) 문서 조회 조건과 필드 (임베딩 필드 제외)
+    MISSING_EMBEDDING_FILTER = {
+        "$or": [{"summary_embedding": {"$exists": False}}, {"summary_embedding": None}],
+        "keyword": {"$nin": [None, ""]}
+    }
+    EMBEDDING_SOURCE_PROJECTION = {"mysql_id": 1, "date": 1, "title": 1, "summary": 1, "source": 1, "keyword": 1}
+    # 동기화 기록이 없을 때 시작점으로 쓰는 가장 큰 mysql_id 문서
+    LATEST_SYNCED_QUERY = {
+        "filter": {"mysql_id": {"$exists": True}},
+        "sort": [("mysql_id", -1)],
+        "projection": {"mysql_id": 1, "date": 1}
+    }
+    SYNC_QUERY = text("""
+        SELECT id, date, title, summary, file_url, source, keyword 
+        FROM sector_reports
+        WHERE id > :last_id
+        ORDER BY id ASC
+    """)
+    VECTOR_INDEX_DEFINITION = {
+        "fields": [
+            {"type": "vector", "path": "summary_embedding", "numDimensions": 1024, "similarity": "cosine"},
+            {"type": "filter", "path": "date"}
+        ]
+    }
+
     def __init__(self,
-                 cache_dir: str = "./data/cache"):
+                 cache_dir: str = str(PROJECT_ROOT / "data" / "cache"),
+                 max_cached_embeddings: Optional[int] = None,
+                 index_quantization: Optional[str] = None,
+                 binary_vectors: Optional[bool] = None,
+                 retrieval_mode: Optional[str] = None):
         """
         SectorTool 초기화
         
@@ -40,14 +88,29 @@ class SectorTool:
             mongo_url: MongoDB 연결 URL
             upstage_api_key: Upstage API 키
             cache_dir: 임베딩 캐시 저장 디렉토리
+            max_cached_embeddings: 임베딩 캐시 최대 항목 수 (초과 시 LRU 제거, None이면 무제한)
+            index_quantization: 로컬 인덱스 메모리 양자화 ("fp16"/"int8", 최종 top-k는 float32로 재정렬)
+                (None이면 config: sector_tool.index_quantization)
+            binary_vectors: MongoDB에 임베딩을 float64 배열 대신 BSON float32 벡터로 저장
+                (None이면 config: sector_tool.binary_vectors)
+            retrieval_mode: 기본 검색 모드 ("vector" / "hybrid" / "lexical")
+                (None이면 config: sector_tool.retrieval_mode, 기본 "vector".
+                 임베딩 API가 느리거나 불가할 때 "lexical"로 두면 임베딩 없이 검색)
         """
         # 캐시 디렉토리 설정 및 생성
-        config = load_config(config_path='./config/config.yaml')
+        config = get_config()
         
         # 데이터베이스 및 API 정보 불러오기
         mysql_config = config['mysql']
         mongo_config = config['mongo']
         upstage_config = config['upstage']
+        sector_config = config.get('sector_tool') or {}
+        if index_quantization is None:
+            index_quantization = sector_config.get('index_quantization')
+        if binary_vectors is None:
+            binary_vectors = bool(sector_config.get('binary_vectors', False))
+        if retrieval_mode is None:
+            retrieval_mode = sector_config.get('retrieval_mode', "vector")
 
 
         # URL 정보 추출
@@ -56,7 +119,32 @@ class SectorTool:
         upstage_api_key = upstage_config['api_key']
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.embedding_cache = self.load_embedding_cache()
+
+        # 임베딩 생성 설정
+        self.embedding_model = "solar-embedding-1-large-passage"
+        self.embedding_dimension = 1024
+
+        # 모델별 memory-map 임베딩 캐시 (열기 비용이 항목 수와 무관)
+        self.embedding_cache = EmbeddingStore(
+            self.cache_dir, self.embedding_model, self.embedding_dimension,
+            max_rows=max_cached_embeddings
+        )
+        self.migrate_legacy_cache()
+
+        # Vector Search를 쓸 수 없을 때 사용하는 로컬 벡터 인덱스 (동기화 시 증분 갱신)
+        self.local_index = SectorIndex(self.cache_dir, self.embedding_dimension, quantization=index_quantization)
+        self.binary_vectors = binary_vectors
+        
+        # 섹터 리포트 키워드/요약 BM25 역색인 (임베딩 API 없이 검색 가능)
+        if retrieval_mode not in self.RETRIEVAL_MODES:
+            raise ValueError(f"지원하지 않는 검색 모드: {retrieval_mode}")
+        self.retrieval_mode = retrieval_mode
+        # 키워드 검색 결과만 사용할 때의 최소 BM25 점수 (score_threshold는 코사인 유사도에만 적용)
+        self.lexical_min_score = float(sector_config.get('lexical_min_score', 0.0))
+        self.lexical_index = LexicalIndex(self.cache_dir)
+        
+        # 종목 프로필 캐시 (키워드/설명 요약 + 질의 임베딩)
+        self.ticker_profiles = TickerProfileStore(self.cache_dir, self.embedding_dimension)
         
         # Upstage 클라이언트 초기화
         self.client = OpenAI(
@@ -70,12 +158,34 @@ class SectorTool:
 
         # MongoDB Atlas 연결
         self.mongo_client = MongoClient(mongo_url, server_api=ServerApi('1'))
-        self.database = self.mongo_client[os.environ.get("MONGO_DB", "alpha-agent")]
-        self.collection = self.database[os.environ.get("MONGO_COLLECTION", "sector-embedding")]
+        self.database_name = os.environ.get("MONGO_DB", "alpha-agent")
+        self.collection_name = os.environ.get("MONGO_COLLECTION", "sector-embedding")
+        self.sync_state_name = os.environ.get("MONGO_SYNC_COLLECTION", "sync-state")
+        self.database = self.mongo_client[self.database_name]
+        self.collection = self.database[self.collection_name]
+        self.sync_state = self.database[self.sync_state_name]
         
-        # 임베딩 생성 설정
-        self.embedding_model = "solar-embedding-1-large-passage"
-        self.embedding_dimension = 1024
+        # 비동기 경로용 AsyncMongoClient (프로세스 내 공유 커넥션 풀, 첫 사용 시 연결)
+        self.async_mongo = get_async_pool(
+            mongo_url,
+            max_pool_size=mongo_config.get("max_pool_size", 50),
+            min_pool_size=mongo_config.get("min_pool_size", 0),
+            server_selection_timeout_ms=mongo_config.get("server_selection_timeout_ms", 5000),
+            socket_timeout_ms=mongo_config.get("socket_timeout_ms", 20000),
+            wait_queue_timeout_ms=mongo_config.get("wait_queue_timeout_ms", 5000)
+        )
+        self._mysql_id_unique: Optional[bool] = None
+        # prefetch()로 미리 계산한 종목별 검색 결과 {(ticker, top_k, days_ago, score_threshold, mode): [summary, ...]}
+        self._prefetched: Dict[Tuple[str, int, int, float, str], List[str]] = {}
+
+    def close(self):
+        """캐시 저장 후 MongoDB/MySQL 연결 정리"""
+        self.embedding_cache.close()
+        self.local_index.close()
+        self.lexical_index.close()
+        self.ticker_profiles.close()
+        self.mongo_client.close()
+        self.mysql_engine.dispose()
 
     # ----------- 임베딩 관련 메서드 ----------- #
     
@@ -90,8 +200,9 @@ class SectorTool:
         cache_key = hashlib.md5(text.encode()).hexdigest()
         
         # 캐시에서 임베딩 확인
-        if cache_key in self.embedding_cache:
-            return self.embedding_cache[cache_key]
+        cached = self.embedding_cache.get(cache_key)
+        if cached is not None:
+            return cached.tolist()
         
         # 임베딩 생성
         try:
@@ -101,12 +212,8 @@ class SectorTool:
             )
             embedding = response.data[0].embedding
             
-            # 캐시에 저장
-            self.embedding_cache[cache_key] = embedding
-            
-            # 주기적으로 캐시 저장 (캐시 크기가 1000개 이상일 때)
-            if len(self.embedding_cache) % 1000 == 0:
-                self.save_embedding_cache()
+            # 캐시에 저장 (새 항목만 기록)
+            self.embedding_cache.put(cache_key, embedding)
                 
             return embedding
             
@@ -125,21 +232,24 @@ class SectorTool:
         cache_miss_texts = []
         cache_miss_indices = []
         
-        # 캐시 확인
-        for i, text in enumerate(texts):
+        # 캐시 확인 (한 번에 조회)
+        cache_keys = [hashlib.md5(text.encode()).hexdigest() if text else None for text in texts]
+        cached = self.embedding_cache.get_many([k for k in cache_keys if k])
+        cached = dict(zip([k for k in cache_keys if k], cached))
+        for i, (text, cache_key) in enumerate(zip(texts, cache_keys)):
             if not text:
                 results.append([0] * self.embedding_dimension)
                 continue
                 
-            cache_key = hashlib.md5(text.encode()).hexdigest()
-            if cache_key in self.embedding_cache:
-                results.append(self.embedding_cache[cache_key])
+            if cached.get(cache_key) is not None:
+                results.append(cached[cache_key].tolist())
             else:
                 results.append(None)  # 임시 None 값
                 cache_miss_texts.append(text)
                 cache_miss_indices.append(i)
         
         # 캐시에 없는 텍스트만 배치로 처리
+        new_entries = {}
         if cache_miss_texts:
             print(f"캐시 미스: {len(cache_miss_texts)}개 임베딩 생성 필요")
             
@@ -157,8 +267,7 @@ class SectorTool:
                     # 결과 저장 및 캐싱
                     for j, (text, index) in enumerate(zip(batch, batch_indices)):
                         embedding = response.data[j].embedding
-                        cache_key = hashlib.md5(text.encode()).hexdigest()
-                        self.embedding_cache[cache_key] = embedding
+                        new_entries[cache_keys[index]] = embedding
                         results[index] = embedding
                         
                     print(f"배치 {i//batch_size + 1}/{(len(cache_miss_texts)-1)//batch_size + 1} 완료")
@@ -173,70 +282,161 @@ class SectorTool:
                                 model=self.embedding_model
                             )
                             embedding = single_response.data[0].embedding
-                            cache_key = hashlib.md5(text.encode()).hexdigest()
-                            self.embedding_cache[cache_key] = embedding
+                            new_entries[cache_keys[index]] = embedding
                             results[index] = embedding
                         except:
                             results[index] = [0] * self.embedding_dimension
         
-        # 캐시 저장
-        self.save_embedding_cache()
+        # 새로 생성된 임베딩만 캐시에 추가
+        if new_entries:
+            self.embedding_cache.put_many(new_entries.items())
         
         return results
     
-    def load_embedding_cache(self) -> Dict[str, List[float]]:
-        """임베딩 캐시 로드"""
-        cache_file = self.cache_dir / "embedding_cache.pkl"
-        if cache_file.exists():
-            try:
-                with open(cache_file, "rb") as f:
-                    cache = pickle.load(f)
-                print(f"임베딩 캐시 로드 완료: {len(cache)}개 항목")
-                return cache
-            except Exception as e:
-                print(f"캐시 로드 오류: {e}")
-        return {}
-    
-    def save_embedding_cache(self):
-        """임베딩 캐시 저장"""
+    def migrate_legacy_cache(self):
+        """기존 pickle 캐시(embedding_cache.pkl)가 있으면 한 번만 새 저장소로 옮김"""
         cache_file = self.cache_dir / "embedding_cache.pkl"
+        if not cache_file.exists():
+            return
         try:
-            with open(cache_file, "wb") as f:
-                pickle.dump(self.embedding_cache, f)
-            print(f"임베딩 캐시 저장 완료: {len(self.embedding_cache)}개 항목")
+            with open(cache_file, "rb") as f:
+                cache = pickle.load(f)
+            entries = [(k, v) for k, v in cache.items() if len(v) == self.embedding_dimension]
+            self.embedding_cache.put_many(entries)
+            cache_file.rename(cache_file.with_suffix(".pkl.migrated"))
+            print(f"기존 임베딩 캐시 이전 완료: {len(entries)}개 항목")
         except Exception as e:
-            print(f"캐시 저장 오류: {e}")
+            print(f"기존 캐시 이전 오류: {e}")
+    
+    def save_embedding_cache(self):
+        """임베딩 캐시 저장 (memory-map 및 LRU 정보 반영)"""
+        self.embedding_cache.flush()
     
     # ----------- 데이터 조회 메서드 ----------- #
     
-    def get_stock_summary(self, ticker: str) -> str:
+    @staticmethod
+    def _parse_stock_summary(summary: str) -> str:
+        """stock_reports.keyword 텍스트에서 종목 키워드와 설명을 추출"""
+        # 키워드 추출
+        keyword_pattern = r"종목 키워드:\s*(.*?)(?:\\|\n)"
+        m_keyword = re.search(keyword_pattern, summary)
+        keyword_text = m_keyword.group(1).strip() if m_keyword else ""
+
+        # 설명 추출
+        description_pattern = r"(?:\d+\.\s*)?종목 설명:\s*(.*?)(?:\\|\n)"
+        m_desc = re.search(description_pattern, summary)
+        description_text = m_desc.group(1).strip() if m_desc else ""
+
+        return f"{keyword_text}\n\n{description_text}"
+    
+    @classmethod
+    def _stock_profile_text(cls, keyword: Optional[str], summary: Optional[str]) -> str:
+        """종목 리포트 행의 프로필 텍스트 (keyword, 없으면 summary에서 키워드/설명 추출, 형식이 다르면 원문)"""
+        source = keyword or summary or ""
+        parsed = cls._parse_stock_summary(source)
+        return parsed if parsed.strip() else source.strip()
+    
+    def _fetch_latest_stock_profiles(self, tickers: List[str]) -> Dict[str, Tuple[str, int]]:
         """
-        종목 티커로 해당 종목의 키워드와 설명 정보를 가져옴
+        종목별 가장 최근 리포트(keyword 또는 summary가 있는 행)의 프로필 텍스트와 id
+        조회 경로(get_stock_summaries)와 수집 경로(ingest_stock_reports)가 같은 행/필드를 사용합니다.
         """
         query = text("""
-            SELECT keyword
-            FROM stock_reports
-            WHERE ticker = :ticker
-            LIMIT 1
-        """)
+            SELECT s.ticker, s.id, s.keyword, s.summary
+            FROM stock_reports s
+            JOIN (
+                SELECT ticker, MAX(id) AS id
+                FROM stock_reports
+                WHERE ticker IN :tickers AND COALESCE(NULLIF(keyword, ''), summary, '') != ''
+                GROUP BY ticker
+            ) latest ON latest.id = s.id
+        """).bindparams(bindparam("tickers", expanding=True))
         with self.mysql_engine.connect() as conn:
-            result = conn.execute(query, {"ticker": ticker}).fetchone()
-
-        if result and result[0]:
-            summary = result[0]
-            # 키워드 추출
-            keyword_pattern = r"종목 키워드:\s*(.*?)(?:\\|\n)"
-            m_keyword = re.search(keyword_pattern, summary)
-            keyword_text = m_keyword.group(1).strip() if m_keyword else ""
-
-            # 설명 추출
-            description_pattern = r"(?:\d+\.\s*)?종목 설명:\s*(.*?)(?:\\|\n)"
-            m_desc = re.search(description_pattern, summary)
-            description_text = m_desc.group(1).strip() if m_desc else ""
-
-            return f"{keyword_text}\n\n{description_text}"
-        else:
-            return ""
+            rows = conn.execute(query, {"tickers": list(tickers)}).fetchall()
+        profiles = {}
+        for ticker, report_id, keyword, summary in rows:
+            profile = self._stock_profile_text(keyword, summary)
+            if profile:
+                profiles[ticker] = (profile, report_id)
+        return profiles
+    
+    def get_stock_summary(self, ticker: str) -> str:
+        """
+        종목 티커로 해당 종목의 키워드와 설명 정보를 가져옴 (종목 프로필 캐시 우선)
+        """
+        return self.get_stock_summaries([ticker]).get(ticker, "")
+    
+    def get_stock_summaries(self, tickers: List[str]) -> Dict[str, str]:
+        """
+        여러 종목의 키워드/설명 조회 (요약이 있는 종목만 반환)
+        프로필 캐시에 없는 종목만 한 번의 쿼리로 조회하며, 종목별 가장 최근 리포트를 사용합니다.
+        """
+        summaries = {}
+        missing = []
+        for ticker in tickers:
+            cached = self.ticker_profiles.get_summary(ticker)
+            if cached is None:
+                missing.append(ticker)
+            elif cached:
+                summaries[ticker] = cached
+        if not missing:
+            return summaries
+        
+        profiles = self._fetch_latest_stock_profiles(missing)
+        fetched = {ticker: profile for ticker, (profile, _) in profiles.items()}
+        # 요약이 없는 종목도 빈 문자열로 저장 (새 리포트가 들어오면 무효화)
+        self.ticker_profiles.put_summaries(
+            {ticker: fetched.get(ticker, "") for ticker in missing},
+            covered_ids={ticker: report_id for ticker, (_, report_id) in profiles.items()}
+        )
+        summaries.update(fetched)
+        return summaries
+    
+    def get_query_embeddings(self, tickers: List[str], summaries: Dict[str, str]) -> List[List[float]]:
+        """종목 요약의 질의 임베딩 (프로필 캐시 우선, 없는 종목만 배치 생성 후 저장)"""
+        embeddings = {ticker: self.ticker_profiles.get_embedding(ticker) for ticker in tickers}
+        missing = [ticker for ticker, embedding in embeddings.items() if embedding is None]
+        if missing:
+            created = dict(zip(missing, self.get_batch_embeddings([summaries[ticker] for ticker in missing])))
+            # 실패한(영벡터) 임베딩은 저장하지 않음
+            self.ticker_profiles.put_embeddings({t: e for t, e in created.items() if any(e)})
+            embeddings.update(created)
+        return [embeddings[ticker] for ticker in tickers]
+    
+    def sync_ticker_profiles(self) -> int:
+        """
+        마지막으로 확인한 stock_reports id 이후 새 리포트가 들어온 종목의 프로필을 무효화
+        (수집 시점에 이미 반영된 리포트(covered_id 이하)만 들어온 종목은 유지)
+        
+        Returns:
+            무효화된 종목 수
+        """
+        last_id = self.ticker_profiles.get_high_water_mark()
+        with self.mysql_engine.connect() as conn:
+            max_id = conn.execute(text("SELECT MAX(id) FROM stock_reports")).scalar()
+            if max_id is None:
+                return 0
+            if last_id is None:
+                # 기록이 없으면 기존 프로필을 신뢰할 수 없으므로 전체 무효화
+                tickers = self.ticker_profiles.tickers()
+            else:
+                tickers = [
+                    ticker for ticker, latest_id in conn.execute(
+                        text("""
+                            SELECT ticker, MAX(id)
+                            FROM stock_reports
+                            WHERE id > :last_id AND id <= :max_id
+                            GROUP BY ticker
+                        """),
+                        {"last_id": last_id, "max_id": max_id}
+                    )
+                    if (self.ticker_profiles.covered_id(ticker) or 0) < latest_id
+                ]
+        
+        invalidated = self.ticker_profiles.invalidate(tickers)
+        self.ticker_profiles.set_high_water_mark(max_id)
+        print(f"종목 프로필 동기화: 새 리포트 종목 {len(tickers)}개, 무효화 {invalidated}개")
+        return invalidated
     
     def get_stock_name(self, ticker: str) -> str:
         """종목 티커로 종목명 조회"""
@@ -253,26 +453,31 @@ class SectorTool:
     
     # ----------- 데이터 동기화 메서드 ----------- #
     
-    def import_sector_reports_to_mongodb(self, days_lookback: int = None, batch_size: int = 20) -> Tuple[int, int]:
+    def import_sector_reports_to_mongodb(self, days_lookback: int = None, batch_size: int = 20,
+                                         chunk_size: int = 500) -> Tuple[int, int]:
         """
-        MySQL의 섹터 리포트를 MongoDB로 임포트하고 임베딩 생성
+        MySQL의 섹터 리포트를 MongoDB로 임포트하고 임베딩 생성 (전체/기간 재동기화용)
+        일반적인 실행에서는 증분 동기화(sync_sector_reports)를 사용하세요.
         
         Args:
             days_lookback: 최근 n일 데이터만 처리 (None이면 모든 데이터)
-            batch_size: 배치 처리 크기
+            batch_size: 임베딩 배치 크기
+            chunk_size: MySQL 스트리밍 / MongoDB 일괄 삽입 단위
             
         Returns:
             (삽입된 문서 수, 업데이트된 임베딩 수)
         """
         # 날짜 필터링 조건 추가
         date_condition = ""
+        params = {}
         if days_lookback:
             from_date = datetime.datetime.now() - datetime.timedelta(days=days_lookback)
             from_date_str = from_date.strftime("%Y-%m-%d")
-            date_condition = f"WHERE date >= '{from_date_str}'"
+            date_condition = "WHERE date >= :from_date"
+            params["from_date"] = from_date_str
             print(f"최근 {days_lookback}일 동안의 데이터만 처리합니다 (>= {from_date_str})")
         
-        # 1. MySQL에서 데이터 가져오기
+        # 1. MySQL에서 데이터를 chunk 단위로 스트리밍하며 MongoDB에 일괄 삽입
         query = text(f"""
             SELECT id, date, title, summary, file_url, source, keyword 
             FROM sector_reports
@@ -280,136 +485,511 @@ class SectorTool:
             ORDER BY date DESC
         """)
         
-        with self.mysql_engine.connect() as conn:
-            results = conn.execute(query).fetchall()
+        fetched_count = 0
+        inserted_count = 0
+        for rows in self._stream_rows(query, params, chunk_size):
+            fetched_count += len(rows)
+            inserted, _ = self._insert_sector_rows(rows)
+            inserted_count += inserted
+            print(f"[{fetched_count}] MongoDB 저장 중 - 삽입: {inserted_count}")
         
-        print(f"MySQL에서 {len(results)}개의 섹터 리포트를 가져왔습니다.")
-        if not results:
-            return (0, 0)
+        print(f"MySQL에서 {fetched_count}개의 섹터 리포트를 처리했습니다.")
         
-        # 처리 카운터
-        inserted_count = 0
-        skipped_count = 0
+        # 2. 배치 처리로 임베딩 생성 및 저장
+        updated_count = self.embed_missing_documents(batch_size=batch_size)
+        return (inserted_count, updated_count)
+    
+    def get_sync_state(self) -> Dict[str, Any]:
+        """
+        섹터 리포트 동기화 high-water mark 조회
+        기록이 없으면 MongoDB에 이미 있는 가장 큰 mysql_id에서 시작
+        """
+        state = self.sync_state.find_one({"_id": self.SYNC_STATE_ID})
+        if state:
+            return state
+        return self._initial_sync_state(self.collection.find_one(**self.LATEST_SYNCED_QUERY))
+    
+    def _initial_sync_state(self, latest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "_id": self.SYNC_STATE_ID,
+            "last_id": latest["mysql_id"] if latest else 0,
+            "last_date": latest.get("date") if latest else None
+        }
+    
+    def sync_sector_reports(self, batch_size: int = 20, chunk_size: int = 500) -> Tuple[int, int]:
+        """
+        MySQL → MongoDB 증분 동기화
         
-        # 2. MySQL 데이터를 MongoDB에 삽입 (중복 건너뛰기)
-        for i, row in enumerate(results):
-            mysql_id = row[0]
-            
-            # 이미 같은 MySQL ID의 문서가 MongoDB에 있는지 확인
-            existing_doc = self.collection.find_one({"mysql_id": mysql_id})
-            
-            if existing_doc:
-                skipped_count += 1
+        마지막으로 동기화한 MySQL id(high-water mark) 이후의 행만 가져와 삽입하고,
+        임베딩이 없는 문서만 임베딩을 생성합니다. 파이프라인 실행마다 한 번(또는 스케줄러에서) 호출합니다.
+        high-water mark는 chunk마다 갱신되므로 중간에 중단되어도 이어서 진행됩니다.
+        중복이 아닌 오류로 저장하지 못한 행이 있으면 mark는 그 행 앞에서 멈추고, 다음 실행에서 다시 시도합니다.
+        
+        Returns:
+            (삽입된 문서 수, 업데이트된 임베딩 수)
+        """
+        state = self.get_sync_state()
+        last_id = state.get("last_id") or 0
+        
+        fetched_count = 0
+        inserted_count = 0
+        blocked = False
+        for rows in self._stream_rows(self.SYNC_QUERY, {"last_id": last_id}, chunk_size):
+            fetched_count += len(rows)
+            inserted, failed_ids = self._insert_sector_rows(rows)
+            inserted_count += inserted
+            if blocked:
                 continue
-            
+            mark_row = self._sync_mark_row(rows, failed_ids)
+            blocked = bool(failed_ids)
+            if mark_row is not None:
+                self.sync_state.update_one({"_id": self.SYNC_STATE_ID}, self._sync_state_update(mark_row), upsert=True)
+        
+        print(f"섹터 리포트 증분 동기화: id > {last_id}, 신규 {fetched_count}개 (삽입 {inserted_count}개)")
+        
+        self._prepare_search_indexes(chunk_size)
+        
+        # 이전 실행에서 임베딩에 실패한 문서도 함께 처리 (새 임베딩은 로컬 인덱스에도 추가)
+        updated_count = self.embed_missing_documents(batch_size=batch_size)
+        return (inserted_count, updated_count)
+    
+    def _prepare_search_indexes(self, chunk_size: int):
+        """Vector Search 인덱스 정의 확인, 로컬/키워드 인덱스가 비어 있으면 기존 문서로 한 번 채움"""
+        self.ensure_vector_search_index()
+        if len(self.local_index) == 0:
+            self.rebuild_local_index(chunk_size=chunk_size)
+        if len(self.lexical_index) == 0:
+            self.rebuild_lexical_index(chunk_size=chunk_size)
+    
+    def rebuild_local_index(self, chunk_size: int = 500) -> int:
+        """MongoDB의 임베딩 문서를 chunk 단위로 읽어 로컬 인덱스에 추가"""
+        cursor = self.collection.find(
+            {"summary_embedding": {"$exists": True, "$ne": None}},
+            {"_id": 0, "mysql_id": 1, "date": 1, "title": 1, "summary": 1,
+             "source": 1, "keyword": 1, "summary_embedding": 1}
+        ).batch_size(chunk_size)
+        
+        added = 0
+        chunk = []
+        for doc in cursor:
+            doc["summary_embedding"] = self._decode_embedding(doc.get("summary_embedding"))
+            chunk.append(doc)
+            if len(chunk) == chunk_size:
+                added += self.local_index.add(chunk)
+                chunk = []
+        if chunk:
+            added += self.local_index.add(chunk)
+        cursor.close()
+        print(f"로컬 섹터 인덱스 구축 완료: {added}개 문서")
+        return added
+    
+    def rebuild_lexical_index(self, chunk_size: int = 500) -> int:
+        """MongoDB 문서(임베딩 제외)를 chunk 단위로 읽어 BM25 역색인에 추가"""
+        cursor = self.collection.find({}, self.RESULT_PROJECTION).batch_size(chunk_size)
+        
+        added = 0
+        chunk = []
+        for doc in cursor:
+            chunk.append(doc)
+            if len(chunk) == chunk_size:
+                added += self.lexical_index.add(chunk)
+                chunk = []
+        if chunk:
+            added += self.lexical_index.add(chunk)
+        cursor.close()
+        print(f"키워드 역색인 구축 완료: {added}개 문서")
+        return added
+    
+    @staticmethod
+    def _sync_mark_row(rows, failed_ids: List[int]):
+        """
+        high-water mark로 기록할 행 (id 오름차순 chunk 기준)
+        저장에 실패한 행이 있으면 가장 작은 실패 id 바로 앞 행까지만 (없으면 None)
+        """
+        if not failed_ids:
+            return rows[-1]
+        first_failed = min(failed_ids)
+        done = [row for row in rows if row[0] < first_failed]
+        return done[-1] if done else None
+    
+    def _sync_state_update(self, row) -> Dict[str, Any]:
+        return {"$set": {
+            "last_id": row[0],
+            "last_date": self._to_datetime(row[1]),
+            "updated_at": datetime.datetime.now()
+        }}
+    
+    @staticmethod
+    def _to_datetime(date_value):
+        # MongoDB는 date 타입을 저장할 수 없으므로 datetime으로 변환
+        if isinstance(date_value, datetime.date) and not isinstance(date_value, datetime.datetime):
+            return datetime.datetime.combine(date_value, datetime.time.min)
+        return date_value
+    
+    def _stream_rows(self, query, params: Dict[str, Any], chunk_size: int):
+        """서버 측 커서로 MySQL 결과를 chunk 단위로 읽음 (전체 결과를 메모리에 올리지 않음)"""
+        with self.mysql_engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, max_row_buffer=chunk_size).execute(query, params)
+            for rows in result.partitions(chunk_size):
+                yield rows
+    
+    def ensure_indexes(self) -> bool:
+        """mysql_id 고유 인덱스 생성 (중복 삽입을 MongoDB가 거부하도록)"""
+        if self._mysql_id_unique is None:
             try:
-                # 레코드 데이터 추출
-                date_value = row[1]
-                title = row[2]
-                summary = row[3]
-                file_url = row[4]
-                source = row[5]
-                keyword = row[6]
-                
-                # date 값 변환
-                if isinstance(date_value, datetime.date) and not isinstance(date_value, datetime.datetime):
-                    date_value = datetime.datetime.combine(date_value, datetime.time.min)
-                
-                # 요약 필드가 없으면 건너뛰기
-                if not summary:
-                    continue
-                
-                # MongoDB에 저장할 문서 생성
-                document = {
-                    "mysql_id": mysql_id,
-                    "date": date_value,
-                    "title": title,
-                    "summary": summary,
-                    "file_url": file_url,
-                    "source": source,
-                    "keyword": keyword
-                }
-                
-                # MongoDB에 문서 추가
-                result = self.collection.insert_one(document)
-                
-                if result.inserted_id:
-                    inserted_count += 1
-                
-                # 진행 상황 출력
-                if (i+1) % 50 == 0 or i+1 == len(results):
-                    print(f"[{i+1}/{len(results)}] MongoDB 저장 중 - 삽입: {inserted_count}, 건너뜀: {skipped_count}")
-                    
+                self.collection.create_index("mysql_id", unique=True, name="mysql_id_unique")
+                self._mysql_id_unique = True
             except Exception as e:
-                print(f"[{i+1}/{len(results)}] ID {mysql_id} 저장 중 오류 발생: {e}")
+                # 기존 중복 문서 등으로 생성 실패 시 삽입 전에 직접 중복 확인
+                print(f"mysql_id 고유 인덱스 생성 실패: {e}")
+                self._mysql_id_unique = False
+        return self._mysql_id_unique
+    
+    def ensure_vector_search_index(self) -> bool:
+        """
+        date filter 필드가 포함된 Vector Search 인덱스가 없으면 생성 (Atlas 전용)
+        기존 인덱스에 filter 필드가 없으면 정의를 갱신합니다.
+        """
+        try:
+            existing = {index["name"]: index for index in self.collection.list_search_indexes()}
+            index = existing.get(self.VECTOR_INDEX_NAME)
+            if index is None:
+                self.collection.create_search_index(SearchIndexModel(
+                    definition=self.VECTOR_INDEX_DEFINITION, name=self.VECTOR_INDEX_NAME, type="vectorSearch"
+                ))
+                print(f"Vector Search 인덱스 생성 요청: {self.VECTOR_INDEX_NAME}")
+            else:
+                fields = index.get("latestDefinition", {}).get("fields", [])
+                if not any(f.get("type") == "filter" and f.get("path") == "date" for f in fields):
+                    self.collection.update_search_index(self.VECTOR_INDEX_NAME, self.VECTOR_INDEX_DEFINITION)
+                    print(f"Vector Search 인덱스에 date 필터 추가: {self.VECTOR_INDEX_NAME}")
+            return True
+        except Exception as e:
+            print(f"Vector Search 인덱스 확인 실패: {e}")
+            return False
+    
+    def _insert_sector_rows(self, rows) -> Tuple[int, List[int]]:
+        """
+        MySQL 행 chunk를 MongoDB에 일괄 삽입 (이미 있는 mysql_id는 건너뜀)
         
-        # 3. 배치 처리로 임베딩 생성 및 저장
-        print("\n임베딩이 필요한 문서를 확인합니다...")
+        Returns:
+            (삽입된 문서 수, 중복이 아닌 오류로 저장하지 못한 mysql_id 목록)
+        """
+        unique_index = self.ensure_indexes()
         
-        # 임베딩이 없는 문서만 조회
-        no_embedding_docs = list(self.collection.find(
-            {"$or": [
-                {"summary_embedding": {"$exists": False}},
-                {"summary_embedding": None}
-            ]}
-        ))
+        existing_ids = set()
+        if not unique_index:
+            existing_ids.update(
+                doc["mysql_id"] for doc in self.collection.find(
+                    {"mysql_id": {"$in": [row[0] for row in rows]}}, {"mysql_id": 1}
+                )
+            )
         
-        print(f"임베딩이 필요한 문서: {len(no_embedding_docs)}개")
-        if not no_embedding_docs:
-            return (inserted_count, 0)
+        documents = self._build_sector_documents(rows, existing_ids)
+        if not documents:
+            return (0, [])
         
-        # 배치 처리를 위한 준비
-        updated_count = 0
+        try:
+            result = self.collection.insert_many(documents, ordered=False)
+            return (len(result.inserted_ids), [])
+        except BulkWriteError as e:
+            return self._inserted_despite_errors(e)
+    
+    def _build_sector_documents(self, rows, existing_ids) -> List[Dict[str, Any]]:
+        """MySQL 행을 MongoDB 문서로 변환하고 BM25 역색인에 추가"""
+        documents = []
+        for row in rows:
+            mysql_id, date_value, title, summary, file_url, source, keyword = row[:7]
+            # 요약 필드가 없거나 이미 있는 문서는 건너뛰기
+            if not summary or mysql_id in existing_ids:
+                continue
+            documents.append({
+                "mysql_id": mysql_id,
+                "date": self._to_datetime(date_value),
+                "title": title,
+                "summary": summary,
+                "file_url": file_url,
+                "source": source,
+                "keyword": keyword
+            })
         
-        # 키워드 텍스트 목록 및 ID 매핑
-        batch_texts = []
-        doc_ids = []
+        # BM25 역색인에도 추가 (insert_many가 문서에 _id를 추가하기 전에)
+        if documents:
+            self.lexical_index.add(documents)
+        return documents
+    
+    @staticmethod
+    def _inserted_despite_errors(e: BulkWriteError) -> Tuple[int, List[int]]:
+        # 중복 키(11000)는 이미 동기화된 문서이므로 무시
+        errors = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+        failed_ids = []
+        for err in errors:
+            mysql_id = err.get('op', {}).get('mysql_id')
+            print(f"ID {mysql_id} 저장 중 오류 발생: {err.get('errmsg')}")
+            if mysql_id is not None:
+                failed_ids.append(mysql_id)
+        return (e.details.get("nInserted", 0), failed_ids)
+    
+    def _iter_keyword_batches(self, cursor, batch_size: int):
+        batch = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _encode_embedding(self, embedding: List[float]):
+        """MongoDB 저장 형식으로 변환 (binary_vectors면 BSON float32 벡터)"""
+        if self.binary_vectors:
+            return Binary.from_vector(embedding, BinaryVectorDtype.FLOAT32)
+        return embedding
+    
+    @staticmethod
+    def _decode_embedding(value) -> Optional[List[float]]:
+        if isinstance(value, Binary):
+            return value.as_vector().data
+        return value
+    
+    def _embedding_updates(self, doc_ids: List[Any], embeddings: List[List[float]]) -> List[UpdateOne]:
+        return [
+            UpdateOne({"_id": doc_id}, {"$set": {"summary_embedding": self._encode_embedding(embedding)}})
+            for doc_id, embedding in zip(doc_ids, embeddings)
+        ]
+    
+    def _write_embeddings(self, doc_ids: List[Any], embeddings: List[List[float]]) -> int:
+        operations = self._embedding_updates(doc_ids, embeddings)
+        if not operations:
+            return 0
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            return result.modified_count
+        except BulkWriteError as e:
+            return self._modified_despite_errors(e)
+    
+    @staticmethod
+    def _modified_despite_errors(e: BulkWriteError) -> int:
+        print(f"임베딩 저장 중 오류: {e.details.get('writeErrors', [])[:3]}")
+        return e.details.get("nModified", 0)
+    
+    def embed_missing_documents(self, batch_size: int = 20) -> int:
+        """
+        임베딩이 없는 MongoDB 문서의 키워드 임베딩을 배치로 생성해 저장
         
-        for doc in no_embedding_docs:
-            keyword = doc.get("keyword", "")
-            if keyword:
-                batch_texts.append(keyword)
-                doc_ids.append(doc["_id"])
+        커서를 배치 단위로 소비하며, 다음 배치의 임베딩 생성(API 호출)과
+        현재 배치의 bulk_write를 겹쳐 실행합니다. 메모리에는 최대 두 배치만 유지됩니다.
+        """
+        print("\n임베딩이 필요한 문서를 확인합니다...")
         
-        if not batch_texts:
-            return (inserted_count, 0)
+        # 임베딩이 없는 문서만 조회 (임베딩 필드 제외)
+        cursor = self.collection.find(
+            self.MISSING_EMBEDDING_FILTER, self.EMBEDDING_SOURCE_PROJECTION
+        ).batch_size(batch_size * 5)
         
-        # 배치 단위로 임베딩 생성
-        print(f"총 {len(batch_texts)}개 문서의 임베딩을 생성합니다...")
+        updated_count = 0
+        batch_count = 0
+        pending = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for batch in self._iter_keyword_batches(cursor, batch_size):
+                future = executor.submit(self.get_batch_embeddings, [doc["keyword"] for doc in batch])
+                if pending is not None:
+                    updated_count += self._finish_embedding_batch(*pending)
+                pending = (batch, future)
+                batch_count += 1
+                print(f"배치 {batch_count}: {len(batch)}개 임베딩 요청 (완료 {updated_count}개)")
+            if pending is not None:
+                updated_count += self._finish_embedding_batch(*pending)
+        cursor.close()
         
-        for i in range(0, len(batch_texts), batch_size):
-            current_batch = batch_texts[i:i+batch_size]
-            current_ids = doc_ids[i:i+batch_size]
-            
-            try:
-                # 배치 임베딩 생성
-                batch_embeddings = self.get_batch_embeddings(current_batch)
-                
-                # 개별 문서 업데이트
-                for j, (doc_id, embedding) in enumerate(zip(current_ids, batch_embeddings)):
-                    self.collection.update_one(
-                        {"_id": doc_id},
-                        {"$set": {"summary_embedding": embedding}}
-                    )
-                    updated_count += 1
-                
-                # 진행 상황 출력
-                current_batch_num = i // batch_size + 1
-                total_batches = (len(batch_texts) - 1) // batch_size + 1
-                print(f"배치 {current_batch_num}/{total_batches}: {len(current_batch)}개 임베딩 완료 (총 {updated_count}/{len(batch_texts)})")
-                
-            except Exception as e:
-                print(f"배치 {i//batch_size+1} 임베딩 생성 중 오류: {e}")
+        print(f"임베딩 저장 완료: {updated_count}개")
         
         # 캐시 최종 저장
         self.save_embedding_cache()
         
-        return (inserted_count, updated_count)
+        return updated_count
+    
+    def _finish_embedding_batch(self, batch, future) -> int:
+        try:
+            embeddings = future.result()
+        except Exception as e:
+            print(f"배치 임베딩 생성 중 오류: {e}")
+            return 0
+        return self._store_embeddings(batch, embeddings)
+    
+    def _store_embeddings(self, batch, embeddings) -> int:
+        """MongoDB 문서 배치에 임베딩 저장 + 로컬 인덱스 반영"""
+        updated = self._write_embeddings([doc["_id"] for doc in batch], embeddings)
+        self._add_to_local_index(batch, embeddings)
+        return updated
+    
+    def _add_to_local_index(self, batch, embeddings):
+        # 로컬 인덱스에도 증분 추가 (빈 임베딩은 add에서 제외)
+        self.local_index.add(
+            {**doc, "summary_embedding": embedding if any(embedding) else None}
+            for doc, embedding in zip(batch, embeddings)
+        )
+    
+    # ----------- 수집 시점 반영 (크롤러) ----------- #
+    
+    def ingest_sector_reports(self, mysql_ids: List[int], batch_size: int = 20) -> Tuple[int, int]:
+        """
+        크롤러가 방금 저장한 섹터 리포트를 MongoDB/로컬 인덱스/임베딩 캐시에 바로 반영
+        
+        첫 분석 질의가 밀린 임베딩을 한꺼번에 계산하지 않도록 수집 시점에 배치로 임베딩합니다.
+        문서는 증분 동기화와 같은 형태로 저장하고, 임베딩도 embed_missing_documents()와 같이 keyword로만 만듭니다.
+        (keyword가 아직 비어 있는 문서는 임베딩하지 않고, keyword가 채워진 뒤 동기화에서 임베딩)
+        
+        Returns:
+            (삽입된 문서 수, 업데이트된 임베딩 수)
+        """
+        if not mysql_ids:
+            return (0, 0)
+        query = text("""
+            SELECT id, date, title, summary, file_url, source, keyword
+            FROM sector_reports
+            WHERE id IN :ids
+        """).bindparams(bindparam("ids", expanding=True))
+        with self.mysql_engine.connect() as conn:
+            rows = conn.execute(query, {"ids": list(mysql_ids)}).fetchall()
+        inserted, _ = self._insert_sector_rows(rows)
+        
+        # 이번에 삽입된 문서 중 임베딩이 없는 (키워드가 있는) 문서만 한 번에 임베딩
+        docs = list(self.collection.find(
+            {**self.MISSING_EMBEDDING_FILTER, "mysql_id": {"$in": [row[0] for row in rows]}},
+            self.EMBEDDING_SOURCE_PROJECTION
+        ))
+        updated = 0
+        if docs:
+            embeddings = self.get_batch_embeddings([doc["keyword"] for doc in docs], batch_size=batch_size)
+            updated = self._store_embeddings(docs, embeddings)
+            self.save_embedding_cache()
+        print(f"섹터 리포트 수집 반영: 삽입 {inserted}개, 임베딩 {updated}개")
+        return (inserted, updated)
+    
+    def ingest_stock_reports(self, mysql_ids: List[int]) -> int:
+        """
+        크롤러가 방금 저장한 종목 리포트로 종목 프로필(요약 + 질의 임베딩)을 미리 계산
+        
+        조회 경로와 같은 기준(종목별 가장 최근 리포트)으로 만들고, 반영한 리포트 id를 함께 저장해
+        다음 sync_ticker_profiles()가 이 프로필을 무효화하지 않도록 합니다.
+        
+        Returns:
+            프로필이 갱신된 종목 수
+        """
+        if not mysql_ids:
+            return 0
+        query = text("""
+            SELECT DISTINCT ticker
+            FROM stock_reports
+            WHERE id IN :ids
+        """).bindparams(bindparam("ids", expanding=True))
+        with self.mysql_engine.connect() as conn:
+            tickers = [row[0] for row in conn.execute(query, {"ids": list(mysql_ids)})]
+        if not tickers:
+            return 0
+        
+        profiles = self._fetch_latest_stock_profiles(tickers)
+        summaries = {ticker: profile for ticker, (profile, _) in profiles.items()}
+        if not summaries:
+            return 0
+        self.ticker_profiles.put_summaries(
+            summaries, covered_ids={ticker: report_id for ticker, (_, report_id) in profiles.items()}
+        )
+        self.get_query_embeddings(list(summaries), summaries)
+        self.save_embedding_cache()
+        print(f"종목 프로필 수집 반영: {len(summaries)}개 종목")
+        return len(summaries)
     
     # ----------- 검색 메서드 ----------- #
     
+    def _vector_search(self, query_embed: List[float], top_k: int, from_date: datetime.datetime,
+                       score_threshold: float) -> List[Dict[str, Any]]:
+        """Atlas Vector Search(실패 시 로컬 인덱스)로 임계값 이상 문서 검색 (점수 내림차순)"""
+        results = []
+        for name, pipeline in self._vector_search_pipelines(query_embed, top_k, from_date):
+            try:
+                results = list(self.collection.aggregate(pipeline))
+                break
+            except Exception as e:
+                print(f"{name} 오류: {e}")
+        return self._finish_vector_search(results, query_embed, top_k, from_date, score_threshold)
+    
+    def _vector_search_pipelines(self, query_embed: List[float], top_k: int,
+                                 from_date: datetime.datetime) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """MongoDB 검색 방식 (시도 순서대로): $vectorSearch, 실패 시 $search knnBeta"""
+        return [
+            # 1. ANN 벡터 검색 (기간 필터를 후보 선정 전에 적용)
+            ("Vector Search", [
+                {
+                    "$vectorSearch": {
+                        "index": self.VECTOR_INDEX_NAME,
+                        "path": "summary_embedding",
+                        "queryVector": query_embed,
+                        "filter": {"date": {"$gte": from_date}},
+                        "numCandidates": max(top_k * 3, 50),
+                        "limit": top_k * 3
+                    }
+                },
+                {
+                    "$project": {**self.RESULT_PROJECTION, "score": {"$meta": "vectorSearchScore"}}
+                }
+            ]),
+            # 2. 대체 방식 ($search 사용)
+            ("$search", [
+                {
+                    "$search": {
+                        "index": self.VECTOR_INDEX_NAME,
+                        "knnBeta": {
+                            "vector": query_embed,
+                            "path": "summary_embedding",
+                            "k": top_k * 3,
+                            "filter": {"range": {"path": "date", "gte": from_date}}
+                        }
+                    }
+                },
+                {
+                    "$project": {**self.RESULT_PROJECTION, "score": {"$meta": "searchScore"}}
+                }
+            ])
+        ]
+    
+    def _finish_vector_search(self, results: List[Dict[str, Any]], query_embed: List[float], top_k: int,
+                              from_date: datetime.datetime, score_threshold: float) -> List[Dict[str, Any]]:
+        if results:
+            print(f"총 {len(results)}개 문서 검색됨")
+            # 서버가 계산한 점수로 임계값 필터링 (임베딩 재계산 없음)
+            filtered_results = self._filter_scored_documents(results, score_threshold)
+        else:
+            # 3. 최후 수단: 로컬 벡터 인덱스에서 검색 (MongoDB에서 문서를 가져오지 않음)
+            print("대체 검색 방법 사용: 로컬 벡터 인덱스")
+            filtered_results = self.local_index.search(
+                query_embed, top_k=top_k, from_date=from_date, score_threshold=score_threshold
+            )
+        
+        filtered_results.sort(key=lambda x: x["score"], reverse=True)
+        return filtered_results
+    
+    def _fuse_results(self, mode: str, vector_results: Optional[List[Dict[str, Any]]],
+                      lexical_results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """
+        검색 모드에 따라 결과 결합
+        vector_results가 None이면 임베딩을 사용할 수 없는 경우로, 키워드 검색 결과만 사용 (최소 BM25 점수 적용)
+        hybrid는 임계값을 통과한 벡터 결과만 BM25 순위와 RRF로 재정렬하며, score는 코사인 유사도를 유지
+        (RRF 점수는 rrf_score)
+        """
+        if mode == "lexical" or vector_results is None:
+            return [doc for doc in lexical_results if doc["score"] >= self.lexical_min_score][:top_k]
+        if mode == "vector":
+            return vector_results[:top_k]
+        cosine = {doc["id"]: doc["score"] for doc in vector_results}
+        fused = reciprocal_rank_fusion(
+            [vector_results, [doc for doc in lexical_results if doc["id"] in cosine]], top_k
+        )
+        return [{**doc, "rrf_score": doc["score"], "score": cosine[doc["id"]]} for doc in fused]
+    
     def retrieve_top_k_sector_summaries(self, ticker: str, top_k: int = 5, days_ago: int = 14, 
-                                       score_threshold: float = 0.5) -> List[Dict[str, Any]]:
+                                       score_threshold: float = 0.5, mode: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         종목 관련 섹터 리포트 검색
         
@@ -417,141 +997,189 @@ class SectorTool:
             ticker: 종목 티커
             top_k: 반환할 최대 문서 수
             days_ago: 최근 n일 데이터만 검색
-            score_threshold: 유사도 최소 임계값
+            score_threshold: 코사인 유사도 최소 임계값 (벡터 검색 결과에 적용, hybrid도 임계값 통과 문서만 반환)
+            mode: "vector" / "hybrid"(벡터 결과를 BM25 순위와 RRF로 재정렬) / "lexical" (None이면 retrieval_mode)
         
         Returns:
             관련 섹터 리포트 정보 목록 (유사도 점수 포함)
         """
+        mode = mode or self.retrieval_mode
+        
         # 종목 정보 가져오기
         stock_summary = self.get_stock_summary(ticker)
         if not stock_summary:
-            return [{"summary": "MySQL에 해당 종목 summary가 없습니다.", "score": 0.0}]
-
-        # 검색을 위한 임베딩 생성
-        query_embed = self.get_embedding(stock_summary)
-        
-        # 시간 필터링
-        from_date = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+            return self._missing_summary_result()
         
-        # MongoDB 검색을 다양한 방식으로 시도
-        results = []
+        from_date = self._search_from_date(days_ago)
         try:
-            # 1. Vector Search 시도
-            try:
-                # ANN 벡터 검색
-                pipeline = [
-                    {
-                        "$vectorSearch": {
-                            "index": "sec-index",
-                            "path": "summary_embedding",
-                            "queryVector": query_embed,
-                            "numCandidates": max(top_k * 3, 50),
-                            "limit": top_k * 3
-                        }
-                    },
-                    {
-                        "$match": {
-                            "date": {"$gte": from_date}
-                        }
-                    }
-                ]
-                results = list(self.collection.aggregate(pipeline))
-            except Exception as e:
-                print(f"Vector Search 오류: {e}")
-                
-                # 2. 대체 방식 시도 ($search 사용)
-                try:
-                    pipeline = [
-                        {
-                            "$search": {
-                                "index": "sec-index",
-                                "knnBeta": {
-                                    "vector": query_embed,
-                                    "path": "summary_embedding",
-                                    "k": top_k * 3
-                                }
-                            }
-                        },
-                        {
-                            "$match": {
-                                "date": {"$gte": from_date}
-                            }
-                        }
-                    ]
-                    results = list(self.collection.aggregate(pipeline))
-                except Exception as e2:
-                    print(f"$search 시도 오류: {e2}")
-                    
-            # 3. 최후 수단: 모든 임베딩 문서 로드 후 메모리에서 코사인 유사도 계산
-            if not results:
-                print("대체 검색 방법 사용: 메모리 기반 코사인 유사도 계산")
-                results = list(self.collection.find({"date": {"$gte": from_date}}))
-                
-            print(f"총 {len(results)}개 문서 검색됨")
-            
-            # 임베딩 기반 코사인 유사도 계산 및 필터링
-            filtered_results = []
-            
-            print(f"코사인 유사도 계산 및 임계값({score_threshold}) 필터링 시작...")
-            for i, doc in enumerate(results):
-                doc_embed = doc.get("summary_embedding")
-                if not doc_embed:
-                    continue
-                    
-                # 코사인 유사도 계산
-                try:
-                    cos_sim = cosine_similarity([query_embed], [doc_embed])[0][0]
-                    
-                    if cos_sim >= score_threshold:
-                        doc_info = {
-                            "id": doc.get("mysql_id"),
-                            "title": doc.get("title", ""),
-                            "summary": doc.get("summary", ""),
-                            "date": doc.get("date", ""),
-                            "source": doc.get("source", ""),
-                            "keyword": doc.get("keyword", ""),
-                            "score": float(cos_sim)
-                        }
-                        filtered_results.append(doc_info)
-                        print(f"문서 {i+1}/{len(results)}: 유사도 {cos_sim:.4f} ✓")
-                    else:
-                        print(f"문서 {i+1}/{len(results)}: 유사도 {cos_sim:.4f} ✗")
-                except Exception as e:
-                    print(f"유사도 계산 오류 (문서 {i+1}): {e}")
-            
-            # 결과 정렬 및 제한
-            filtered_results.sort(key=lambda x: x["score"], reverse=True)
-            result_count = len(filtered_results)
-            filtered_results = filtered_results[:top_k]
+            lexical_results = self._lexical_candidates(mode, stock_summary, top_k, from_date)
+            query_embed, vector_results = None, None
+            if self._uses_vectors(mode):
+                # 검색을 위한 임베딩 (프로필 캐시 우선, 실패 시 영벡터 -> 키워드 검색으로 대체)
+                query_embed = self.get_query_embeddings([ticker], {ticker: stock_summary})[0]
+                if any(query_embed):
+                    vector_results = self._vector_search(query_embed, top_k, from_date, score_threshold)
+            return self._finish_retrieval(
+                mode, stock_summary, query_embed, vector_results, lexical_results, top_k, from_date, score_threshold
+            )
+        except Exception as e:
+            return self._retrieval_error(e)
+    
+    # 검색 흐름 (동기/비동기 검색이 공유: 모드별 후보 선택, 임베딩 실패 대체, 결합, 임계값 메시지)
+    
+    @staticmethod
+    def _uses_vectors(mode: str) -> bool:
+        return mode != "lexical"
+    
+    @staticmethod
+    def _search_from_date(days_ago: int) -> datetime.datetime:
+        return datetime.datetime.now() - datetime.timedelta(days=days_ago)
+    
+    def _lexical_candidates(self, mode: str, stock_summary: str, top_k: int,
+                            from_date: datetime.datetime) -> List[Dict[str, Any]]:
+        """키워드(BM25) 후보: 로컬 역색인만 사용 (네트워크 호출 없음, vector 모드는 생략)"""
+        if mode == "vector":
+            return []
+        return self.lexical_index.search(stock_summary, top_k=top_k * 3, from_date=from_date)
+    
+    def _finish_retrieval(self, mode: str, stock_summary: str, query_embed: Optional[List[float]],
+                          vector_results: Optional[List[Dict[str, Any]]], lexical_results: List[Dict[str, Any]],
+                          top_k: int, from_date: datetime.datetime, score_threshold: float) -> List[Dict[str, Any]]:
+        if query_embed is not None and not any(query_embed):
+            print("임베딩 생성 실패: 키워드 검색 결과만 사용합니다.")
+            if mode == "vector":
+                lexical_results = self.lexical_index.search(stock_summary, top_k=top_k, from_date=from_date)
+        
+        filtered_results = self._fuse_results(mode, vector_results, lexical_results, top_k)
+        print(f"섹터 리포트 검색 결과({mode}): {len(filtered_results)}개 선택됨")
+        if not filtered_results:
+            return [{"summary": f"임계값({score_threshold}) 이상의 유사한 섹터 리포트가 없습니다.", "score": 0.0}]
+        return filtered_results
+    
+    @staticmethod
+    def _missing_summary_result() -> List[Dict[str, Any]]:
+        return [{"summary": "MySQL에 해당 종목 summary가 없습니다.", "score": 0.0}]
+    
+    @staticmethod
+    def _retrieval_error(e: Exception) -> List[Dict[str, Any]]:
+        print(f"섹터 리포트 검색 중 오류 발생: {e}")
+        return [{"summary": f"검색 중 오류 발생: {str(e)}", "score": 0.0}]
+    
+    @staticmethod
+    def _filter_scored_documents(docs: List[Dict[str, Any]], score_threshold: float) -> List[Dict[str, Any]]:
+        """
+        Atlas 검색 점수를 코사인 유사도로 변환해 임계값으로 필터링
+        cosine 인덱스의 점수는 (1 + cos) / 2 로 정규화되어 있으므로 cos = 2 * score - 1
+        """
+        filtered = []
+        for doc in docs:
+            cos_sim = 2 * float(doc.get("score", 0.0)) - 1
+            if cos_sim < score_threshold:
+                continue
+            filtered.append({
+                "id": doc.get("mysql_id"),
+                "title": doc.get("title", ""),
+                "summary": doc.get("summary", ""),
+                "date": doc.get("date", ""),
+                "source": doc.get("source", ""),
+                "keyword": doc.get("keyword", ""),
+                "score": cos_sim
+            })
+        return filtered
+    
+    # ----------- 실행 메서드 ----------- #
+    
+    def run_many(self, tickers: List[str], top_k: int = 5, days_ago: int = 14,
+                 score_threshold: float = 0.5, mode: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        여러 종목의 관련 섹터 리포트를 한 번에 검색
+        
+        종목 요약은 한 번의 MySQL 쿼리로, 질의 임베딩은 캐시 미스만 한 번의 배치로 생성하고,
+        모든 질의 벡터를 로컬 섹터 인덱스와 한 번의 행렬 곱으로 비교합니다.
+        hybrid 모드에서는 벡터 결과를 종목별 BM25 순위와 RRF로 재정렬하고, lexical 모드는 임베딩을 생성하지 않습니다.
+        
+        Returns:
+            {종목 티커: 검색된 섹터 summary 문자열 리스트}
+        """
+        mode = mode or self.retrieval_mode
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        
+        # 벡터 검색이 필요한데 로컬 인덱스가 비어 있으면 종목별 검색으로 대체
+        if self._uses_vectors(mode) and len(self.local_index) == 0:
+            return {ticker: self.run(ticker, top_k, days_ago, score_threshold, mode) for ticker in tickers}
+        
+        summaries = self.get_stock_summaries(tickers)
+        results: Dict[str, List[str]] = {
+            ticker: ["MySQL에 해당 종목 summary가 없습니다."] for ticker in tickers if ticker not in summaries
+        }
+        
+        query_tickers = [ticker for ticker in tickers if ticker in summaries]
+        if query_tickers:
+            from_date = self._search_from_date(days_ago)
             
-            print(f"유사도 필터링 결과: {result_count}개 중 {len(filtered_results)}개 선택됨")
+            lexical_hits = [
+                self._lexical_candidates(mode, summaries[ticker], top_k, from_date) for ticker in query_tickers
+            ]
             
-            if not filtered_results:
-                return [{"summary": f"임계값({score_threshold}) 이상의 유사한 섹터 리포트가 없습니다.", "score": 0.0}]
-                
-            return filtered_results
+            vector_hits = [None for _ in query_tickers]
+            if self._uses_vectors(mode):
+                query_embeds = self.get_query_embeddings(query_tickers, summaries)
+                searched = self.local_index.search_many(
+                    query_embeds, top_k=top_k, from_date=from_date, score_threshold=score_threshold
+                )
+                # 임베딩에 실패한(영벡터) 종목은 키워드 검색 결과만 사용
+                vector_hits = [hits if any(embed) else None for embed, hits in zip(query_embeds, searched)]
+                if mode == "vector":
+                    lexical_hits = [
+                        self.lexical_index.search(summaries[ticker], top_k=top_k, from_date=from_date)
+                        if hits is None else []
+                        for ticker, hits in zip(query_tickers, vector_hits)
+                    ]
             
-        except Exception as e:
-            print(f"섹터 리포트 검색 중 오류 발생: {e}")
-            return [{"summary": f"검색 중 오류 발생: {str(e)}", "score": 0.0}]
+            for ticker, vector_docs, lexical_docs in zip(query_tickers, vector_hits, lexical_hits):
+                docs = self._fuse_results(mode, vector_docs, lexical_docs, top_k)
+                if docs:
+                    results[ticker] = [doc["summary"] for doc in docs]
+                else:
+                    results[ticker] = [f"임계값({score_threshold}) 이상의 유사한 섹터 리포트가 없습니다."]
+        
+        return {ticker: results[ticker] for ticker in tickers}
     
-    # ----------- 실행 메서드 ----------- #
+    def prefetch(self, tickers: List[str], top_k: int = 5, days_ago: int = 14,
+                 score_threshold: float = 0.5, mode: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        윈도우의 전체 종목 검색 결과를 run_many로 미리 계산해 둡니다.
+        이후 같은 인자의 run 호출은 저장된 결과를 반환합니다.
+        """
+        mode = mode or self.retrieval_mode
+        self._prefetched.clear()
+        results = self.run_many(tickers, top_k=top_k, days_ago=days_ago, score_threshold=score_threshold, mode=mode)
+        for ticker, summaries in results.items():
+            self._prefetched[(ticker, top_k, days_ago, score_threshold, mode)] = summaries
+        return results
     
-    def run(self, ticker: str, top_k: int = 5, days_ago: int = 14, score_threshold: float = 0.5, days_lookback: int = 0) -> List[str]:
+    def run(self, ticker: str, top_k: int = 5, days_ago: int = 14, score_threshold: float = 0.5,
+            mode: Optional[str] = None) -> List[str]:
         """
         종목 관련 섹터 리포트 검색 실행 (간편 인터페이스)
+        조회 전용이며 동기화는 sync_sector_reports()로 별도 실행합니다.
         
         Returns:
             검색된 섹터 summary 문자열들의 리스트
         """
+        mode = mode or self.retrieval_mode
+        prefetched = self._prefetched.get((ticker, top_k, days_ago, score_threshold, mode))
+        if prefetched is not None:
+            return prefetched
         
-        self.import_sector_reports_to_mongodb(days_lookback=days_lookback)
-
         results = self.retrieve_top_k_sector_summaries(
             ticker, 
             top_k=top_k, 
             days_ago=days_ago, 
-            score_threshold=score_threshold
+            score_threshold=score_threshold,
+            mode=mode
         )
         
         if isinstance(results[0], dict):
@@ -559,27 +1187,243 @@ class SectorTool:
         else:
             return results
 
+    # ----------- 비동기 MongoDB 경로 ----------- #
+    # 여러 종목을 동시에 처리할 때 Atlas 응답을 기다리며 스레드를 점유하지 않도록,
+    # MongoDB 호출은 공유 AsyncMongoClient로 await하고 MySQL/임베딩 API 호출은 스레드로 넘깁니다.
+    
+    def _async_collections(self):
+        database = self.async_mongo.client[self.database_name]
+        return database[self.collection_name], database[self.sync_state_name]
+    
+    def mongo_metrics(self) -> Dict[str, Any]:
+        """비동기 MongoDB 커넥션 풀 크기, 타임아웃 설정/횟수, 진행 중 질의 수"""
+        return self.async_mongo.metrics()
+    
+    async def aclose(self):
+        await self.async_mongo.close()
+    
+    async def async_get_sync_state(self) -> Dict[str, Any]:
+        """get_sync_state의 비동기 버전"""
+        collection, sync_state = self._async_collections()
+        async with self.async_mongo.track():
+            state = await sync_state.find_one({"_id": self.SYNC_STATE_ID})
+        if state:
+            return state
+        async with self.async_mongo.track():
+            latest = await collection.find_one(**self.LATEST_SYNCED_QUERY)
+        return self._initial_sync_state(latest)
+    
+    async def async_sync_sector_reports(self, batch_size: int = 20, chunk_size: int = 500) -> Tuple[int, int]:
+        """
+        sync_sector_reports의 비동기 버전 (MySQL 스트리밍은 스레드에서 chunk 단위로 읽음)
+        
+        Returns:
+            (삽입된 문서 수, 업데이트된 임베딩 수)
+        """
+        async with self.async_mongo.lease():
+            _, sync_state = self._async_collections()
+            state = await self.async_get_sync_state()
+            last_id = state.get("last_id") or 0
+            
+            fetched_count = 0
+            inserted_count = 0
+            blocked = False
+            chunks = self._stream_rows(self.SYNC_QUERY, {"last_id": last_id}, chunk_size)
+            while True:
+                rows = await asyncio.to_thread(next, chunks, None)
+                if rows is None:
+                    break
+                fetched_count += len(rows)
+                inserted, failed_ids = await self._async_insert_sector_rows(rows)
+                inserted_count += inserted
+                if blocked:
+                    continue
+                mark_row = self._sync_mark_row(rows, failed_ids)
+                blocked = bool(failed_ids)
+                if mark_row is not None:
+                    async with self.async_mongo.track():
+                        await sync_state.update_one(
+                            {"_id": self.SYNC_STATE_ID}, self._sync_state_update(mark_row), upsert=True
+                        )
+            
+            print(f"섹터 리포트 증분 동기화: id > {last_id}, 신규 {fetched_count}개 (삽입 {inserted_count}개)")
+            
+            # 인덱스 정의 확인/최초 구축은 드물게 실행되므로 동기 구현을 스레드에서 재사용
+            await asyncio.to_thread(self._prepare_search_indexes, chunk_size)
+            
+            updated_count = await self.async_embed_missing_documents(batch_size=batch_size)
+            return (inserted_count, updated_count)
+    
+    async def _async_insert_sector_rows(self, rows) -> Tuple[int, List[int]]:
+        collection, _ = self._async_collections()
+        unique_index = await asyncio.to_thread(self.ensure_indexes)
+        
+        existing_ids = set()
+        if not unique_index:
+            async with self.async_mongo.track():
+                async for doc in collection.find({"mysql_id": {"$in": [row[0] for row in rows]}}, {"mysql_id": 1}):
+                    existing_ids.add(doc["mysql_id"])
+        
+        documents = self._build_sector_documents(rows, existing_ids)
+        if not documents:
+            return (0, [])
+        
+        try:
+            async with self.async_mongo.track():
+                result = await collection.insert_many(documents, ordered=False)
+            return (len(result.inserted_ids), [])
+        except BulkWriteError as e:
+            return self._inserted_despite_errors(e)
+    
+    async def async_embed_missing_documents(self, batch_size: int = 20) -> int:
+        """
+        embed_missing_documents의 비동기 버전
+        다음 배치의 임베딩 생성(스레드)과 현재 배치의 bulk_write(await)를 겹쳐 실행합니다.
+        (메트릭은 커서 배치 조회/bulk_write 각각만 집계하고 임베딩 API 대기는 포함하지 않음)
+        """
+        async with self.async_mongo.lease():
+            collection, _ = self._async_collections()
+            cursor = collection.find(
+                self.MISSING_EMBEDDING_FILTER, self.EMBEDDING_SOURCE_PROJECTION
+            ).batch_size(batch_size * 5)
+            
+            updated_count = 0
+            pending = None
+            try:
+                while True:
+                    async with self.async_mongo.track():
+                        batch = await cursor.to_list(batch_size)
+                    if not batch:
+                        break
+                    task = asyncio.create_task(
+                        asyncio.to_thread(self.get_batch_embeddings, [doc["keyword"] for doc in batch])
+                    )
+                    if pending is not None:
+                        updated_count += await self._async_finish_embedding_batch(*pending)
+                    pending = (batch, task)
+                if pending is not None:
+                    updated_count += await self._async_finish_embedding_batch(*pending)
+            finally:
+                await cursor.close()
+            
+            print(f"임베딩 저장 완료: {updated_count}개")
+            self.save_embedding_cache()
+            return updated_count
+    
+    async def _async_finish_embedding_batch(self, batch, task) -> int:
+        try:
+            embeddings = await task
+        except Exception as e:
+            print(f"배치 임베딩 생성 중 오류: {e}")
+            return 0
+        
+        collection, _ = self._async_collections()
+        updated = 0
+        operations = self._embedding_updates([doc["_id"] for doc in batch], embeddings)
+        if operations:
+            try:
+                async with self.async_mongo.track():
+                    result = await collection.bulk_write(operations, ordered=False)
+                updated = result.modified_count
+            except BulkWriteError as e:
+                updated = self._modified_despite_errors(e)
+        self._add_to_local_index(batch, embeddings)
+        return updated
+    
+    async def _async_vector_search(self, query_embed: List[float], top_k: int, from_date: datetime.datetime,
+                                   score_threshold: float) -> List[Dict[str, Any]]:
+        """_vector_search의 비동기 버전"""
+        collection, _ = self._async_collections()
+        results = []
+        for name, pipeline in self._vector_search_pipelines(query_embed, top_k, from_date):
+            try:
+                async with self.async_mongo.track():
+                    cursor = await collection.aggregate(pipeline)
+                    results = await cursor.to_list(None)
+                break
+            except Exception as e:
+                print(f"{name} 오류: {e}")
+        return self._finish_vector_search(results, query_embed, top_k, from_date, score_threshold)
+    
+    async def async_retrieve_top_k_sector_summaries(self, ticker: str, top_k: int = 5, days_ago: int = 14,
+                                                    score_threshold: float = 0.5,
+                                                    mode: Optional[str] = None) -> List[Dict[str, Any]]:
+        """retrieve_top_k_sector_summaries의 비동기 버전 (검색 흐름은 같은 헬퍼를 사용)"""
+        mode = mode or self.retrieval_mode
+        
+        stock_summary = await asyncio.to_thread(self.get_stock_summary, ticker)
+        if not stock_summary:
+            return self._missing_summary_result()
+        
+        from_date = self._search_from_date(days_ago)
+        try:
+            lexical_results = self._lexical_candidates(mode, stock_summary, top_k, from_date)
+            query_embed, vector_results = None, None
+            if self._uses_vectors(mode):
+                query_embed = (await asyncio.to_thread(
+                    self.get_query_embeddings, [ticker], {ticker: stock_summary}
+                ))[0]
+                if any(query_embed):
+                    async with self.async_mongo.lease():
+                        vector_results = await self._async_vector_search(query_embed, top_k, from_date, score_threshold)
+            return self._finish_retrieval(
+                mode, stock_summary, query_embed, vector_results, lexical_results, top_k, from_date, score_threshold
+            )
+        except Exception as e:
+            return self._retrieval_error(e)
+    
+    async def async_run(self, ticker: str, top_k: int = 5, days_ago: int = 14, score_threshold: float = 0.5,
+                        mode: Optional[str] = None) -> List[str]:
+        """run의 비동기 버전 (prefetch 결과 우선)"""
+        mode = mode or self.retrieval_mode
+        prefetched = self._prefetched.get((ticker, top_k, days_ago, score_threshold, mode))
+        if prefetched is not None:
+            return prefetched
+        
+        results = await self.async_retrieve_top_k_sector_summaries(
+            ticker, top_k=top_k, days_ago=days_ago, score_threshold=score_threshold, mode=mode
+        )
+        return [doc["summary"] for doc in results]
+    
+    async def async_run_many(self, tickers: List[str], top_k: int = 5, days_ago: int = 14,
+                             score_threshold: float = 0.5, mode: Optional[str] = None,
+                             max_concurrency: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        여러 종목을 동시에 검색 (동시 실행 수는 기본적으로 커넥션 풀 크기로 제한)
+        전체 검색 동안 하나의 클라이언트(커넥션 풀)를 유지하고 끝나면 닫습니다.
+        
+        Returns:
+            {종목 티커: 검색된 섹터 summary 문자열 리스트}
+        """
+        tickers = list(dict.fromkeys(tickers))
+        semaphore = asyncio.Semaphore(max_concurrency or self.async_mongo.options["maxPoolSize"])
+        
+        async def search(ticker):
+            async with semaphore:
+                return await self.async_run(ticker, top_k, days_ago, score_threshold, mode)
+        
+        async with self.async_mongo.lease():
+            results = await asyncio.gather(*(search(ticker) for ticker in tickers))
+        return dict(zip(tickers, results))
+
 # 스크립트로 실행될 때의 코드
 if __name__ == "__main__":
     # 환경 변수 로드
     load_dotenv()
-    mysql_url = os.environ["MYSQL_URL"]
-    mongo_url = os.environ["MONGO_URL"]
-    upstage_api_key = os.environ["UPSTAGE_API_KEY"]
 
-    # 인스턴스 생성
-    sectortool = SectorTool(
-        mysql_url=mysql_url, 
-        mongo_url=mongo_url, 
-        upstage_api_key=upstage_api_key
-    )
+    # 인스턴스 생성 (접속 정보는 config에서 로드)
+    sectortool = SectorTool()
+
+    # MySQL → MongoDB 증분 동기화 (스케줄러에서는 이 부분만 실행)
+    inserted, embedded = sectortool.sync_sector_reports()
+    print(f"동기화 완료 - 삽입: {inserted}, 임베딩: {embedded}")
 
     example_ticker = "005930"  # 삼성전자
     stock_name = sectortool.get_stock_name(example_ticker)
     stock_display = f"{stock_name}({example_ticker})" if stock_name else f"티커 {example_ticker}"
     
     print(f"\n{stock_display}와(과) 관련된 섹터 리포트를 검색합니다...")
-    summaries = sectortool.run(example_ticker, top_k=5, days_ago=14, days_lookback=14, score_threshold=0.4)
+    summaries = sectortool.run(example_ticker, top_k=5, days_ago=14, score_threshold=0.4)
     
     print(f"\n{stock_display} 관련 섹터 리포트 ({len(summaries)}개):")
     for idx, summary in enumerate(summaries, start=1):
@@ -1,17 +1,32 @@
 import mysql.connector
 from typing import Any, List
-from config.config_loader import load_config
+from config.config_loader import get_config
 
 class StockTool:
     """
     특정 종목 리포트(DB1)에 대한 요약/검색/조회 기능.
     """
     def __init__(self):
-        self.config = load_config(config_path='./config/config.yaml')
-        
-        # 데이터베이스 및 API 정보 불러오기
+        self.db_client = None
 
-        
+    def _get_connection(self):
+        """MySQL 연결을 재사용 (끊어졌으면 다시 연결)"""
+        if self.db_client is None or not self.db_client.is_connected():
+            mysql_config = get_config()['mysql']
+            self.db_client = mysql.connector.connect(
+                user=mysql_config['user'],
+                password=mysql_config['password'],
+                host=mysql_config['host'],
+                port=mysql_config['port'],
+                database=mysql_config['database'],
+                autocommit=True
+            )
+        return self.db_client
+
+    def close(self):
+        if self.db_client is not None:
+            self.db_client.close()
+            self.db_client = None
 
     def run(self, ticker: str, start_date: str, end_date: str) -> List[dict]:
         """
@@ -25,16 +40,6 @@ class StockTool:
         Returns:
             List[dict]: 조회된 리포트의 목록
         """
-        mysql_config = self.config['mysql']
-
-        # MySQL 데이터베이스 연결 설정
-        self.db_client = mysql.connector.connect(
-            user=mysql_config['user'],
-            password=mysql_config['password'],
-            host=mysql_config['host'],
-            port=mysql_config['port'],
-            database=mysql_config['database']
-        )
         query = """
             SELECT ticker, stock_name, title, source, DATE_FORMAT(date, '%Y-%m-%d') AS date, summary FROM stock_reports 
             WHERE ticker = %s
@@ -42,7 +47,7 @@ class StockTool:
             ORDER BY date DESC;
             limit 5;
         """
-        cursor = self.db_client.cursor(dictionary=True)
+        cursor = self._get_connection().cursor(dictionary=True)
         cursor.execute(query, (ticker, start_date, end_date))
         results = cursor.fetchall()
         cursor.close()
@@ -50,7 +55,7 @@ class StockTool:
 
 if __name__ == '__main__':
 
-    config = load_config(config_path='./config/config.yaml')
+    config = get_config()
         
     # 데이터베이스 및 API 정보 불러오기
     mysql_config = config['mysql']
@@ -0,0 +1,153 @@
+# tools/ticker_profile.py
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class TickerProfileStore:
+    """
+    종목 프로필 캐시 (파싱된 키워드/설명 요약 + 질의 임베딩).
+
+    - SQLite에 영구 저장하고 열 때 한 번 메모리 딕셔너리로 올려, 이후 조회는 딕셔너리 조회로 끝납니다.
+    - 요약이 없는 종목도 빈 문자열로 저장해 반복 조회를 막습니다.
+    - 새 종목 리포트가 들어온 종목은 invalidate()로 지우며, 처리한 stock_reports id는 high-water mark로 보관합니다.
+    - 종목별로 프로필에 반영된 마지막 stock_reports id(covered_id)를 함께 저장해,
+      수집 시점에 이미 반영한 리포트로는 무효화하지 않습니다.
+    """
+    def __init__(self, cache_dir: str, dim: int):
+        self.dim = dim
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "ticker_profiles.sqlite"
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS ticker_profiles (
+            ticker TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            embedding BLOB,
+            updated_at TEXT,
+            covered_id INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS profile_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        );
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(ticker_profiles)")}
+        if "covered_id" not in columns:
+            self.conn.execute("ALTER TABLE ticker_profiles ADD COLUMN covered_id INTEGER")
+        self.conn.commit()
+
+        self._profiles: Dict[str, Tuple[str, Optional[np.ndarray]]] = {}
+        self._covered: Dict[str, int] = {}
+        for ticker, summary, embedding, covered_id in self.conn.execute(
+            "SELECT ticker, summary, embedding, covered_id FROM ticker_profiles"
+        ):
+            self._profiles[ticker] = (summary, self._decode(embedding))
+            if covered_id is not None:
+                self._covered[ticker] = covered_id
+
+    def _decode(self, blob: Optional[bytes]) -> Optional[np.ndarray]:
+        if blob is None:
+            return None
+        return np.frombuffer(blob, dtype=np.float32)
+
+    # ----------- 조회/저장 ----------- #
+
+    def get_summary(self, ticker: str) -> Optional[str]:
+        """캐시된 요약 (없으면 None, 요약이 없는 종목은 빈 문자열)"""
+        profile = self._profiles.get(ticker)
+        return profile[0] if profile is not None else None
+
+    def get_embedding(self, ticker: str) -> Optional[List[float]]:
+        profile = self._profiles.get(ticker)
+        if profile is None or profile[1] is None:
+            return None
+        return profile[1].tolist()
+
+    def put_summaries(self, summaries: Dict[str, str], covered_ids: Optional[Dict[str, int]] = None):
+        """
+        요약 저장 (요약이 바뀐 종목은 임베딩도 초기화)
+        covered_ids: 종목별로 요약에 반영된 마지막 stock_reports id (없으면 다음 새 리포트에 무효화)
+        """
+        covered_ids = covered_ids or {}
+        now = datetime.now().isoformat()
+        with self._lock:
+            rows = []
+            for ticker, summary in summaries.items():
+                current = self._profiles.get(ticker)
+                embedding = current[1] if current is not None and current[0] == summary else None
+                self._profiles[ticker] = (summary, embedding)
+                covered_id = covered_ids.get(ticker)
+                if covered_id is None:
+                    self._covered.pop(ticker, None)
+                else:
+                    self._covered[ticker] = covered_id
+                rows.append((ticker, summary, embedding.tobytes() if embedding is not None else None, now, covered_id))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ticker_profiles (ticker, summary, embedding, updated_at, covered_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.commit()
+
+    def put_embeddings(self, embeddings: Dict[str, List[float]]):
+        """질의 임베딩 저장 (요약이 저장된 종목만)"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            rows = []
+            for ticker, embedding in embeddings.items():
+                current = self._profiles.get(ticker)
+                if current is None:
+                    continue
+                vector = np.asarray(embedding, dtype=np.float32)
+                self._profiles[ticker] = (current[0], vector)
+                rows.append((vector.tobytes(), now, ticker))
+            self.conn.executemany("UPDATE ticker_profiles SET embedding = ?, updated_at = ? WHERE ticker = ?", rows)
+            self.conn.commit()
+
+    def covered_id(self, ticker: str) -> Optional[int]:
+        return self._covered.get(ticker)
+
+    def invalidate(self, tickers: Iterable[str]) -> int:
+        tickers = [t for t in tickers if t in self._profiles]
+        with self._lock:
+            for ticker in tickers:
+                self._profiles.pop(ticker, None)
+                self._covered.pop(ticker, None)
+            self.conn.executemany("DELETE FROM ticker_profiles WHERE ticker = ?", [(t,) for t in tickers])
+            self.conn.commit()
+        return len(tickers)
+
+    # ----------- 동기화 상태 ----------- #
+
+    def get_high_water_mark(self) -> Optional[int]:
+        row = self.conn.execute("SELECT value FROM profile_state WHERE key = 'stock_reports_last_id'").fetchone()
+        return row[0] if row else None
+
+    def set_high_water_mark(self, last_id: int):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profile_state (key, value) VALUES ('stock_reports_last_id', ?)", (last_id,)
+            )
+            self.conn.commit()
+
+    def tickers(self) -> List[str]:
+        return list(self._profiles)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._profiles
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()